@@ -0,0 +1,276 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from agents.kalshi.kalshi import Kalshi
+from agents.utils.objects import ArbitrageOpportunity, MarketPair
+
+
+class PairRegistry:
+    """
+    Kalshi ticker <-> Polymarket token pairs that resolve on the same question.
+
+    Pairs are persisted as a JSON list so they can be edited by hand or written
+    by the market matcher, and are kept in insertion order so scan results line
+    up with `self.pairs`.
+    """
+
+    def __init__(self, local_file_path: str = "./local_db_pairs/pairs.json") -> None:
+        self.local_file_path = local_file_path
+        self.pairs: "list[MarketPair]" = []
+        self._index: "dict[str, int]" = {}
+        if local_file_path and os.path.isfile(local_file_path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def __iter__(self):
+        return iter(self.pairs)
+
+    def add(self, pair: MarketPair) -> None:
+        if pair.kalshi_ticker in self._index:
+            self.pairs[self._index[pair.kalshi_ticker]] = pair
+            return
+        self._index[pair.kalshi_ticker] = len(self.pairs)
+        self.pairs.append(pair)
+
+    def remove(self, kalshi_ticker: str) -> None:
+        if kalshi_ticker not in self._index:
+            return
+        self.pairs.pop(self._index[kalshi_ticker])
+        self._index = {p.kalshi_ticker: i for i, p in enumerate(self.pairs)}
+
+    def get(self, kalshi_ticker: str) -> MarketPair:
+        i = self._index.get(kalshi_ticker)
+        return self.pairs[i] if i is not None else None
+
+    def load(self) -> None:
+        with open(self.local_file_path, "r") as f:
+            data = json.load(f)
+        self.pairs = []
+        self._index = {}
+        for pair in data:
+            self.add(MarketPair(**pair))
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.local_file_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(self.local_file_path, "w+") as f:
+            json.dump([p.dict() for p in self.pairs], f)
+
+
+class SpreadScan:
+    """
+    Result of one scan. Every attribute is an array aligned with `pairs`;
+    missing books show up as NaN.
+    """
+
+    def __init__(self, pairs: "list[MarketPair]", timestamp: float, **columns) -> None:
+        self.pairs = pairs
+        self.timestamp = timestamp
+        self.columns = columns
+        for name, values in columns.items():
+            setattr(self, name, values)
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def opportunities(self, min_edge: float = 0.0) -> "list[ArbitrageOpportunity]":
+        hits = np.flatnonzero(np.nan_to_num(self.best_edge, nan=-np.inf) > min_edge)
+        hits = hits[np.argsort(-self.best_profit[hits])]
+        opportunities = []
+        for i in hits:
+            pair = self.pairs[i]
+            kalshi_yes = bool(self.direction[i] == 0)
+            opportunities.append(
+                ArbitrageOpportunity(
+                    kalshi_ticker=pair.kalshi_ticker,
+                    polymarket_token_id=(
+                        pair.polymarket_no_token_id
+                        if kalshi_yes
+                        else pair.polymarket_yes_token_id
+                    ),
+                    direction=(
+                        "kalshi_yes_poly_no" if kalshi_yes else "kalshi_no_poly_yes"
+                    ),
+                    kalshi_price=float(
+                        self.kalshi_yes_ask[i] if kalshi_yes else self.kalshi_no_ask[i]
+                    ),
+                    polymarket_price=float(
+                        self.poly_no_ask[i] if kalshi_yes else self.poly_yes_ask[i]
+                    ),
+                    edge=float(self.best_edge[i]),
+                    size=float(self.best_size[i]),
+                    estimated_profit=float(self.best_profit[i]),
+                    timestamp=self.timestamp,
+                )
+            )
+        return opportunities
+
+
+def best_level(levels, best=max) -> "tuple[float, float]":
+    """Best (price, size) of a list of `[price, size]` pairs or OrderSummary."""
+    if not levels:
+        return np.nan, 0.0
+    if hasattr(levels[0], "price"):
+        levels = [(float(l.price), float(l.size)) for l in levels]
+    return best(levels, key=lambda l: l[0])
+
+
+def kalshi_fee(price: np.ndarray, rate: float) -> np.ndarray:
+    # Kalshi taker fee is rate * P * (1 - P) per contract
+    return rate * price * (1.0 - price)
+
+
+def polymarket_fee(price: np.ndarray, fee_rate_bps: float) -> np.ndarray:
+    # Polymarket charges bps on min(P, 1 - P), zero on most markets today
+    return fee_rate_bps / 10000.0 * np.minimum(price, 1.0 - price)
+
+
+class ArbitrageScanner:
+    """
+    Batch cross-venue scanner.
+
+    Fetches every Kalshi book and all Polymarket books concurrently, then
+    computes fee-adjusted complete-set edges for every pair in one vectorized
+    pass. A complete set is YES on one venue plus NO on the other; it pays
+    exactly 1 at resolution, so `edge = 1 - cost - fees`.
+    """
+
+    def __init__(
+        self,
+        registry: PairRegistry,
+        polymarket,
+        kalshi: Kalshi = None,
+        kalshi_fee_rate: float = 0.07,
+        polymarket_fee_rate_bps: float = 0.0,
+        depth: int = 10,
+        max_workers: int = 16,
+    ) -> None:
+        self.registry = registry
+        self.polymarket = polymarket
+        self.kalshi = kalshi or Kalshi()
+        self.kalshi_fee_rate = kalshi_fee_rate
+        self.polymarket_fee_rate_bps = polymarket_fee_rate_bps
+        self.depth = depth
+        self.max_workers = max_workers
+
+    def _fetch_kalshi_book(self, ticker: str) -> dict:
+        try:
+            return self.kalshi.get_orderbook(ticker, depth=self.depth)
+        except Exception as e:
+            print(f"[ArbitrageScanner] kalshi book {ticker} failed: {e}")
+            return None
+
+    def _fetch_polymarket_books(self, token_ids: "list[str]") -> dict:
+        try:
+            books = self.polymarket.get_orderbooks(token_ids)
+        except Exception as e:
+            print(f"[ArbitrageScanner] polymarket books failed: {e}")
+            return {}
+        return {book.asset_id: book for book in books}
+
+    def fetch_books(self, pairs: "list[MarketPair]") -> "tuple[list, dict]":
+        token_ids = []
+        for pair in pairs:
+            token_ids.append(pair.polymarket_yes_token_id)
+            token_ids.append(pair.polymarket_no_token_id)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            poly_future = pool.submit(self._fetch_polymarket_books, token_ids)
+            kalshi_books = list(
+                pool.map(self._fetch_kalshi_book, [p.kalshi_ticker for p in pairs])
+            )
+            poly_books = poly_future.result()
+        return kalshi_books, poly_books
+
+    def scan(self) -> SpreadScan:
+        pairs = list(self.registry)
+        kalshi_books, poly_books = self.fetch_books(pairs)
+        return self.compute(pairs, kalshi_books, poly_books)
+
+    def compute(
+        self, pairs: "list[MarketPair]", kalshi_books: list, poly_books: dict
+    ) -> SpreadScan:
+        n = len(pairs)
+        # top of book, one row per pair:
+        # kalshi yes bid, yes bid size, no bid, no bid size,
+        # poly yes ask, yes ask size, no ask, no ask size
+        top = np.full((n, 8), np.nan)
+        for i, pair in enumerate(pairs):
+            kb = kalshi_books[i]
+            if kb is not None:
+                top[i, 0:2] = best_level(kb.get("yes"))
+                top[i, 2:4] = best_level(kb.get("no"))
+            yes_book = poly_books.get(pair.polymarket_yes_token_id)
+            if yes_book is not None:
+                top[i, 4:6] = best_level(yes_book.asks, best=min)
+            no_book = poly_books.get(pair.polymarket_no_token_id)
+            if no_book is not None:
+                top[i, 6:8] = best_level(no_book.asks, best=min)
+
+        # a kalshi yes ask is the complement of the best no bid and vice versa
+        kalshi_yes_ask = 1.0 - top[:, 2]
+        kalshi_yes_ask_size = top[:, 3]
+        kalshi_no_ask = 1.0 - top[:, 0]
+        kalshi_no_ask_size = top[:, 1]
+        poly_yes_ask, poly_yes_ask_size = top[:, 4], top[:, 5]
+        poly_no_ask, poly_no_ask_size = top[:, 6], top[:, 7]
+
+        # direction 0: kalshi YES + polymarket NO
+        edge_a = 1.0 - (
+            kalshi_yes_ask
+            + kalshi_fee(kalshi_yes_ask, self.kalshi_fee_rate)
+            + poly_no_ask
+            + polymarket_fee(poly_no_ask, self.polymarket_fee_rate_bps)
+        )
+        size_a = np.fmin(kalshi_yes_ask_size, poly_no_ask_size)
+        # direction 1: kalshi NO + polymarket YES
+        edge_b = 1.0 - (
+            kalshi_no_ask
+            + kalshi_fee(kalshi_no_ask, self.kalshi_fee_rate)
+            + poly_yes_ask
+            + polymarket_fee(poly_yes_ask, self.polymarket_fee_rate_bps)
+        )
+        size_b = np.fmin(kalshi_no_ask_size, poly_yes_ask_size)
+
+        direction = np.where(
+            np.nan_to_num(edge_b, nan=-np.inf) > np.nan_to_num(edge_a, nan=-np.inf),
+            1,
+            0,
+        )
+        best_edge = np.where(direction == 1, edge_b, edge_a)
+        best_size = np.where(direction == 1, size_b, size_a)
+
+        # mid-to-mid yes price gap, mirrors the TS client's spread metric
+        kalshi_yes_mid = (top[:, 0] + kalshi_yes_ask) / 2.0
+        poly_yes_mid = (poly_yes_ask + (1.0 - poly_no_ask)) / 2.0
+
+        return SpreadScan(
+            pairs,
+            time.time(),
+            kalshi_yes_ask=kalshi_yes_ask,
+            kalshi_no_ask=kalshi_no_ask,
+            poly_yes_ask=poly_yes_ask,
+            poly_no_ask=poly_no_ask,
+            edge_kalshi_yes=edge_a,
+            edge_kalshi_no=edge_b,
+            direction=direction,
+            best_edge=best_edge,
+            best_size=best_size,
+            best_profit=best_edge * np.nan_to_num(best_size),
+            yes_mid_spread=kalshi_yes_mid - poly_yes_mid,
+        )
+
+
+if __name__ == "__main__":
+    from agents.polymarket.polymarket import Polymarket
+
+    scanner = ArbitrageScanner(PairRegistry(), Polymarket())
+    for opportunity in scanner.scan().opportunities():
+        print(opportunity)
@@ -0,0 +1,299 @@
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from agents.polymarket.feed import BookEvent, PriceChangeEvent, TradeEvent, BUY
+
+# ts is packed into the low 42 bits of the search key (ms until year 2109)
+TS_BITS = 42
+
+
+class ForecastLog:
+    """
+    Append-only JSONL log of forecasts made by the live agent, one line per
+    `(market_id, ts, probability, side)`, so they can be backtested later.
+    """
+
+    def __init__(self, local_file_path: str = "./local_db_forecasts/forecasts.jsonl"):
+        self.local_file_path = local_file_path
+
+    def append(
+        self, market_id: str, probability: float, side: str, ts: int = None
+    ) -> None:
+        directory = os.path.dirname(self.local_file_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        record = {
+            "market_id": str(market_id),
+            "ts": int(ts if ts is not None else time.time() * 1000),
+            "probability": float(probability),
+            "side": side.upper(),
+        }
+        with open(self.local_file_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def load(self) -> "list[dict]":
+        if not os.path.isfile(self.local_file_path):
+            return []
+        with open(self.local_file_path, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+class Forecasts:
+    """Columnar forecasts: market index, ts (ms), probability, side (+1 buy / -1 sell)."""
+
+    def __init__(self, markets: "list[str]", market, ts, probability, side) -> None:
+        self.markets = markets
+        self.market = np.asarray(market, dtype=np.int64)
+        self.ts = np.asarray(ts, dtype=np.int64)
+        self.probability = np.asarray(probability, dtype=np.float64)
+        self.side = np.asarray(side, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def from_records(cls, records: "list[dict]") -> "Forecasts":
+        markets = sorted({str(r["market_id"]) for r in records})
+        index = {m: i for i, m in enumerate(markets)}
+        return cls(
+            markets,
+            [index[str(r["market_id"])] for r in records],
+            [r["ts"] for r in records],
+            [r["probability"] for r in records],
+            [1 if str(r["side"]).upper() == "BUY" else -1 for r in records],
+        )
+
+
+class BookSeries:
+    """
+    Top-`depth` L2 snapshots for many tokens, sorted by (token, ts).
+
+    `ask_px`/`ask_sz`/`bid_px`/`bid_sz` are `(n_snapshots, depth)` arrays,
+    best level first, padded with NaN price / zero size.
+    """
+
+    def __init__(self, markets, market, ts, ask_px, ask_sz, bid_px, bid_sz) -> None:
+        order = np.lexsort((ts, market))
+        self.markets = list(markets)
+        self.market = np.asarray(market, dtype=np.int64)[order]
+        self.ts = np.asarray(ts, dtype=np.int64)[order]
+        self.ask_px = np.asarray(ask_px, dtype=np.float64)[order]
+        self.ask_sz = np.asarray(ask_sz, dtype=np.float64)[order]
+        self.bid_px = np.asarray(bid_px, dtype=np.float64)[order]
+        self.bid_sz = np.asarray(bid_sz, dtype=np.float64)[order]
+        self.keys = (self.market << TS_BITS) | self.ts
+
+    @classmethod
+    def from_prices(
+        cls, markets, market, ts, price, half_spread: float = 0.0, size=np.inf
+    ) -> "BookSeries":
+        """Single-level book from a price series, e.g. Gamma outcomePrices polls."""
+        price = np.asarray(price, dtype=np.float64)[:, None]
+        size = np.broadcast_to(np.asarray(size, dtype=np.float64), price.shape[:1])
+        size = size[:, None]
+        return cls(
+            markets, market, ts, price + half_spread, size, price - half_spread, size
+        )
+
+    @classmethod
+    def from_events(cls, events, depth: int = 5) -> "BookSeries":
+        """
+        Snapshots from feed events (live or `ReplayEngine.iter_events()`).
+        Price changes are applied to the last book for the token; trade
+        prints do not change the book and are skipped.
+        """
+        markets, index, books = [], {}, {}
+        market, ts, rows = [], [], []
+        for event in events:
+            if isinstance(event, BookEvent):
+                books[event.asset_id] = (dict(event.bids), dict(event.asks))
+            elif isinstance(event, TradeEvent):
+                # a TradeEvent is a PriceChangeEvent too; the taker side is no level
+                continue
+            elif isinstance(event, PriceChangeEvent) and event.asset_id in books:
+                levels = books[event.asset_id][0 if event.side == BUY else 1]
+                if event.size > 0:
+                    levels[event.price] = event.size
+                else:
+                    levels.pop(event.price, None)
+            else:
+                continue
+            if event.asset_id not in index:
+                index[event.asset_id] = len(markets)
+                markets.append(event.asset_id)
+            bids, asks = books[event.asset_id]
+            row = np.full(4 * depth, np.nan)
+            row[depth : 2 * depth] = 0.0
+            row[3 * depth :] = 0.0
+            best_asks = sorted(asks.items())[:depth]
+            best_bids = sorted(bids.items(), reverse=True)[:depth]
+            for i, (p, s) in enumerate(best_asks):
+                row[i], row[depth + i] = p, s
+            for i, (p, s) in enumerate(best_bids):
+                row[2 * depth + i], row[3 * depth + i] = p, s
+            market.append(index[event.asset_id])
+            ts.append(event.ts)
+            rows.append(row)
+        rows = np.asarray(rows).reshape(-1, 4 * depth)
+        return cls(
+            markets,
+            market,
+            ts,
+            rows[:, :depth],
+            rows[:, depth : 2 * depth],
+            rows[:, 2 * depth : 3 * depth],
+            rows[:, 3 * depth :],
+        )
+
+    def lookup(self, markets: "list[str]", market: np.ndarray, ts: np.ndarray):
+        """Index of the latest snapshot at or before each (market, ts), -1 if none."""
+        index = {m: i for i, m in enumerate(self.markets)}
+        remap = np.array([index.get(m, -1) for m in markets], dtype=np.int64)
+        mapped = remap[market] if len(markets) else np.zeros(0, dtype=np.int64)
+        keys = (np.maximum(mapped, 0) << TS_BITS) | ts
+        i = np.searchsorted(self.keys, keys, side="right") - 1
+        valid = (mapped >= 0) & (i >= 0)
+        valid[valid] &= self.market[i[valid]] == mapped[valid]
+        return np.where(valid, i, -1)
+
+
+def walk_book(
+    px: np.ndarray, sz: np.ndarray, notional: np.ndarray, limit_ok: np.ndarray
+):
+    """
+    Fill `notional` USDC against levels row by row, best level first.
+    Returns (shares, cash) per row. Levels failing `limit_ok` are skipped.
+    """
+    level_px = np.nan_to_num(px, nan=0.0)
+    level_cash = np.where(limit_ok, level_px * sz, 0.0)
+    level_cash = np.nan_to_num(level_cash, nan=0.0, posinf=np.inf)
+    # cash available ahead of each level; shifted cumsum avoids inf - inf
+    before = np.zeros_like(level_cash)
+    before[:, 1:] = np.cumsum(level_cash[:, :-1], axis=1)
+    remaining = np.clip(notional[:, None] - before, 0.0, None)
+    cash = np.minimum(level_cash, remaining)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shares = np.where(level_px > 0, cash / level_px, 0.0)
+    return shares.sum(axis=1), cash.sum(axis=1)
+
+
+class Backtester:
+    """
+    Vectorized backtest of probability forecasts against recorded books.
+
+    Every forecast is matched to the latest book snapshot for its token at or
+    before the forecast time. A BUY lifts asks priced at or below
+    `probability - min_edge`; a SELL hits bids at or above
+    `probability + min_edge`; each trade spends at most `notional` USDC.
+    Trades are held to resolution, where each share pays `outcome` (0 or 1).
+    """
+
+    def __init__(
+        self, forecasts: Forecasts, books: BookSeries, outcomes: "dict[str, float]"
+    ) -> None:
+        self.forecasts = forecasts
+        self.books = books
+        self.outcome = (
+            np.array(
+                [outcomes.get(m, np.nan) for m in forecasts.markets], dtype=np.float64
+            )[forecasts.market]
+            if len(forecasts)
+            else np.zeros(0)
+        )
+        self.snapshot = books.lookup(forecasts.markets, forecasts.market, forecasts.ts)
+
+    def run(self, min_edge: float = 0.0, notional: float = 10.0) -> dict:
+        f = self.forecasts
+        has_book = self.snapshot >= 0
+        i = np.where(has_book, self.snapshot, 0)
+        buy = f.side > 0
+
+        px = np.where(buy[:, None], self.books.ask_px[i], self.books.bid_px[i])
+        sz = np.where(buy[:, None], self.books.ask_sz[i], self.books.bid_sz[i])
+        limit = np.where(buy, f.probability - min_edge, f.probability + min_edge)
+        with np.errstate(invalid="ignore"):
+            limit_ok = np.where(
+                buy[:, None], px <= limit[:, None], px >= limit[:, None]
+            )
+        budget = np.where(has_book, notional, 0.0)
+        shares, cash = walk_book(px, sz, budget, limit_ok)
+
+        resolved = ~np.isnan(self.outcome)
+        payout = shares * np.nan_to_num(self.outcome)
+        pnl = np.where(buy, payout - cash, cash - payout)
+        pnl = np.where(resolved, pnl, 0.0)
+        traded = shares > 0
+
+        return {
+            "min_edge": min_edge,
+            "notional": notional,
+            "trades": int(traded.sum()),
+            "shares": shares,
+            "cash": cash,
+            "pnl": pnl,
+            "total_pnl": float(pnl.sum()),
+            "turnover": float(cash.sum()),
+            "hit_rate": (
+                float((pnl[traded & resolved] > 0).mean())
+                if (traded & resolved).any()
+                else float("nan")
+            ),
+            "pnl_by_market": np.bincount(
+                f.market, weights=pnl, minlength=len(f.markets)
+            ),
+        }
+
+    def brier_score(self) -> float:
+        resolved = ~np.isnan(self.outcome)
+        if not resolved.any():
+            return float("nan")
+        error = self.forecasts.probability[resolved] - self.outcome[resolved]
+        return float(np.mean(error**2))
+
+    def calibration(self, n_bins: int = 10) -> dict:
+        """Per-bin mean forecast, realized frequency and count."""
+        resolved = ~np.isnan(self.outcome)
+        p = self.forecasts.probability[resolved]
+        o = self.outcome[resolved]
+        b = np.clip((p * n_bins).astype(np.int64), 0, n_bins - 1)
+        count = np.bincount(b, minlength=n_bins)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                "bin_edges": np.linspace(0.0, 1.0, n_bins + 1),
+                "mean_forecast": np.bincount(b, weights=p, minlength=n_bins) / count,
+                "frequency": np.bincount(b, weights=o, minlength=n_bins) / count,
+                "count": count,
+            }
+
+    def sweep(
+        self, param_grid: "dict[str, list]", processes: int = None
+    ) -> "list[dict]":
+        """
+        Run every combination in `param_grid` (keys are `run` kwargs) across
+        worker processes. Per-trade arrays are dropped from the results.
+        """
+        names = list(param_grid)
+        combos = [dict(zip(names, v)) for v in itertools.product(*param_grid.values())]
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_worker, initargs=(self,)
+        ) as pool:
+            return list(pool.map(_run_summary, combos))
+
+
+# each sweep worker unpickles the backtester once, not once per combination
+_worker_backtester = None
+
+
+def _init_worker(backtester: Backtester) -> None:
+    global _worker_backtester
+    _worker_backtester = backtester
+
+
+def _run_summary(params: dict) -> dict:
+    result = _worker_backtester.run(**params)
+    return {k: v for k, v in result.items() if not isinstance(v, np.ndarray)}
@@ -1,11 +1,8 @@
 import os
 import json
-import ast
-import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any
 
-import math
-
 from dotenv import load_dotenv
 
 # Optional xai_sdk imports (requires Python 3.10+)
@@ -37,24 +34,24 @@ except ImportError:
 from agents.polymarket.gamma import GammaMarketClient as Gamma
 from agents.connectors.chroma import PolymarketRAG as Chroma
 from agents.utils.objects import SimpleEvent, SimpleMarket
+from agents.utils.records import json_floats, json_list
+from agents.utils.tokens import TokenCounter, pack
+from agents.utils.compaction import (
+    EVENT_COLUMNS,
+    MARKET_COLUMNS,
+    compact_polymarket,
+    row_text,
+)
+from agents.utils.rate_limit import RateLimiter
+from agents.utils.llm_cache import LLMCache
+from agents.utils.trade_parser import TradeParser, parse_trade
 from agents.application.prompts import Prompter
 from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.history import PriceHistoryStore
 from agents.polymarket.grok_tools import create_polymarket_tools, execute_polymarket_tool
 
-def retain_keys(data, keys_to_retain):
-    if isinstance(data, dict):
-        return {
-            key: retain_keys(value, keys_to_retain)
-            for key, value in data.items()
-            if key in keys_to_retain
-        }
-    elif isinstance(data, list):
-        return [retain_keys(item, keys_to_retain) for item in data]
-    else:
-        return data
-
 class Executor:
-    def __init__(self, default_model=None) -> None:
+    def __init__(self, default_model=None, bypass_cache: bool = False) -> None:
         load_dotenv()
         # Use GROK_MODEL from env or default to grok-4-1-fast
         self.model = os.getenv("GROK_MODEL", "grok-4-1-fast")
@@ -63,7 +60,17 @@ class Executor:
         
         max_token_model = {'grok-4-1-fast': 95000, 'grok-4-fast': 95000, 'grok-4': 95000}
         self.token_limit = max_token_model.get(self.model, 95000)
+        self.tokens = TokenCounter()
+        # concurrency and pacing of chunked Grok calls in get_polymarket_llm
+        self.max_concurrency = int(os.getenv("GROK_MAX_CONCURRENCY", 4))
+        self.rate_limiter = RateLimiter(
+            rate=float(os.getenv("GROK_REQUESTS_PER_SECOND", 2)),
+            burst=self.max_concurrency,
+        )
         self.prompter = Prompter()
+        # idempotent re-runs reuse answers; GROK_CACHE_TTL=0 disables reuse
+        self.llm_cache = LLMCache(ttl=float(os.getenv("GROK_CACHE_TTL", 3600)))
+        self.bypass_cache = bypass_cache or os.getenv("GROK_CACHE_BYPASS") == "1"
         
         # Check if xai_sdk is available
         if not XAI_SDK_AVAILABLE:
@@ -82,6 +89,7 @@ class Executor:
         self.gamma = Gamma()
         self.chroma = Chroma()
         self.polymarket = Polymarket()
+        self.history = PriceHistoryStore()
         
         # Initialize xAI client
         self.client = Client(api_key=self.xai_api_key, timeout=3600)
@@ -126,7 +134,7 @@ class Executor:
                     tool_name = tool_call.function.name
                     args = json.loads(tool_call.function.arguments)
                     result = execute_polymarket_tool(
-                        tool_name, args, self.polymarket, self.gamma
+                        tool_name, args, self.polymarket, self.gamma, self.history
                     )
                     chat.append(tool_result(result, call_id=tool_call.id))
             else:
@@ -139,6 +147,9 @@ class Executor:
         prompt = self.prompter.superforecaster(
             description=event_title, question=market_question, outcome=outcome
         )
+        return self.cached_response(prompt, None, lambda: self._superforecast(prompt))
+
+    def _superforecast(self, prompt: str) -> str:
         chat = self.client.chat.create(
             model=self.model,
             tools=self.tools,
@@ -166,20 +177,35 @@ class Executor:
                     tool_name = tool_call.function.name
                     args = json.loads(tool_call.function.arguments)
                     result = execute_polymarket_tool(
-                        tool_name, args, self.polymarket, self.gamma
+                        tool_name, args, self.polymarket, self.gamma, self.history
                     )
                     chat.append(tool_result(result, call_id=tool_call.id))
             else:
                 return response.content
 
 
+    def cached_response(self, prompt: str, data, compute) -> str:
+        """
+        Return the cached Grok answer for (model, prompt, data) or call
+        `compute()` and store it. `self.bypass_cache` forces a fresh call.
+        """
+        key = self.llm_cache.key(self.model, prompt, data)
+        content = self.llm_cache.get(key, bypass=self.bypass_cache)
+        if content is not None:
+            print(f"using cached Grok response (hit rate {self.llm_cache.hit_rate:.0%})")
+            return content
+        content = compute()
+        self.llm_cache.put(key, content, self.model)
+        return content
+
     def estimate_tokens(self, text: str) -> int:
-        # This is a rough estimate. For more accurate results, consider using a tokenizer.
-        return len(text) // 4  # Assuming average of 4 characters per token
+        return self.tokens.count(text)
 
     def process_data_chunk(self, data1: List[Dict[Any, Any]], data2: List[Dict[Any, Any]], user_input: str) -> str:
         """Process data chunk using Grok."""
-        system_prompt = str(self.prompter.prompts_polymarket(data1=data1, data2=data2))
+        system_prompt = self.prompter.prompts_polymarket_tables(
+            compact_polymarket(data1, data2)
+        )
         chat = self.client.chat.create(
             model=self.model,
             tools=self.tools,
@@ -208,70 +234,131 @@ class Executor:
                     tool_name = tool_call.function.name
                     args = json.loads(tool_call.function.arguments)
                     result = execute_polymarket_tool(
-                        tool_name, args, self.polymarket, self.gamma
+                        tool_name, args, self.polymarket, self.gamma, self.history
                     )
                     chat.append(tool_result(result, call_id=tool_call.id))
             else:
                 return response.content
 
 
-    def divide_list(self, original_list, i):
-        # Calculate the size of each sublist
-        sublist_size = math.ceil(len(original_list) / i)
-        
-        # Use list comprehension to create sublists
-        return [original_list[j:j+sublist_size] for j in range(0, len(original_list), sublist_size)]
-    
-    def get_polymarket_llm(self, user_input: str) -> str:
+    def pack_records(
+        self, data1: List[Dict[Any, Any]], data2: List[Dict[Any, Any]], budget: int
+    ) -> "list[tuple[list, list]]":
+        """
+        Bin-pack events (data1) and markets (data2) into as few chunks as
+        possible, each fitting `budget` tokens. Every record is measured once.
+        """
+        records = [(0, r) for r in data1] + [(1, r) for r in data2]
+        sizes = self.record_tokens(data1, data2)
+        chunks = []
+        for bin_indices in pack(sizes, budget):
+            chunk = ([], [])
+            for i in bin_indices:
+                kind, record = records[i]
+                chunk[kind].append(record)
+            chunks.append(chunk)
+        return chunks
+
+    def record_tokens(
+        self, data1: List[Dict[Any, Any]], data2: List[Dict[Any, Any]]
+    ) -> "list[int]":
+        """
+        Tokens per compacted table row (+1 for the newline). Rows are measured
+        before dictionary encoding, so the sizes are an upper bound.
+        """
+        return [
+            self.estimate_tokens(row_text(r, EVENT_COLUMNS)) + 1 for r in data1
+        ] + [self.estimate_tokens(row_text(r, MARKET_COLUMNS)) + 1 for r in data2]
+
+    def get_polymarket_llm(self, user_input: str, on_partial=None) -> str:
+        """
+        Answer `user_input` over current events and markets. Data over the
+        token limit is packed into chunks that are answered concurrently, each
+        partial answer is passed to `on_partial(index, answer)` as it arrives,
+        and a final call synthesizes them into one response.
+        """
         data1 = self.gamma.get_current_events()
         data2 = self.gamma.get_current_markets()
-        
-        combined_data = str(self.prompter.prompts_polymarket(data1=data1, data2=data2))
-        
-        # Estimate total tokens
-        total_tokens = self.estimate_tokens(combined_data)
-        
-        # Set a token limit (adjust as needed, leaving room for system and user messages)
-        token_limit = self.token_limit
-        if total_tokens <= token_limit:
+        # every poll also feeds the get_polymarket_price_history tool
+        try:
+            self.history.sample_gamma_markets(data2)
+        except Exception as e:
+            print(f"[Executor] price history sampling failed: {e}")
+
+        # prompt template, table headers and user message go with every chunk
+        overhead = self.estimate_tokens(
+            self.prompter.prompts_polymarket_tables(compact_polymarket([], []))
+        ) + self.estimate_tokens(user_input)
+        budget = self.token_limit - overhead
+        total_tokens = overhead + sum(self.record_tokens(data1, data2))
+
+        if total_tokens <= self.token_limit:
             # If within limit, process normally
             return self.process_data_chunk(data1, data2, user_input)
-        else:
-            # If exceeding limit, process in chunks
-            chunk_size = len(combined_data) // ((total_tokens // token_limit) + 1)
-            print(f'total tokens {total_tokens} exceeding llm capacity, now will split and answer')
-            group_size = (total_tokens // token_limit) + 1 # 3 is safe factor
-            keys_no_meaning = ['image','pagerDutyNotificationEnabled','resolvedBy','endDate','clobTokenIds','negRiskMarketID','conditionId','updatedAt','startDate']
-            useful_keys = ['id','questionID','description','liquidity','clobTokenIds','outcomes','outcomePrices','volume','startDate','endDate','question','questionID','events']
-            data1 = retain_keys(data1, useful_keys)
-            cut_1 = self.divide_list(data1, group_size)
-            cut_2 = self.divide_list(data2, group_size)
-            cut_data_12 = zip(cut_1, cut_2)
-
-            results = []
-
-            for cut_data in cut_data_12:
-                sub_data1 = cut_data[0]
-                sub_data2 = cut_data[1]
-                sub_tokens = self.estimate_tokens(str(self.prompter.prompts_polymarket(data1=sub_data1, data2=sub_data2)))
-
-                result = self.process_data_chunk(sub_data1, sub_data2, user_input)
-                results.append(result)
-            
-            combined_result = " ".join(results)
-            
-        
-            
-            return combined_result
+
+        print(f'total tokens {total_tokens} exceeding llm capacity, now will split and answer')
+        chunks = self.pack_records(data1, data2, budget)
+        print(f'packed {len(data1) + len(data2)} records into {len(chunks)} chunks')
+
+        partials = {}
+        for i, answer in self.map_chunks(chunks, user_input):
+            partials[i] = answer
+            print(f'chunk {i + 1}/{len(chunks)} answered')
+            if on_partial is not None:
+                on_partial(i, answer)
+        if not partials:
+            raise Exception("Every chunk of the Polymarket data failed to get an answer")
+        answers = [partials[i] for i in sorted(partials)]
+        if len(answers) == 1:
+            return answers[0]
+        return self.synthesize_answers(user_input, answers)
+
+    def map_chunks(self, chunks: "list[tuple[list, list]]", user_input: str):
+        """
+        Answer every chunk concurrently (at most `max_concurrency` in flight,
+        paced by `rate_limiter`) and yield `(index, answer)` as each finishes.
+        A failed chunk is logged and skipped.
+        """
+        def answer(chunk):
+            self.rate_limiter.acquire()
+            return self.process_data_chunk(chunk[0], chunk[1], user_input)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            futures = {pool.submit(answer, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    yield i, future.result()
+                except Exception as e:
+                    print(f'chunk {i + 1}/{len(chunks)} failed: {e}')
+
+    def synthesize_answers(self, user_input: str, answers: List[str]) -> str:
+        """Reduce step: merge per-chunk answers into one ranked response."""
+        self.rate_limiter.acquire()
+        chat = self.client.chat.create(model=self.model, store_messages=True)
+        chat.append(xai_user(self.prompter.synthesize_polymarket(user_input, answers)))
+        return chat.sample().content
+
     def filter_events(self, events: "list[SimpleEvent]") -> str:
-        """Filter events using Grok."""
-        prompt = self.prompter.filter_events(events)
+        """
+        Filter events using Grok. The analyst prompt goes in as the system
+        message and the events as the user message; Prompter.filter_events()
+        takes no arguments, so the events were never in the prompt before.
+        """
+        prompt = self.prompter.filter_events()
+        data = [e.dict() for e in events]
+        return self.cached_response(
+            prompt, data, lambda: self._filter_events(prompt, data)
+        )
+
+    def _filter_events(self, prompt: str, data: List[Dict[Any, Any]]) -> str:
         chat = self.client.chat.create(
             model=self.model,
             tools=self.tools,
             store_messages=True,
         )
-        chat.append(xai_user(prompt))
+        chat.append(xai_system(prompt))
+        chat.append(xai_user(str(data)))
         response = chat.sample()
         return response.content
 
@@ -306,8 +393,8 @@ class Executor:
         """Source best trade using Grok with search and Polymarket tools."""
         market_document = market_object[0].dict()
         market = market_document["metadata"]
-        outcome_prices = ast.literal_eval(market["outcome_prices"])
-        outcomes = ast.literal_eval(market["outcomes"])
+        outcome_prices = json_floats(market["outcome_prices"])
+        outcomes = json_list(market["outcomes"])
         question = market["question"]
         description = market_document["page_content"]
 
@@ -315,7 +402,12 @@ class Executor:
         print()
         print("... prompting with Grok ... ", prompt)
         print()
-        
+        # keyed on the metadata too, so a price move invalidates the cached trade
+        return self.cached_response(
+            prompt, market, lambda: self._best_trade(prompt, outcomes, outcome_prices)
+        )
+
+    def _best_trade(self, prompt: str, outcomes: list, outcome_prices: list) -> str:
         chat = self.client.chat.create(
             model=self.model,
             tools=self.tools,
@@ -343,7 +435,7 @@ class Executor:
                     tool_name = tool_call.function.name
                     args = json.loads(tool_call.function.arguments)
                     result = execute_polymarket_tool(
-                        tool_name, args, self.polymarket, self.gamma
+                        tool_name, args, self.polymarket, self.gamma, self.history
                     )
                     chat.append(tool_result(result, call_id=tool_call.id))
             else:
@@ -356,25 +448,45 @@ class Executor:
         print("... prompting ... ", prompt)
         print()
         
+        # the forecast and prices are all in the prompt; without client-side
+        # tools the stream can't end on a tool call instead of a trade block
         chat = self.client.chat.create(
             model=self.model,
-            tools=self.tools,
             store_messages=True,
         )
         chat.append(xai_user(prompt))
-        response = chat.sample()
-        content = response.content
+        content = self.stream_trade(chat)
 
         print("result: ", content)
         print()
         return content
 
+    def stream_trade(self, chat) -> str:
+        """
+        Stream the trade answer and cancel the generation as soon as the
+        price/size/side block has been parsed. Returns the text received.
+        `chat` must have no client-side tools: a tool call would end the
+        stream without a trade block.
+        """
+        parser = TradeParser()
+        stream = chat.stream()
+        try:
+            for _, chunk in stream:
+                if parser.feed(chunk.content) is not None:
+                    break
+        finally:
+            # closing the generator cancels the underlying gRPC stream
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        return parser.text
+
     def format_trade_prompt_for_execution(self, best_trade: str) -> float:
-        data = best_trade.split(",")
-        # price = re.findall(r"\d+\.\d+", data[0])[0]
-        size = re.findall(r"\d+\.\d+", data[1])[0]
+        trade = parse_trade(best_trade)
+        if trade is None:
+            raise ValueError(f"No price/size/side block in trade: {best_trade!r}")
         usdc_balance = self.polymarket.get_usdc_balance()
-        return float(size) * usdc_balance
+        return trade.size * usdc_balance
 
     def source_best_market_to_create(self, filtered_markets) -> str:
         """Source best market to create using Grok."""
@@ -382,6 +494,11 @@ class Executor:
         print()
         print("... prompting with Grok ... ", prompt)
         print()
+        return self.cached_response(
+            prompt, filtered_markets, lambda: self._market_to_create(prompt)
+        )
+
+    def _market_to_create(self, prompt: str) -> str:
         chat = self.client.chat.create(
             model=self.model,
             tools=self.tools,
@@ -0,0 +1,344 @@
+import asyncio
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from agents.polymarket.feed import BUY, MarketFeed
+from agents.polymarket.table import MarketTable
+from agents.utils.objects import OrderLeg
+from agents.utils.records import json_list
+
+
+def daily_rewards(table: MarketTable) -> np.ndarray:
+    """Total `rewardsDailyRate` of each row's active `clobRewards` programs."""
+    return np.fromiter(
+        (
+            sum(
+                float(r.get("rewardsDailyRate") or 0)
+                for r in row.get("clobRewards") or []
+            )
+            for row in (table.rows[i] for i in table.index)
+        ),
+        dtype=np.float64,
+        count=len(table),
+    )
+
+
+def reward_scores(table: MarketTable) -> np.ndarray:
+    """
+    Daily reward per dollar quoted, discounted by how contested the market
+    is (Gamma's `competitive`, 0..1). A two-sided quote of `rewardsMinSize`
+    shares ties up about `rewardsMinSize` USDC (bid at p plus the NO bid at
+    1 - p). Ineligible markets score -inf.
+    """
+    daily = daily_rewards(table)
+    min_size = np.nan_to_num(table["rewardsMinSize"], nan=0.0)
+    max_spread = np.nan_to_num(table["rewardsMaxSpread"], nan=0.0)
+    competition = np.clip(np.nan_to_num(table["competitive"], nan=0.0), 0.0, 1.0)
+    eligible = (
+        table["active"]
+        & ~table["closed"]
+        & table["enableOrderBook"]
+        & table["acceptingOrders"]
+        & (daily > 0)
+        & (max_spread > 0)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = daily / np.maximum(min_size, 1.0) * (1.0 - 0.5 * competition)
+    return np.where(eligible, score, -np.inf)
+
+
+def select_markets(table: MarketTable, k: int) -> MarketTable:
+    scored = MarketTable(
+        table.rows,
+        table.index,
+        dict(table.columns, reward_score=reward_scores(table)),
+        table.categories,
+    )
+    top = scored.top_k("reward_score", k)
+    return top.filter(np.isfinite(top["reward_score"]))
+
+
+def target_quotes(
+    best_bid: float,
+    best_ask: float,
+    tick: float,
+    max_spread: float,
+    fraction: float = 0.5,
+) -> "tuple[float, float] | None":
+    """
+    Bid and ask inside the reward band: `fraction` of `max_spread` (in
+    cents) from the midpoint, on the tick grid, never crossing the book.
+    """
+    if not (0 < best_bid < best_ask < 1):
+        return None
+    mid = (best_bid + best_ask) / 2
+    band = max_spread / 100
+    offset = max(tick, fraction * band)
+    digits = max(0, -int(math.floor(math.log10(tick))))
+    bid = min(math.floor((mid - offset) / tick + 1e-9) * tick, best_ask - tick)
+    ask = max(math.ceil((mid + offset) / tick - 1e-9) * tick, best_bid + tick)
+    if mid - bid > band + 1e-9:
+        bid += tick
+    if ask - mid > band + 1e-9:
+        ask -= tick
+    bid, ask = round(bid, digits), round(ask, digits)
+    if bid < tick or ask > 1 - tick or bid >= ask:
+        return None
+    return bid, ask
+
+
+class Book:
+    __slots__ = ("bids", "asks")
+
+    def __init__(self) -> None:
+        self.bids: "dict[float, float]" = {}
+        self.asks: "dict[float, float]" = {}
+
+    def best(self) -> "tuple[float, float]":
+        return (
+            max(self.bids) if self.bids else 0.0,
+            min(self.asks) if self.asks else 1.0,
+        )
+
+
+class QuotedMarket:
+    """One rewarded market: the YES book drives bids on YES and on NO."""
+
+    __slots__ = (
+        "condition_id",
+        "yes",
+        "no",
+        "tick",
+        "size",
+        "max_spread",
+        "book",
+        "bid",
+        "ask",
+        "pending",
+        "busy",
+    )
+
+    def __init__(self, condition_id, yes, no, tick, size, max_spread) -> None:
+        self.condition_id = condition_id
+        self.yes = yes
+        self.no = no
+        self.tick = tick
+        self.size = size
+        self.max_spread = max_spread
+        self.book = Book()
+        # resting (price, order id) per leg; the ask rests as a NO bid at 1 - ask
+        self.bid = None
+        self.ask = None
+        self.pending = None  # newest target not yet sent
+        self.busy = False
+
+
+class MarketMaker:
+    """
+    Reward-farming quoter for many markets on one asyncio loop.
+
+    Book events from the market feed update a local YES book; each update
+    recomputes the target bid/ask and only cancels and replaces a resting
+    leg when it has drifted at least `requote_ticks` or left the reward
+    band; the other leg keeps its place in the queue. The ask is quoted as a NO bid at `1 - ask`, so no inventory is
+    needed. Order calls are blocking HTTP and run on worker threads; while
+    one is in flight for a market, newer targets just overwrite `pending`.
+
+    `latency` keeps the time from event receipt to quote decision (the
+    quoting loop itself) for the last `window` events; `latency_percentiles`
+    reports p50/p99 in microseconds.
+    """
+
+    def __init__(
+        self,
+        polymarket,
+        markets: "list[QuotedMarket]",
+        requote_ticks: int = 2,
+        fraction: float = 0.5,
+        window: int = 100_000,
+    ) -> None:
+        self.polymarket = polymarket
+        self.markets = {m.yes: m for m in markets}
+        self.requote_ticks = requote_ticks
+        self.fraction = fraction
+        self.latency = deque(maxlen=window)
+        self.ack_ms = deque(maxlen=window)
+        self.requotes = 0
+        self.skipped = 0
+        self.tasks: "set[asyncio.Task]" = set()
+
+    @classmethod
+    def from_table(
+        cls, polymarket, table: MarketTable, k: int = 100, size_multiplier=1.0, **kw
+    ) -> "MarketMaker":
+        selected = select_markets(table, k)
+        markets = []
+        for i in range(len(selected)):
+            row = selected.raw(i)
+            tokens = json_list(row.get("clobTokenIds"))
+            if len(tokens) != 2:
+                continue
+            min_size = max(
+                float(row.get("rewardsMinSize") or 0),
+                float(row.get("orderMinSize") or 0),
+            )
+            markets.append(
+                QuotedMarket(
+                    row.get("conditionId"),
+                    tokens[0],
+                    tokens[1],
+                    float(row.get("orderPriceMinTickSize") or 0.01),
+                    min_size * size_multiplier,
+                    float(row["rewardsMaxSpread"]),
+                )
+            )
+        return cls(polymarket, markets, **kw)
+
+    # --- feed handler ---
+
+    def on_book(self, event) -> None:
+        market = self.markets.get(event.asset_id)
+        if market is None:
+            return
+        start = time.perf_counter()
+        market.book.bids = dict(event.bids)
+        market.book.asks = dict(event.asks)
+        self.decide(market, start)
+
+    def on_price_change(self, event) -> None:
+        market = self.markets.get(event.asset_id)
+        if market is None:
+            return
+        start = time.perf_counter()
+        levels = market.book.bids if event.side == BUY else market.book.asks
+        if event.size > 0:
+            levels[event.price] = event.size
+        else:
+            levels.pop(event.price, None)
+        self.decide(market, start)
+
+    # --- quoting ---
+
+    def stale_legs(self, market: QuotedMarket, target) -> "tuple[bool, bool]":
+        """Whether the resting bid / ask should be replaced to reach `target`."""
+        best_bid, best_ask = market.book.best()
+        mid = (best_bid + best_ask) / 2
+        band = market.max_spread / 100
+        drift = self.requote_ticks * market.tick - 1e-9
+        bid, ask = market.bid, market.ask
+        return (
+            bid is None or abs(target[0] - bid[0]) >= drift or mid - bid[0] > band,
+            ask is None or abs(target[1] - ask[0]) >= drift or ask[0] - mid > band,
+        )
+
+    def needs_requote(self, market: QuotedMarket, target) -> bool:
+        return any(self.stale_legs(market, target))
+
+    def decide(self, market: QuotedMarket, start: float) -> None:
+        best_bid, best_ask = market.book.best()
+        target = target_quotes(
+            best_bid, best_ask, market.tick, market.max_spread, self.fraction
+        )
+        if target is not None and self.needs_requote(market, target):
+            market.pending = target
+            if not market.busy:
+                market.busy = True
+                task = asyncio.get_running_loop().create_task(self.requote(market))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+        else:
+            self.skipped += 1
+        self.latency.append(time.perf_counter() - start)
+
+    async def requote(self, market: QuotedMarket) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while market.pending is not None:
+                bid, ask = market.pending
+                market.pending = None
+                stale_bid, stale_ask = self.stale_legs(market, (bid, ask))
+                legs = []
+                if stale_bid:
+                    legs.append(
+                        OrderLeg(token_id=market.yes, price=bid, size=market.size)
+                    )
+                if stale_ask:
+                    legs.append(
+                        OrderLeg(
+                            token_id=market.no,
+                            price=round(1 - ask, 6),
+                            size=market.size,
+                        )
+                    )
+                if not legs:
+                    continue
+                ids = [
+                    quote[1]
+                    for quote, stale in (
+                        (market.bid, stale_bid),
+                        (market.ask, stale_ask),
+                    )
+                    if stale and quote is not None
+                ]
+                if ids:
+                    await loop.run_in_executor(None, self.polymarket.cancel_orders, ids)
+                if stale_bid:
+                    market.bid = None
+                if stale_ask:
+                    market.ask = None
+                results = await loop.run_in_executor(
+                    None, self.polymarket.execute_orders, legs
+                )
+                self.requotes += 1
+                self.ack_ms.extend(r.latency_ms for r in results)
+                # a leg that failed (risk reject, API error) stays None, so the
+                # next book event quotes it again instead of trusting a ghost
+                for result in results:
+                    if not (result.success and result.order_id):
+                        continue
+                    if result.leg.token_id == market.yes:
+                        market.bid = (bid, result.order_id)
+                    else:
+                        market.ask = (ask, result.order_id)
+        except Exception as e:
+            print(f"[MarketMaker] requote {market.condition_id} failed: {e}")
+        finally:
+            market.busy = False
+
+    async def cancel_all(self) -> None:
+        loop = asyncio.get_running_loop()
+        ids = [
+            quote[1]
+            for m in self.markets.values()
+            for quote in (m.bid, m.ask)
+            if quote is not None
+        ]
+        if ids:
+            await loop.run_in_executor(None, self.polymarket.cancel_orders, ids)
+
+    def latency_percentiles(self) -> dict:
+        if not self.latency:
+            return {}
+        us = np.array(self.latency) * 1e6
+        stats = {
+            "events": len(us),
+            "p50_us": float(np.percentile(us, 50)),
+            "p99_us": float(np.percentile(us, 99)),
+            "requotes": self.requotes,
+            "skipped": self.skipped,
+        }
+        if self.ack_ms:
+            stats["ack_p99_ms"] = float(np.percentile(np.array(self.ack_ms), 99))
+        return stats
+
+    async def run(self, feed=None) -> None:
+        feed = feed or MarketFeed(list(self.markets))
+        try:
+            await feed.run(self)
+        finally:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            await self.cancel_all()
+            print(f"[MarketMaker] {self.latency_percentiles()}")
@@ -0,0 +1,352 @@
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from agents.application.arbitrage import PairRegistry
+from agents.connectors.chroma import PolymarketRAG
+from agents.utils.objects import MarketPair
+
+NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def parse_iso_days(value: str) -> float:
+    """ISO-8601 timestamp -> fractional days since epoch, NaN if unparseable."""
+    if not value:
+        return np.nan
+    try:
+        return (
+            datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() / 86400.0
+        )
+    except ValueError:
+        return np.nan
+
+
+def question_numbers(text: str) -> "frozenset[str]":
+    return frozenset(n.replace(",", "") for n in NUMBER_PATTERN.findall(text or ""))
+
+
+class MatchRecord:
+    __slots__ = ("venue_id", "text", "end_day", "category", "tokens")
+
+    def __init__(self, venue_id, text, end_day, category, tokens=None) -> None:
+        self.venue_id = venue_id
+        self.text = text
+        self.end_day = end_day
+        self.category = category
+        self.tokens = tokens
+
+
+def polymarket_record(market: dict) -> MatchRecord:
+    """Raw Gamma market -> MatchRecord, None if it isn't a binary Yes/No market."""
+    outcomes = market.get("outcomes")
+    token_ids = market.get("clobTokenIds")
+    if isinstance(outcomes, str):
+        outcomes = json.loads(outcomes)
+    if isinstance(token_ids, str):
+        token_ids = json.loads(token_ids)
+    if not outcomes or not token_ids or len(outcomes) != 2 or len(token_ids) != 2:
+        return None
+    labels = [o.lower() for o in outcomes]
+    if sorted(labels) != ["no", "yes"]:
+        return None
+    yes = labels.index("yes")
+    category = market.get("category")
+    if not category and market.get("events"):
+        category = market["events"][0].get("category")
+    return MatchRecord(
+        str(market["id"]),
+        market.get("question") or "",
+        parse_iso_days(market.get("endDate")),
+        (category or "").lower(),
+        (str(token_ids[yes]), str(token_ids[1 - yes])),
+    )
+
+
+def kalshi_record(market: dict, categories: dict = None) -> MatchRecord:
+    text = market.get("title") or ""
+    subtitle = market.get("yes_sub_title") or market.get("subtitle")
+    if subtitle and subtitle not in text:
+        text = f"{text} {subtitle}"
+    category = market.get("category")
+    if not category and categories:
+        category = categories.get(market.get("event_ticker"))
+    return MatchRecord(
+        market["ticker"],
+        text,
+        parse_iso_days(market.get("close_time") or market.get("expiration_time")),
+        (category or "").lower(),
+    )
+
+
+class EmbeddingCache:
+    """
+    Question embeddings keyed by a hash of the text, persisted as one float32
+    matrix so a warm start only embeds markets it has never seen.
+    """
+
+    def __init__(self, local_directory: str, rag: PolymarketRAG) -> None:
+        self.local_directory = local_directory
+        self.rag = rag
+        self.keys_path = os.path.join(local_directory, "embedding_keys.json")
+        self.matrix_path = os.path.join(local_directory, "embeddings.npy")
+        self.rows: "dict[str, int]" = {}
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        if os.path.isfile(self.keys_path) and os.path.isfile(self.matrix_path):
+            with open(self.keys_path, "r") as f:
+                self.rows = {k: i for i, k in enumerate(json.load(f))}
+            self.matrix = np.load(self.matrix_path)
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha1(text.strip().lower().encode("utf-8")).hexdigest()
+
+    def get(self, texts: "list[str]", batch_size: int = 512) -> np.ndarray:
+        keys = [self.key(t) for t in texts]
+        missing = {}
+        for k, t in zip(keys, texts):
+            if k not in self.rows and k not in missing:
+                missing[k] = t
+        if missing:
+            new_keys = list(missing)
+            new_texts = list(missing.values())
+            vectors = []
+            for i in range(0, len(new_texts), batch_size):
+                vectors.extend(self.rag.embed_texts(new_texts[i : i + batch_size]))
+            vectors = np.asarray(vectors, dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            offset = len(self.rows)
+            self.matrix = vectors if offset == 0 else np.vstack([self.matrix, vectors])
+            for i, k in enumerate(new_keys):
+                self.rows[k] = offset + i
+            self.save()
+        if not keys:
+            return np.zeros((0, self.matrix.shape[1] if self.matrix.size else 0))
+        return self.matrix[[self.rows[k] for k in keys]]
+
+    def save(self) -> None:
+        if not os.path.isdir(self.local_directory):
+            os.makedirs(self.local_directory)
+        np.save(self.matrix_path, self.matrix)
+        with open(self.keys_path, "w+") as f:
+            json.dump(sorted(self.rows, key=self.rows.get), f)
+
+
+class PairIndex:
+    """Every market id already considered, plus the accepted matches."""
+
+    def __init__(self, local_file_path: str) -> None:
+        self.local_file_path = local_file_path
+        self.seen_polymarket: "set[str]" = set()
+        self.seen_kalshi: "set[str]" = set()
+        self.matches: "list[dict]" = []
+        if os.path.isfile(local_file_path):
+            with open(local_file_path, "r") as f:
+                data = json.load(f)
+            self.seen_polymarket = set(data.get("seen_polymarket", []))
+            self.seen_kalshi = set(data.get("seen_kalshi", []))
+            self.matches = data.get("matches", [])
+
+    def paired_polymarket(self) -> "set[str]":
+        return {m["polymarket_id"] for m in self.matches}
+
+    def paired_kalshi(self) -> "set[str]":
+        return {m["kalshi_ticker"] for m in self.matches}
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.local_file_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(self.local_file_path, "w+") as f:
+            json.dump(
+                {
+                    "seen_polymarket": sorted(self.seen_polymarket),
+                    "seen_kalshi": sorted(self.seen_kalshi),
+                    "matches": self.matches,
+                },
+                f,
+            )
+
+
+class MarketMatcher:
+    """
+    Finds the same question listed on Polymarket and Kalshi.
+
+    Questions are embedded through `PolymarketRAG`, candidates are only
+    compared inside blocks of the same category with end dates at most
+    `max_end_date_gap_days` apart, and every nearest-neighbour hit must pass
+    the rule checks in `verify` before it is written to the pair registry.
+    The `top_k` nearest neighbours of each market are tried in order of
+    similarity, so a rejected best hit (the wrong rung of a threshold
+    ladder) falls through to the next one. Matched markets are never
+    re-matched; an unmatched Polymarket market is only marked seen once
+    every candidate it has was tried.
+    """
+
+    def __init__(
+        self,
+        rag: PolymarketRAG = None,
+        registry: PairRegistry = None,
+        local_directory: str = "./local_db_pairs",
+        min_similarity: float = 0.86,
+        max_end_date_gap_days: float = 3.0,
+        top_k: int = 5,
+    ) -> None:
+        self.rag = rag or PolymarketRAG()
+        self.local_directory = local_directory
+        self.embeddings = EmbeddingCache(local_directory, self.rag)
+        self.index = PairIndex(os.path.join(local_directory, "pair_index.json"))
+        self.registry = registry or PairRegistry(
+            os.path.join(local_directory, "pairs.json")
+        )
+        self.min_similarity = min_similarity
+        self.max_end_date_gap_days = max_end_date_gap_days
+        self.top_k = top_k
+
+    def verify(self, poly: MatchRecord, kalshi: MatchRecord, similarity: float) -> bool:
+        if similarity < self.min_similarity:
+            return False
+        if abs(poly.end_day - kalshi.end_day) > self.max_end_date_gap_days:
+            return False
+        # thresholds, years and counts must agree: "above 4%" != "above 5%"
+        poly_numbers = question_numbers(poly.text)
+        kalshi_numbers = question_numbers(kalshi.text)
+        if poly_numbers and kalshi_numbers and poly_numbers != kalshi_numbers:
+            return False
+        return True
+
+    def _blocks(self, records: "list[MatchRecord]") -> "dict[tuple, list[int]]":
+        blocks = {}
+        width = max(self.max_end_date_gap_days, 1e-9)
+        for i, r in enumerate(records):
+            key = (r.category, int(r.end_day // width))
+            blocks.setdefault(key, []).append(i)
+        return blocks
+
+    def candidates(
+        self,
+        poly: "list[MatchRecord]",
+        kalshi: "list[MatchRecord]",
+        poly_new: np.ndarray,
+        kalshi_new: np.ndarray,
+    ) -> "list[tuple[float, int, int]]":
+        poly_vectors = self.embeddings.get([r.text for r in poly])
+        kalshi_vectors = self.embeddings.get([r.text for r in kalshi])
+        kalshi_blocks = self._blocks(kalshi)
+        by_bucket = {}
+        for (category, bucket), rows in kalshi_blocks.items():
+            by_bucket.setdefault(bucket, []).append((category, rows))
+
+        found = []
+        for (category, bucket), rows in self._blocks(poly).items():
+            # same category (or unknown on either side), adjacent date buckets
+            cols = []
+            for b in (bucket - 1, bucket, bucket + 1):
+                for k_category, k_rows in by_bucket.get(b, []):
+                    if not category or not k_category or category == k_category:
+                        cols.extend(k_rows)
+            if not cols:
+                continue
+            rows = np.asarray(rows)
+            cols = np.asarray(cols)
+            sims = poly_vectors[rows] @ kalshi_vectors[cols].T
+            # only pairs with at least one new side need scoring
+            sims[~(poly_new[rows][:, None] | kalshi_new[cols][None, :])] = -1.0
+            k = min(self.top_k, len(cols))
+            best = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            best_sims = np.take_along_axis(sims, best, axis=1)
+            for r, cs, ss in zip(rows, cols[best], best_sims):
+                for c, s in zip(cs, ss):
+                    if s >= self.min_similarity:
+                        found.append((float(s), int(r), int(c)))
+        return found
+
+    def match(
+        self,
+        polymarket_markets: "list[dict]",
+        kalshi_markets: "list[dict]",
+        kalshi_categories: dict = None,
+    ) -> "list[MarketPair]":
+        paired_poly = self.index.paired_polymarket()
+        paired_kalshi = self.index.paired_kalshi()
+
+        poly = []
+        for m in polymarket_markets:
+            r = polymarket_record(m)
+            if (
+                r is not None
+                and r.venue_id not in paired_poly
+                and r.end_day == r.end_day
+            ):
+                poly.append(r)
+        kalshi = []
+        for m in kalshi_markets:
+            r = kalshi_record(m, kalshi_categories)
+            if r.venue_id not in paired_kalshi and r.end_day == r.end_day:
+                kalshi.append(r)
+
+        poly_new = np.array(
+            [r.venue_id not in self.index.seen_polymarket for r in poly], dtype=bool
+        )
+        kalshi_new = np.array(
+            [r.venue_id not in self.index.seen_kalshi for r in kalshi], dtype=bool
+        )
+
+        new_pairs = []
+        used_poly = set()
+        # a market with `top_k` candidates may have more past the cut; it stays
+        # unseen so the next run, without the markets paired now, scores it again
+        truncated = set()
+        if poly and kalshi and (poly_new.any() or kalshi_new.any()):
+            used_kalshi = set()
+            candidates = self.candidates(poly, kalshi, poly_new, kalshi_new)
+            counts = Counter(i for _, i, _ in candidates)
+            truncated = {i for i, n in counts.items() if n >= self.top_k}
+            for similarity, i, j in sorted(candidates, reverse=True):
+                if i in used_poly or j in used_kalshi:
+                    continue
+                if not self.verify(poly[i], kalshi[j], similarity):
+                    continue
+                used_poly.add(i)
+                used_kalshi.add(j)
+                pair = MarketPair(
+                    kalshi_ticker=kalshi[j].venue_id,
+                    polymarket_yes_token_id=poly[i].tokens[0],
+                    polymarket_no_token_id=poly[i].tokens[1],
+                    question=poly[i].text,
+                )
+                self.registry.add(pair)
+                self.index.matches.append(
+                    {
+                        "polymarket_id": poly[i].venue_id,
+                        "kalshi_ticker": kalshi[j].venue_id,
+                        "similarity": round(similarity, 4),
+                    }
+                )
+                new_pairs.append(pair)
+
+        self.index.seen_polymarket.update(
+            r.venue_id
+            for i, r in enumerate(poly)
+            if i in used_poly or i not in truncated
+        )
+        self.index.seen_kalshi.update(r.venue_id for r in kalshi)
+        self.index.save()
+        if new_pairs and self.registry.local_file_path:
+            self.registry.save()
+        return new_pairs
+
+
+if __name__ == "__main__":
+    from agents.kalshi.kalshi import Kalshi
+    from agents.polymarket.gamma import GammaMarketClient
+
+    matcher = MarketMatcher()
+    pairs = matcher.match(
+        GammaMarketClient().get_all_current_markets(), Kalshi().get_all_markets()
+    )
+    print(f"matched {len(pairs)} new pairs, {len(matcher.registry)} total")
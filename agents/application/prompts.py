@@ -65,6 +65,43 @@ class Prompter:
         Provide specific information for markets including probabilities of outcomes.
         """
 
+    def synthesize_polymarket(self, user_input: str, partial_answers: List[str]) -> str:
+        answers = "\n\n".join(
+            f"Answer {i + 1}:\n{answer}" for i, answer in enumerate(partial_answers)
+        )
+        return f"""
+        You are an AI assistant for users of a prediction market called Polymarket.
+        The market data was too large for one request, so it was split into slices and
+        each slice was answered separately. Every answer below only saw its own slice.
+
+        The user asked: {user_input}
+
+        {answers}
+
+        Merge these into a single response to the user. Remove duplicates, resolve
+        conflicts in favour of the better supported answer, and rank the markets by
+        how well they match the user's query, most relevant first.
+        Keep the specific probabilities of outcomes given in the answers.
+        """
+
+    def prompts_polymarket_tables(self, tables: str) -> str:
+        return f"""
+        You are an AI assistant for users of a prediction market called Polymarket.
+        Users want to place bets based on their beliefs of market outcomes such as political or sports events.
+
+        Here is data for current Polymarket events and markets as pipe-separated tables.
+        Each table starts with its column names. Long texts that repeat are listed once
+        under "repeated text" and referenced in the rows as @1, @2, ...
+        Outcomes, their prices and their CLOB token ids are slash-separated in the
+        same order; pass a token id to the order book and price tools. Market bid,
+        ask and spread are for the first outcome.
+
+        {tables}
+
+        Help users identify markets to trade based on their interests or queries.
+        Provide specific information for markets including probabilities of outcomes.
+        """
+
     def routing(self, system_message: str) -> str:
         return f"""You are an expert at routing a user question to the appropriate data source. System message: ${system_message}"""
 
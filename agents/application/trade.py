@@ -1,14 +1,20 @@
 from agents.application.executor import Executor as Agent
+from agents.application.market_maker import MarketMaker
 from agents.polymarket.gamma import GammaMarketClient as Gamma
 from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.risk import RiskRejected
+from agents.polymarket.settlement import SettlementEngine
 
+import asyncio
 import shutil
+import time
 
 
 class Trader:
     def __init__(self):
         self.polymarket = Polymarket()
         self.gamma = Gamma()
+        self.settlement = SettlementEngine(self.polymarket)
         try:
             self.agent = Agent()
         except ImportError as e:
@@ -89,10 +95,14 @@ class Trader:
             print(f"5. CALCULATED TRADE {best_trade}")
 
             amount = self.agent.format_trade_prompt_for_execution(best_trade)
+            amount = self.polymarket.risk.cap_notional(amount)
             # Please refer to TOS before uncommenting: polymarket.com/tos
             # trade = self.polymarket.execute_market_order(market, amount)
             # print(f"6. TRADED {trade}")
 
+        except RiskRejected as e:
+            # a risk decision is final: asking the LLM again would not change it
+            print(f"Trade rejected by risk checks: {e}")
         except Exception as e:
             print(f"Error: {e}")
             print(f"Retry {retry_count + 1}/{max_retries}")
@@ -100,11 +110,48 @@ class Trader:
             traceback.print_exc()
             self.one_best_trade(max_retries=max_retries, retry_count=retry_count + 1)
 
-    def maintain_positions(self):
-        pass
+    def maintain_positions(self, max_order_age: float = None) -> None:
+        """
+        Reconcile local order state with the CLOB, report positions and
+        redeem / merge settled positions back into USDC.
 
-    def incentive_farm(self):
-        pass
+        With `max_order_age` (seconds), orders this process placed that have
+        been resting longer are cancelled too; orders picked up by
+        `reconcile()` from elsewhere (manual orders, other bots) never are.
+        """
+        orders = self.polymarket.orders
+        orders.reconcile(self.polymarket.client)
+        for token_id, size in orders.positions.items():
+            if size:
+                print(f"POSITION {token_id}: {size:g}")
+        now = time.time()
+        stale = [
+            order.order_id
+            for order in orders.open_orders()
+            if max_order_age is not None
+            and order.order_id in orders.reserved
+            and now - order.created > max_order_age
+        ]
+        if stale:
+            print(f"CANCELLING {len(stale)} STALE ORDERS")
+            self.polymarket.cancel_orders(stale)
+        self.settlement.run()
+
+    def incentive_farm(self, max_markets: int = 100, size_multiplier: float = 1.0):
+        """
+        Quote two-sided inside the reward band of the best-paying markets
+        until interrupted; resting quotes are cancelled on exit.
+        """
+        table = self.polymarket.get_market_table()
+        maker = MarketMaker.from_table(
+            self.polymarket, table, max_markets, size_multiplier
+        )
+        for market in maker.markets.values():
+            # both quotes of a market count against one exposure limit
+            self.polymarket.risk.register(market.yes, market.condition_id)
+            self.polymarket.risk.register(market.no, market.condition_id)
+        print(f"FARMING REWARDS ON {len(maker.markets)} MARKETS")
+        asyncio.run(maker.run())
 
 
 if __name__ == "__main__":
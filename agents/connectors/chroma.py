@@ -21,6 +21,14 @@ class PolymarketRAG:
         self.local_db_directory = local_db_directory
         self.embedding_function = embedding_function
 
+    def get_embedding_function(self):
+        if self.embedding_function is None:
+            self.embedding_function = OpenAIEmbeddings(model="text-embedding-3-small")
+        return self.embedding_function
+
+    def embed_texts(self, texts: "list[str]") -> "list[list[float]]":
+        return self.get_embedding_function().embed_documents(texts)
+
     def load_json_from_local(
         self, json_file_path=None, vector_db_directory="./local_db"
     ) -> None:
@@ -144,11 +152,19 @@ class PolymarketRAG:
         # create vector db
         def metadata_func(record: dict, metadata: dict) -> dict:
 
+            # chroma metadata values must be scalars; lists are stored as
+            # compact JSON and decoded with records.json_list on the way out
             metadata["id"] = record.get("id")
-            metadata["outcomes"] = record.get("outcomes")
-            metadata["outcome_prices"] = record.get("outcome_prices")
+            metadata["outcomes"] = json.dumps(
+                record.get("outcomes"), separators=(",", ":")
+            )
+            metadata["outcome_prices"] = json.dumps(
+                record.get("outcome_prices"), separators=(",", ":")
+            )
             metadata["question"] = record.get("question")
-            metadata["clob_token_ids"] = record.get("clob_token_ids")
+            metadata["clob_token_ids"] = json.dumps(
+                record.get("clob_token_ids"), separators=(",", ":")
+            )
 
             return metadata
 
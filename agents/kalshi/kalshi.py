@@ -0,0 +1,95 @@
+# core kalshi api
+# https://trading-api.readme.io/reference/getmarkets
+
+import os
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class Kalshi:
+    """
+    Read-only Kalshi REST connector for market data.
+
+    Public market endpoints do not require request signing, so this client only
+    covers markets and orderbooks. Order placement on Kalshi still goes through
+    the TypeScript server routes in `arbitrage/`.
+    """
+
+    def __init__(self, base_url: str = None, timeout: float = 10.0) -> None:
+        self.kalshi_url = base_url or os.getenv(
+            "KALSHI_API_URL", "https://api.elections.kalshi.com/trade-api/v2"
+        )
+        self.kalshi_markets_endpoint = self.kalshi_url + "/markets"
+        self.kalshi_events_endpoint = self.kalshi_url + "/events"
+
+        # One pooled client so batch scans reuse connections instead of
+        # opening a new TLS session per orderbook.
+        self.client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _get(self, url: str, params: dict = None) -> dict:
+        res = self.client.get(url, params=params)
+        if res.status_code != 200:
+            raise Exception(f"Kalshi API returned status {res.status_code} for {url}")
+        return res.json()
+
+    def get_markets(self, querystring_params: dict = None) -> "list[dict]":
+        data = self._get(self.kalshi_markets_endpoint, params=querystring_params)
+        return data.get("markets", [])
+
+    def get_all_markets(self, status: str = "open", limit: int = 1000) -> "list[dict]":
+        all_markets = []
+        params = {"status": status, "limit": limit}
+        while True:
+            data = self._get(self.kalshi_markets_endpoint, params=params)
+            all_markets.extend(data.get("markets", []))
+            cursor = data.get("cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+        return all_markets
+
+    def get_market(self, ticker: str) -> dict:
+        data = self._get(f"{self.kalshi_markets_endpoint}/{ticker}")
+        return data.get("market", data)
+
+    def get_orderbook(self, ticker: str, depth: int = 10) -> dict:
+        """
+        Returns `{"yes": [[price, size], ...], "no": [[price, size], ...]}`.
+
+        Kalshi only publishes resting bids for each side, with prices in cents
+        sorted ascending. Prices are converted to dollars here so they can be
+        compared directly against Polymarket prices.
+        """
+        data = self._get(
+            f"{self.kalshi_markets_endpoint}/{ticker}/orderbook",
+            params={"depth": depth},
+        )
+        return self.map_api_to_orderbook(data.get("orderbook") or {})
+
+    def map_api_to_orderbook(self, orderbook: dict) -> dict:
+        book = {}
+        for side in ("yes", "no"):
+            levels = orderbook.get(side)
+            if levels:
+                book[side] = [[float(p) / 100.0, float(q)] for p, q in levels]
+                continue
+            # newer api responses carry dollar-denominated string prices
+            levels = orderbook.get(f"{side}_dollars") or []
+            book[side] = [[float(p), float(q)] for p, q in levels]
+        return book
+
+
+if __name__ == "__main__":
+    k = Kalshi()
+    markets = k.get_markets({"limit": 5, "status": "open"})
+    for m in markets:
+        print(m["ticker"], k.get_orderbook(m["ticker"], depth=3))
@@ -0,0 +1,170 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from py_clob_client.clob_types import OrderArgs, OrderType
+
+# PostOrdersArgs / post_orders only exist in newer py_clob_client releases
+try:
+    from py_clob_client.clob_types import PostOrdersArgs
+except ImportError:
+    PostOrdersArgs = None
+
+from agents.utils.objects import OrderLeg, OrderResult
+from agents.polymarket.orders import fill_amounts
+
+# the CLOB accepts at most this many orders per POST /orders
+MAX_BATCH = 15
+
+
+class BatchOrderClient:
+    """
+    Multi-leg order submission on top of a `ClobClient`.
+
+    Legs are signed in parallel (from `pool` when a pre-signed order matches),
+    then posted through the batch endpoint in chunks of `MAX_BATCH`, or as
+    concurrent single posts when the client has no `post_orders`. Every leg
+    gets an `OrderResult` with its own end-to-end latency.
+
+    With a `risk` engine every batch is checked as a whole before any leg
+    is signed, and reservations of legs that failed or were killed unfilled
+    are released once the results are in.
+    """
+
+    def __init__(self, client, pool=None, max_workers: int = 8, risk=None) -> None:
+        self.client = client
+        self.pool = pool
+        self.max_workers = max_workers
+        self.risk = risk
+
+    def sign(self, leg: OrderLeg):
+        if self.pool is not None:
+            return self.pool.take(leg.token_id, leg.price, leg.size, leg.side)
+        return self.client.create_order(
+            OrderArgs(
+                price=leg.price, size=leg.size, side=leg.side, token_id=leg.token_id
+            )
+        )
+
+    def sign_all(self, legs: "list[OrderLeg]") -> list:
+        if self.risk is not None:
+            self.risk.check_all(legs)
+        try:
+            if len(legs) == 1:
+                return [self.sign(legs[0])]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                return list(pool.map(self.sign, legs))
+        except Exception:
+            if self.risk is not None:
+                self.risk.release_all(legs)
+            raise
+
+    def post(
+        self, legs: "list[OrderLeg]", order_type: str = OrderType.GTC
+    ) -> "list[OrderResult]":
+        start = time.perf_counter()
+        try:
+            orders = self.sign_all(legs)
+        except Exception as e:
+            elapsed = (time.perf_counter() - start) * 1000
+            return [self.result(leg, None, e, elapsed) for leg in legs]
+        return self.post_signed(legs, orders, order_type, start)
+
+    def post_signed(
+        self,
+        legs: "list[OrderLeg]",
+        orders: list,
+        order_type: str = OrderType.GTC,
+        start: float = None,
+    ) -> "list[OrderResult]":
+        """Post orders signed ahead of time; latency counts from `start`."""
+        if start is None:
+            start = time.perf_counter()
+        results: "list[OrderResult]" = [None] * len(legs)
+        batched = PostOrdersArgs is not None and hasattr(self.client, "post_orders")
+        if batched:
+            chunks = [
+                list(range(i, min(i + MAX_BATCH, len(legs))))
+                for i in range(0, len(legs), MAX_BATCH)
+            ]
+        else:
+            chunks = [[i] for i in range(len(legs))]
+
+        def send(chunk):
+            if batched:
+                return self.client.post_orders(
+                    [
+                        PostOrdersArgs(order=orders[i], orderType=order_type)
+                        for i in chunk
+                    ]
+                )
+            return [self.client.post_order(orders[chunk[0]], orderType=order_type)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(send, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                elapsed = (time.perf_counter() - start) * 1000
+                try:
+                    responses = future.result()
+                except Exception as e:
+                    responses, error = [None] * len(chunk), e
+                else:
+                    error = None
+                for n, i in enumerate(chunk):
+                    if n < len(responses):
+                        results[i] = self.result(legs[i], responses[n], error, elapsed)
+                    else:
+                        # a short batch reply leaves the rest of the chunk unanswered
+                        results[i] = self.result(
+                            legs[i], None, error or "no response for order", elapsed
+                        )
+        if self.risk is not None:
+            self.release_unfilled(results, order_type)
+        return results
+
+    def release_unfilled(self, results: "list[OrderResult]", order_type: str) -> None:
+        for result in results:
+            leg = result.leg
+            if not result.success:
+                self.risk.release(leg.token_id, leg.price, leg.size, leg.side)
+            elif order_type in (OrderType.FAK, OrderType.FOK):
+                # the unfilled rest of an immediate order is killed, not resting
+                rest = leg.size - result.filled_size
+                self.risk.release(leg.token_id, leg.price, rest, leg.side)
+
+    def result(self, leg: OrderLeg, response, error, latency_ms: float) -> OrderResult:
+        if error is not None or not isinstance(response, dict):
+            return OrderResult(
+                leg=leg,
+                success=False,
+                error=str(error if error is not None else response),
+                latency_ms=latency_ms,
+            )
+        shares, cash = fill_amounts(response, leg.side)
+        return OrderResult(
+            leg=leg,
+            success=bool(response.get("success")),
+            order_id=response.get("orderID") or None,
+            status=response.get("status"),
+            error=response.get("errorMsg") or None,
+            latency_ms=latency_ms,
+            filled_size=shares,
+            filled_notional=cash,
+        )
+
+    def cancel(self, order_ids: "list[str]"):
+        return self.client.cancel_orders(order_ids)
+
+    def cancel_market(self, market: str = "", token_ids: "list[str]" = None) -> list:
+        """Cancel every open order in a market (condition id) and/or per token."""
+        if not token_ids:
+            return [self.client.cancel_market_orders(market=market)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(
+                pool.map(
+                    lambda token_id: self.client.cancel_market_orders(
+                        market=market, asset_id=token_id
+                    ),
+                    token_ids,
+                )
+            )
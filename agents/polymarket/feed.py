@@ -0,0 +1,182 @@
+# polymarket clob market channel
+# https://docs.polymarket.com/developers/CLOB/websocket/market-channel
+
+import asyncio
+import json
+import time
+
+import websockets
+
+BUY = 0
+SELL = 1
+
+
+class BookEvent:
+    """Full L2 snapshot for one token. Levels are `(price, size)` tuples."""
+
+    __slots__ = ("ts", "asset_id", "bids", "asks")
+
+    def __init__(self, ts: int, asset_id: str, bids: list, asks: list) -> None:
+        self.ts = ts
+        self.asset_id = asset_id
+        self.bids = bids
+        self.asks = asks
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BookEvent) and (
+            self.ts,
+            self.asset_id,
+            self.bids,
+            self.asks,
+        ) == (other.ts, other.asset_id, other.bids, other.asks)
+
+    def __repr__(self) -> str:
+        return f"BookEvent(ts={self.ts}, asset_id={self.asset_id!r}, bids={len(self.bids)}, asks={len(self.asks)})"
+
+
+class PriceChangeEvent:
+    """Single level update; `size` is the new resting size at `price`."""
+
+    __slots__ = ("ts", "asset_id", "side", "price", "size")
+
+    def __init__(self, ts: int, asset_id: str, side: int, price: float, size: float):
+        self.ts = ts
+        self.asset_id = asset_id
+        self.side = side
+        self.price = price
+        self.size = size
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and all(
+            getattr(self, s) == getattr(other, s) for s in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class TradeEvent(PriceChangeEvent):
+    """Last trade print; `side` is the taker side."""
+
+    __slots__ = ()
+
+
+def parse_side(side: str) -> int:
+    return BUY if side.upper() == "BUY" else SELL
+
+
+def parse_levels(levels: list) -> list:
+    return [(float(l["price"]), float(l["size"])) for l in levels or []]
+
+
+def parse_message(msg: dict) -> list:
+    """Decode one market channel message into feed events."""
+    event_type = msg.get("event_type")
+    ts = int(msg.get("timestamp") or time.time() * 1000)
+    if event_type == "book":
+        return [
+            BookEvent(
+                ts,
+                msg["asset_id"],
+                parse_levels(msg.get("bids", msg.get("buys"))),
+                parse_levels(msg.get("asks", msg.get("sells"))),
+            )
+        ]
+    if event_type == "price_change":
+        if "price_changes" in msg:
+            return [
+                PriceChangeEvent(
+                    ts,
+                    c["asset_id"],
+                    parse_side(c["side"]),
+                    float(c["price"]),
+                    float(c["size"]),
+                )
+                for c in msg["price_changes"]
+            ]
+        return [
+            PriceChangeEvent(
+                ts,
+                msg["asset_id"],
+                parse_side(c["side"]),
+                float(c["price"]),
+                float(c["size"]),
+            )
+            for c in msg.get("changes", [])
+        ]
+    if event_type == "last_trade_price":
+        return [
+            TradeEvent(
+                ts,
+                msg["asset_id"],
+                parse_side(msg.get("side", "BUY")),
+                float(msg["price"]),
+                float(msg.get("size", 0)),
+            )
+        ]
+    return []
+
+
+def dispatch(handler, event) -> None:
+    if isinstance(event, BookEvent):
+        callback = getattr(handler, "on_book", None)
+    elif isinstance(event, TradeEvent):
+        callback = getattr(handler, "on_trade", None)
+    else:
+        callback = getattr(handler, "on_price_change", None)
+    if callback is not None:
+        callback(event)
+
+
+class MarketFeed:
+    """
+    Live CLOB market channel for a set of token ids.
+
+    `events()` is an async iterator of BookEvent / PriceChangeEvent /
+    TradeEvent, and `run(handler)` dispatches them to `on_book`,
+    `on_price_change` and `on_trade`. The replay engine exposes the same two
+    entry points, so strategies can be driven by either.
+    """
+
+    def __init__(
+        self,
+        asset_ids: "list[str]",
+        url: str = "wss://ws-subscriptions-clob.polymarket.com/ws/market",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.asset_ids = list(asset_ids)
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.running = False
+
+    def stop(self) -> None:
+        self.running = False
+
+    async def events(self):
+        self.running = True
+        while self.running:
+            try:
+                async with websockets.connect(self.url, ping_interval=10) as ws:
+                    await ws.send(
+                        json.dumps({"type": "market", "assets_ids": self.asset_ids})
+                    )
+                    async for raw in ws:
+                        if not self.running:
+                            return
+                        if raw == "PONG":
+                            continue
+                        try:
+                            data = json.loads(raw)
+                        except ValueError:
+                            continue
+                        for msg in data if isinstance(data, list) else [data]:
+                            for event in parse_message(msg):
+                                yield event
+            except (OSError, websockets.ConnectionClosed) as e:
+                print(f"[MarketFeed] connection lost: {e}, reconnecting")
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def run(self, handler) -> None:
+        async for event in self.events():
+            dispatch(handler, event)
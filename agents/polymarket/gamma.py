@@ -4,6 +4,8 @@ import sys
 import time
 
 from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.table import MarketTable
+from agents.utils.http_cache import HTTPCache
 from agents.utils.objects import Market, PolymarketEvent, ClobReward, Tag
 
 # Temporary workaround for Python 3.14 recursion issues
@@ -16,6 +18,8 @@ class GammaMarketClient:
         self.gamma_url = "https://gamma-api.polymarket.com"
         self.gamma_markets_endpoint = self.gamma_url + "/markets"
         self.gamma_events_endpoint = self.gamma_url + "/events"
+        # conditional GETs: unchanged pages between polls come back as 304s
+        self.http = HTTPCache()
 
     def parse_pydantic_market(self, market_object: dict) -> Market:
         try:
@@ -43,15 +47,12 @@ class GammaMarketClient:
 
             return Market(**market_object)
         except Exception as err:
-            print(f"[parse_market] Caught exception: {err}")
-            print("exception while handling object:", market_object)
+            print(f"[parse_market] market {market_object.get('id')}: {err}")
 
     # Event parser for events nested under a markets api response
     def parse_nested_event(self, event_object: dict()) -> PolymarketEvent:
-        print("[parse_nested_event] called with:", event_object)
         try:
             if "tags" in event_object:
-                print("tags here", event_object["tags"])
                 tags: list[Tag] = []
                 for tag in event_object["tags"]:
                     tags.append(Tag(**tag))
@@ -59,13 +60,11 @@ class GammaMarketClient:
 
             return PolymarketEvent(**event_object)
         except Exception as err:
-            print(f"[parse_event] Caught exception: {err}")
-            print("\n", event_object)
+            print(f"[parse_event] event {event_object.get('id')}: {err}")
 
     def parse_pydantic_event(self, event_object: dict) -> PolymarketEvent:
         try:
             if "tags" in event_object:
-                print("tags here", event_object["tags"])
                 tags: list[Tag] = []
                 for tag in event_object["tags"]:
                     tags.append(Tag(**tag))
@@ -83,9 +82,7 @@ class GammaMarketClient:
             )
 
         try:
-            # Use explicit client with timeout to avoid Python 3.14 recursion issues
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(self.gamma_markets_endpoint, params=querystring_params)
+            response = self.http.get(self.gamma_markets_endpoint, params=querystring_params)
         except RecursionError as e:
             print(f"RecursionError: Python 3.14 compatibility issue with httpx. Error: {e}")
             print("RECOMMENDATION: Use Python 3.11 or 3.12 instead of Python 3.14")
@@ -116,9 +113,7 @@ class GammaMarketClient:
             )
 
         try:
-            # Use explicit client with timeout to avoid Python 3.14 recursion issues
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(self.gamma_events_endpoint, params=querystring_params)
+            response = self.http.get(self.gamma_events_endpoint, params=querystring_params)
         except RecursionError as e:
             print(f"RecursionError: Python 3.14 compatibility issue with httpx. Error: {e}")
             print("RECOMMENDATION: Use Python 3.11 or 3.12 instead of Python 3.14")
@@ -139,6 +134,11 @@ class GammaMarketClient:
         else:
             raise Exception()
 
+    def get_market_table(self, querystring_params={}) -> MarketTable:
+        return MarketTable.from_records(
+            self.get_markets(querystring_params=querystring_params)
+        )
+
     def get_all_markets(self, limit=2) -> "list[Market]":
         return self.get_markets(querystring_params={"limit": limit})
 
@@ -4,6 +4,7 @@ These tools enable Grok to interact with Polymarket data and make trading decisi
 """
 
 import json
+import time
 from typing import Dict, Any, List
 
 # Optional xai_sdk import
@@ -18,6 +19,7 @@ except ImportError:
 
 from agents.polymarket.polymarket import Polymarket
 from agents.polymarket.gamma import GammaMarketClient as Gamma
+from agents.polymarket.history import PriceHistoryStore, INTERVALS_MS
 
 
 def create_polymarket_tools(polymarket_client: Polymarket, gamma_client: Gamma) -> List:
@@ -120,13 +122,40 @@ def create_polymarket_tools(polymarket_client: Polymarket, gamma_client: Gamma)
         }
     )
     
+    # Tool 7: Get locally recorded price history
+    get_price_history_tool = tool(
+        name="get_polymarket_price_history",
+        description="Get OHLC price history for a market outcome token from the local price-history store. Returns one candle per interval with open, high, low, close and sample count.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "token_id": {
+                    "type": "string",
+                    "description": "The token ID for the market outcome"
+                },
+                "interval": {
+                    "type": "string",
+                    "description": "Candle interval: 1m, 5m, 15m, 1h, 4h or 1d (default: 1h)",
+                    "default": "1h"
+                },
+                "lookback_hours": {
+                    "type": "number",
+                    "description": "How many hours of history to return (default: 24)",
+                    "default": 24
+                }
+            },
+            "required": ["token_id"]
+        }
+    )
+    
     return [
         get_market_tool,
         get_active_markets_tool,
         get_orderbook_tool,
         get_price_tool,
         get_events_tool,
-        get_balance_tool
+        get_balance_tool,
+        get_price_history_tool
     ]
 
 
@@ -134,7 +163,8 @@ def execute_polymarket_tool(
     tool_name: str,
     arguments: Dict[str, Any],
     polymarket_client: Polymarket,
-    gamma_client: Gamma
+    gamma_client: Gamma,
+    history_store: PriceHistoryStore = None
 ) -> str:
     """
     Execute a Polymarket tool and return the result as a JSON string.
@@ -183,6 +213,27 @@ def execute_polymarket_tool(
             balance = polymarket_client.get_usdc_balance()
             return json.dumps({"balance_usdc": balance})
         
+        elif tool_name == "get_polymarket_price_history":
+            token_id = arguments.get("token_id")
+            interval = arguments.get("interval", "1h")
+            if interval not in INTERVALS_MS:
+                return json.dumps({"error": f"Unknown interval: {interval}"})
+            store = history_store or PriceHistoryStore()
+            end = int(time.time() * 1000)
+            start = end - int(float(arguments.get("lookback_hours", 24)) * 3_600_000)
+            candles = store.ohlc(token_id, INTERVALS_MS[interval], start, end)
+            return json.dumps({
+                "token_id": token_id,
+                "interval": interval,
+                "candles": [
+                    {"ts": int(t), "open": float(o), "high": float(h), "low": float(l), "close": float(c), "count": int(n)}
+                    for t, o, h, l, c, n in zip(
+                        candles["ts"], candles["open"], candles["high"],
+                        candles["low"], candles["close"], candles["count"]
+                    )
+                ]
+            }, indent=2)
+        
         else:
             return json.dumps({"error": f"Unknown tool: {tool_name}"})
     
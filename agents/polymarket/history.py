@@ -0,0 +1,318 @@
+import json
+import os
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from agents.polymarket.feed import BookEvent, BUY
+
+# one append-only raw file per column, per token
+COLUMNS = {"ts": "<i8", "price": "<f8", "mid": "<f8", "spread": "<f8"}
+
+INTERVALS_MS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+
+class PriceHistoryStore:
+    """
+    Local time-series store of outcome prices, midpoints and spreads per token.
+
+    Each token gets a directory of append-only little-endian column files
+    (`ts.i8`, `price.f8`, `mid.f8`, `spread.f8`). Reads memory-map the
+    columns and use `ts` as the time index, so range, resample and OHLC
+    queries are a `searchsorted` plus array slicing, with no parsing.
+    Samples older than the last stored timestamp for a token are dropped to
+    keep the index sorted. At most `max_open` tokens stay memory-mapped
+    (each map holds four file descriptors); older ones are evicted.
+    """
+
+    def __init__(
+        self, directory: str = "./local_db_history", max_open: int = 64
+    ) -> None:
+        self.directory = directory
+        self.max_open = max_open
+        self.pending: "dict[str, list]" = {}
+        self.last_ts: "dict[str, int]" = {}
+        self.maps: "OrderedDict[str, dict]" = OrderedDict()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def token_directory(self, token_id: str) -> str:
+        token_id = str(token_id)
+        # CLOB token ids are decimal uint256s; anything else (e.g. a tool
+        # argument like "../x") must not turn into a path outside the store
+        if not (token_id.isascii() and token_id.isdigit()):
+            raise ValueError(f"invalid token id {token_id!r}")
+        return os.path.join(self.directory, token_id)
+
+    def tokens(self) -> "list[str]":
+        return sorted(
+            d
+            for d in os.listdir(self.directory)
+            if os.path.isdir(os.path.join(self.directory, d))
+        )
+
+    def append(
+        self,
+        token_id: str,
+        ts: int,
+        price: float,
+        mid: float = np.nan,
+        spread: float = np.nan,
+    ) -> None:
+        token_id = str(token_id)
+        last = self.last_ts.get(token_id)
+        if last is None:
+            last = self.stored_last_ts(token_id)
+        if ts < last:
+            return
+        self.last_ts[token_id] = ts
+        self.pending.setdefault(token_id, []).append((ts, price, mid, spread))
+
+    def flush(self) -> None:
+        for token_id, rows in self.pending.items():
+            directory = self.token_directory(token_id)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            data = np.array(rows, dtype=np.float64)
+            for i, (name, dtype) in enumerate(COLUMNS.items()):
+                with open(os.path.join(directory, f"{name}.{dtype[1:]}"), "ab") as f:
+                    data[:, i].astype(dtype).tofile(f)
+            self.maps.pop(token_id, None)
+        self.pending = {}
+
+    def stored_rows(self, token_id: str) -> int:
+        """Complete rows on disk; a crash mid-flush can leave columns uneven."""
+        directory = self.token_directory(token_id)
+        rows = []
+        for name, dtype in COLUMNS.items():
+            path = os.path.join(directory, f"{name}.{dtype[1:]}")
+            size = os.path.getsize(path) if os.path.isfile(path) else 0
+            rows.append(size // np.dtype(dtype).itemsize)
+        return min(rows)
+
+    def stored_last_ts(self, token_id: str) -> int:
+        """Last timestamp on disk (-1 if none), read without mapping the file."""
+        n = self.stored_rows(token_id)
+        if not n:
+            return -1
+        dtype = np.dtype(COLUMNS["ts"])
+        path = os.path.join(self.token_directory(token_id), "ts.i8")
+        tail = np.fromfile(path, dtype=dtype, count=1, offset=(n - 1) * dtype.itemsize)
+        return int(tail[0])
+
+    def columns(self, token_id: str) -> "dict[str, np.ndarray]":
+        """Memory-mapped, read-only columns for a token (empty if unknown)."""
+        token_id = str(token_id)
+        if token_id in self.maps:
+            self.maps.move_to_end(token_id)
+            return self.maps[token_id]
+        directory = self.token_directory(token_id)
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            path = os.path.join(directory, f"{name}.{dtype[1:]}")
+            if os.path.isfile(path) and os.path.getsize(path) > 0:
+                columns[name] = np.memmap(path, dtype=dtype, mode="r")
+            else:
+                columns[name] = np.zeros(0, dtype=dtype)
+        # a crash mid-flush can leave columns of different lengths
+        n = min(len(c) for c in columns.values())
+        columns = {name: c[:n] for name, c in columns.items()}
+        self.maps[token_id] = columns
+        while len(self.maps) > self.max_open:
+            # dropping the last reference closes the maps' descriptors
+            self.maps.popitem(last=False)
+        return columns
+
+    def range(
+        self, token_id: str, start: int = None, end: int = None
+    ) -> "dict[str, np.ndarray]":
+        """Rows with `start <= ts < end` (ms); either bound may be omitted."""
+        columns = self.columns(token_id)
+        ts = columns["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="left"))
+        return {name: np.asarray(c[lo:hi]) for name, c in columns.items()}
+
+    def resample(
+        self,
+        token_id: str,
+        interval_ms: int,
+        start: int = None,
+        end: int = None,
+        column: str = "price",
+    ) -> "tuple[np.ndarray, np.ndarray]":
+        """Last value in each `interval_ms` bucket: (bucket_start_ts, values)."""
+        bucket, _, last, _ = self._buckets(token_id, interval_ms, start, end, column)
+        return bucket, last
+
+    def ohlc(
+        self,
+        token_id: str,
+        interval_ms: int,
+        start: int = None,
+        end: int = None,
+        column: str = "price",
+    ) -> "dict[str, np.ndarray]":
+        bucket, first, last, values = self._buckets(
+            token_id, interval_ms, start, end, column
+        )
+        if not len(bucket):
+            empty = np.zeros(0)
+            return {k: empty for k in ("ts", "open", "high", "low", "close", "count")}
+        return {
+            "ts": bucket,
+            "open": values[first],
+            "high": np.maximum.reduceat(values, first),
+            "low": np.minimum.reduceat(values, first),
+            "close": last,
+            "count": np.diff(np.append(first, len(values))),
+        }
+
+    def _buckets(self, token_id, interval_ms, start, end, column):
+        rows = self.range(token_id, start, end)
+        values = rows[column]
+        keep = ~np.isnan(values)
+        ts = rows["ts"][keep]
+        values = values[keep]
+        bucket_of_row = ts - ts % interval_ms
+        # ts is sorted, so bucket boundaries are where the bucket id changes
+        bucket, first = np.unique(bucket_of_row, return_index=True)
+        if not len(bucket):
+            return bucket, first, values, values
+        last_index = np.append(first[1:], len(values)) - 1
+        return bucket, first, values[last_index], values
+
+    def sample_gamma_markets(self, markets: "list[dict]", ts: int = None) -> int:
+        """Sample raw Gamma `/markets` rows: outcome prices per token, plus mid/spread."""
+        ts = int(ts if ts is not None else time.time() * 1000)
+        count = 0
+        for market in markets:
+            token_ids = market.get("clobTokenIds")
+            prices = market.get("outcomePrices")
+            if isinstance(token_ids, str):
+                token_ids = json.loads(token_ids)
+            if isinstance(prices, str):
+                prices = json.loads(prices)
+            if not token_ids or not prices:
+                continue
+            best_bid = market.get("bestBid")
+            best_ask = market.get("bestAsk")
+            mid = (
+                (float(best_bid) + float(best_ask)) / 2.0
+                if best_bid is not None and best_ask is not None
+                else np.nan
+            )
+            spread = (
+                float(market["spread"]) if market.get("spread") is not None else np.nan
+            )
+            for i, (token_id, price) in enumerate(zip(token_ids, prices)):
+                # bestBid/bestAsk/spread on gamma refer to the first outcome
+                token_mid = mid if i == 0 else 1.0 - mid
+                self.append(token_id, ts, float(price), token_mid, spread)
+                count += 1
+        self.flush()
+        return count
+
+    def sample_orderbooks(
+        self, polymarket, token_ids: "list[str]", ts: int = None
+    ) -> int:
+        """Sample CLOB books (one POST /books round trip) as mid and spread."""
+        ts = int(ts if ts is not None else time.time() * 1000)
+        count = 0
+        for book in polymarket.get_orderbooks(token_ids):
+            bid = max((float(b.price) for b in book.bids or []), default=np.nan)
+            ask = min((float(a.price) for a in book.asks or []), default=np.nan)
+            mid = (bid + ask) / 2.0
+            self.append(book.asset_id, ts, mid, mid, ask - bid)
+            count += 1
+        self.flush()
+        return count
+
+
+class HistorySampler:
+    """
+    Feed handler (`MarketFeed.run` / `ReplayEngine.run`) that keeps top of
+    book per token and samples it into a PriceHistoryStore at most once per
+    `min_interval_ms`. Trades are stored as the `price` column.
+    """
+
+    def __init__(
+        self,
+        store: PriceHistoryStore,
+        min_interval_ms: int = 1000,
+        flush_every: int = 1000,
+    ) -> None:
+        self.store = store
+        self.min_interval_ms = min_interval_ms
+        self.flush_every = flush_every
+        self.books: "dict[str, tuple]" = {}
+        self.last_price: "dict[str, float]" = {}
+        self.last_sample: "dict[str, int]" = {}
+        self.unflushed = 0
+
+    def _sample(self, asset_id: str, ts: int, force: bool = False) -> None:
+        if (
+            not force
+            and ts - self.last_sample.get(asset_id, -(1 << 62)) < self.min_interval_ms
+        ):
+            return
+        bids, asks = self.books.get(asset_id, ({}, {}))
+        bid = max(bids, default=np.nan)
+        ask = min(asks, default=np.nan)
+        mid = (bid + ask) / 2.0
+        price = self.last_price.get(asset_id, mid)
+        self.store.append(asset_id, ts, price, mid, ask - bid)
+        self.last_sample[asset_id] = ts
+        self.unflushed += 1
+        if self.unflushed >= self.flush_every:
+            self.store.flush()
+            self.unflushed = 0
+
+    def on_book(self, event: BookEvent) -> None:
+        self.books[event.asset_id] = (dict(event.bids), dict(event.asks))
+        self._sample(event.asset_id, event.ts)
+
+    def on_price_change(self, event) -> None:
+        bids, asks = self.books.setdefault(event.asset_id, ({}, {}))
+        levels = bids if event.side == BUY else asks
+        if event.size > 0:
+            levels[event.price] = event.size
+        else:
+            levels.pop(event.price, None)
+        self._sample(event.asset_id, event.ts)
+
+    def on_trade(self, event) -> None:
+        self.last_price[event.asset_id] = event.price
+        self._sample(event.asset_id, event.ts, force=True)
+
+
+def poll_gamma(
+    store: PriceHistoryStore,
+    gamma,
+    interval: float = 60.0,
+    iterations: int = None,
+    sleep=time.sleep,
+) -> None:
+    """
+    Sample every active Gamma market into `store` each `interval` seconds,
+    `iterations` times or until interrupted. A failed poll is skipped.
+    """
+    done = 0
+    while iterations is None or done < iterations:
+        if done:
+            sleep(interval)
+        done += 1
+        try:
+            count = store.sample_gamma_markets(gamma.get_all_current_markets())
+        except Exception as e:
+            print(f"[PriceHistoryStore] gamma poll failed: {e}")
+            continue
+        print(f"[PriceHistoryStore] sampled {count} tokens")
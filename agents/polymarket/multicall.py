@@ -0,0 +1,98 @@
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+
+# deployed at the same address on every major chain, Polygon included
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3 = keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+
+def selector(signature: str) -> bytes:
+    return keccak(text=signature)[:4]
+
+
+def argument_types(signature: str) -> "list[str]":
+    inner = signature[signature.index("(") + 1 : signature.rindex(")")]
+    return [t for t in inner.split(",") if t]
+
+
+def encode_call(signature: str, args: list = ()) -> bytes:
+    """ABI calldata for `signature`, e.g. `encode_call("approve(address,uint256)", ...)`."""
+    return selector(signature) + encode(argument_types(signature), list(args))
+
+
+class Call:
+    """
+    One `eth_call` to batch: `Call(usdc, "balanceOf(address)", [owner],
+    ["uint256"])`. With `allow_failure` a revert yields `None` for this call
+    instead of failing the whole batch.
+    """
+
+    __slots__ = ("target", "signature", "args", "returns", "allow_failure")
+
+    def __init__(
+        self,
+        target: str,
+        signature: str,
+        args: list = (),
+        returns: "list[str]" = ("uint256",),
+        allow_failure: bool = True,
+    ) -> None:
+        self.target = to_checksum_address(target)
+        self.signature = signature
+        self.args = list(args)
+        self.returns = list(returns)
+        self.allow_failure = allow_failure
+
+    def calldata(self) -> bytes:
+        return encode_call(self.signature, self.args)
+
+    def decode(self, data: bytes):
+        values = decode(self.returns, data)
+        return values[0] if len(values) == 1 else values
+
+
+def eth_balance(owner: str, multicall_address: str = MULTICALL3_ADDRESS) -> Call:
+    """Native (MATIC/POL) balance, read through Multicall3 itself."""
+    return Call(multicall_address, "getEthBalance(address)", [owner])
+
+
+class Multicall:
+    """
+    Batches many read-only calls into a single Multicall3 `aggregate3`
+    `eth_call` and decodes each result. `batch_size` caps the calls per
+    request so very large portfolios stay under RPC gas / payload limits.
+    """
+
+    def __init__(
+        self, web3, address: str = MULTICALL3_ADDRESS, batch_size: int = 500
+    ) -> None:
+        self.web3 = web3
+        self.address = to_checksum_address(address)
+        self.batch_size = batch_size
+
+    def encode(self, calls: "list[Call]") -> bytes:
+        return AGGREGATE3 + encode(
+            ["(address,bool,bytes)[]"],
+            [[(c.target, c.allow_failure, c.calldata()) for c in calls]],
+        )
+
+    def call(self, calls: "list[Call]", block="latest") -> list:
+        results = []
+        for i in range(0, len(calls), self.batch_size):
+            batch = calls[i : i + self.batch_size]
+            raw = self.web3.eth.call(
+                {"to": self.address, "data": "0x" + self.encode(batch).hex()}, block
+            )
+            for c, (success, data) in zip(batch, decode(["(bool,bytes)[]"], raw)[0]):
+                if not success or not data:
+                    results.append(None)
+                    continue
+                try:
+                    results.append(c.decode(data))
+                except Exception:
+                    results.append(None)
+        return results
+
+    def call_named(self, calls: "dict[object, Call]", block="latest") -> dict:
+        """Like `call`, with results keyed like `calls`."""
+        return dict(zip(calls, self.call(list(calls.values()), block)))
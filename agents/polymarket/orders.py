@@ -0,0 +1,328 @@
+# order lifecycle from the clob user channel
+# https://docs.polymarket.com/developers/CLOB/websocket/user-channel
+
+import asyncio
+import json
+import threading
+import time
+
+import websockets
+
+OPEN_STATUSES = {"LIVE", "DELAYED"}
+
+
+def fill_amounts(response: dict, side: str) -> "tuple[float, float]":
+    """(shares, USDC) an order response reports as matched at submission."""
+    # makingAmount is what we give (USDC on a buy), takingAmount what we get
+    making = float(response.get("makingAmount") or 0)
+    taking = float(response.get("takingAmount") or 0)
+    return (taking, making) if side == "BUY" else (making, taking)
+
+
+class TrackedOrder:
+    """Local view of one of our orders; `matched` is the filled size."""
+
+    __slots__ = (
+        "order_id",
+        "token_id",
+        "side",
+        "price",
+        "size",
+        "matched",
+        "traded",
+        "trades",
+        "status",
+        "created",
+        "updated",
+    )
+
+    def __init__(
+        self,
+        order_id: str,
+        token_id: str,
+        side: str,
+        price: float,
+        size: float,
+        status: str = "LIVE",
+    ) -> None:
+        self.order_id = order_id
+        self.token_id = token_id
+        self.side = side
+        self.price = price
+        self.size = size
+        self.matched = 0.0
+        self.traded = 0.0  # sum of distinct user channel trades
+        self.trades: "set[str]" = set()
+        self.status = status
+        self.created = self.updated = time.time()
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.size - self.matched)
+
+    def __repr__(self) -> str:
+        return (
+            f"TrackedOrder({self.order_id!r}, {self.side} {self.matched}/{self.size}"
+            f" {self.token_id} @ {self.price}, {self.status})"
+        )
+
+
+class OrderManager:
+    """
+    In-memory open orders and positions for everything we submit.
+
+    Fills are applied from the increase in each order's matched size, whether
+    it comes from a user-channel `order` / `trade` message or from a REST
+    poll, and trades are de-duplicated by id, so the same fill reported twice
+    is only counted once. Lookups by
+    order id, token or position are dict reads. Orders placed outside this
+    process show up on the next `reconcile()`.
+
+    With a `risk` engine, fills are reported to it and the unfilled rest of
+    our own orders is released when they are cancelled or expire.
+    """
+
+    def __init__(self, risk=None) -> None:
+        self.orders: "dict[str, TrackedOrder]" = {}
+        self.open_by_token: "dict[str, set]" = {}
+        self.positions: "dict[str, float]" = {}
+        self.reserved: "set[str]" = set()  # ids placed (and risk-checked) here
+        self.risk = risk
+        self.lock = threading.Lock()
+
+    # --- submission ---
+
+    def track(
+        self,
+        response,
+        token_id: str,
+        price: float,
+        size: float,
+        side: str,
+        filled: float = None,
+    ) -> "TrackedOrder | None":
+        """
+        Record the response of a post_order call. `filled` is the size
+        matched at submission, read from the response when not given.
+        """
+        if not isinstance(response, dict) or not response.get("orderID"):
+            return None
+        with self.lock:
+            order = self._order(
+                response["orderID"], token_id, side, float(price), float(size)
+            )
+            if order.is_open:
+                self.reserved.add(order.order_id)
+            self._set_status(order, (response.get("status") or "LIVE").upper())
+            if order.status == "MATCHED":
+                # marketable orders can come back (partly) filled; anything
+                # matched later arrives through trade and order updates
+                if filled is None:
+                    filled = fill_amounts(response, side)[0]
+                self._fill(order, min(float(filled), order.size))
+        return order
+
+    def track_results(self, results: list) -> None:
+        for result in results:
+            if result.success and result.order_id:
+                leg = result.leg
+                self.track(
+                    {"orderID": result.order_id, "status": result.status},
+                    leg.token_id,
+                    leg.price,
+                    leg.size,
+                    leg.side,
+                    result.filled_size,
+                )
+
+    # --- queries ---
+
+    def order(self, order_id: str) -> "TrackedOrder | None":
+        return self.orders.get(order_id)
+
+    def open_orders(self, token_id: str = None) -> "list[TrackedOrder]":
+        if token_id is not None:
+            ids = self.open_by_token.get(token_id, ())
+        else:
+            ids = [i for ids in self.open_by_token.values() for i in ids]
+        return [self.orders[i] for i in list(ids)]
+
+    def position(self, token_id: str) -> float:
+        return self.positions.get(token_id, 0.0)
+
+    # --- updates ---
+
+    def handle(self, msg: dict) -> None:
+        """Apply one user channel message."""
+        event_type = msg.get("event_type")
+        if event_type == "order":
+            self.on_order(msg)
+        elif event_type == "trade":
+            self.on_trade(msg)
+
+    def on_order(self, msg: dict) -> None:
+        with self.lock:
+            order = self._order(
+                msg["id"],
+                msg.get("asset_id"),
+                msg.get("side", "BUY").upper(),
+                float(msg.get("price", 0)),
+                float(msg.get("original_size", 0)),
+            )
+            if msg.get("created_at"):
+                order.created = float(msg["created_at"])
+            self._fill(order, float(msg.get("size_matched", order.matched)))
+            kind = (msg.get("type") or "").upper()
+            if kind == "CANCELLATION":
+                self._set_status(order, "CANCELED")
+            elif msg.get("status"):
+                self._set_status(order, msg["status"].upper())
+            if order.remaining == 0 and order.size > 0:
+                self._set_status(order, "MATCHED")
+
+    def on_trade(self, msg: dict) -> None:
+        if (msg.get("status") or "").upper() == "FAILED":
+            return
+        with self.lock:
+            taker = self.orders.get(msg.get("taker_order_id"))
+            if taker is not None:
+                self._fill_by(taker, msg["id"], float(msg.get("size", 0)))
+            for maker in msg.get("maker_orders", []):
+                order = self.orders.get(maker.get("order_id"))
+                if order is not None:
+                    self._fill_by(order, msg["id"], float(maker["matched_amount"]))
+
+    def on_cancel(self, response) -> None:
+        """Apply a cancel response: `{"canceled": [...], "not_canceled": {...}}`."""
+        if not isinstance(response, dict):
+            return
+        with self.lock:
+            for order_id in response.get("canceled") or ():
+                order = self.orders.get(order_id)
+                if order is not None and order.is_open:
+                    self._set_status(order, "CANCELED")
+
+    def reconcile(self, client) -> None:
+        """Bulk poll: refresh every open order from `client.get_orders()`."""
+        live = {o["id"]: o for o in client.get_orders()}
+        for msg in live.values():
+            self.on_order(msg)
+        # orders that left the open list were filled or cancelled meanwhile
+        for order in self.open_orders():
+            if order.order_id not in live:
+                try:
+                    self.on_order(client.get_order(order.order_id))
+                except Exception as e:
+                    print(f"[OrderManager] could not refresh {order.order_id}: {e}")
+
+    # --- internals, called with the lock held ---
+
+    def _order(self, order_id, token_id, side, price, size) -> TrackedOrder:
+        order = self.orders.get(order_id)
+        if order is None:
+            order = TrackedOrder(order_id, token_id, side, price, size)
+            self.orders[order_id] = order
+            self.open_by_token.setdefault(token_id, set()).add(order_id)
+        elif size and not order.size:
+            order.size = size
+        return order
+
+    def _fill(self, order: TrackedOrder, matched: float) -> None:
+        delta = matched - order.matched
+        if delta <= 0:
+            return
+        order.matched = matched
+        order.updated = time.time()
+        signed = delta if order.side == "BUY" else -delta
+        self.positions[order.token_id] = (
+            self.positions.get(order.token_id, 0.0) + signed
+        )
+        if self.risk is not None:
+            self.risk.on_fill(order.token_id, order.side, order.price, delta)
+
+    def _fill_by(self, order: TrackedOrder, trade_id: str, amount: float) -> None:
+        # trade messages repeat as the match moves MATCHED -> MINED -> CONFIRMED,
+        # and order messages may already have reported the same fill
+        if trade_id in order.trades:
+            return
+        order.trades.add(trade_id)
+        order.traded += amount
+        self._fill(order, order.traded)
+
+    def _set_status(self, order: TrackedOrder, status: str) -> None:
+        order.status = status
+        order.updated = time.time()
+        if not order.is_open and order.order_id in self.reserved:
+            self.reserved.discard(order.order_id)
+            if self.risk is not None and status != "MATCHED":
+                self.risk.release(
+                    order.token_id, order.price, order.remaining, order.side
+                )
+        ids = self.open_by_token.get(order.token_id)
+        if ids is None:
+            return
+        if order.is_open:
+            ids.add(order.order_id)
+        else:
+            ids.discard(order.order_id)
+
+
+class UserFeed:
+    """
+    Authenticated CLOB user channel. `run(manager)` feeds every order and
+    trade message to `manager.handle` and reconnects on drops.
+    """
+
+    def __init__(
+        self,
+        credentials,
+        markets: "list[str]" = None,
+        url: str = "wss://ws-subscriptions-clob.polymarket.com/ws/user",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.credentials = credentials
+        self.markets = list(markets or [])
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.running = False
+
+    def stop(self) -> None:
+        self.running = False
+
+    async def messages(self):
+        self.running = True
+        auth = {
+            "apiKey": self.credentials.api_key,
+            "secret": self.credentials.api_secret,
+            "passphrase": self.credentials.api_passphrase,
+        }
+        while self.running:
+            try:
+                async with websockets.connect(self.url, ping_interval=10) as ws:
+                    await ws.send(
+                        json.dumps(
+                            {"auth": auth, "markets": self.markets, "type": "user"}
+                        )
+                    )
+                    async for raw in ws:
+                        if not self.running:
+                            return
+                        if raw == "PONG":
+                            continue
+                        try:
+                            data = json.loads(raw)
+                        except ValueError:
+                            continue
+                        for msg in data if isinstance(data, list) else [data]:
+                            yield msg
+            except (OSError, websockets.ConnectionClosed) as e:
+                print(f"[UserFeed] connection lost: {e}, reconnecting")
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def run(self, manager: OrderManager) -> None:
+        async for msg in self.messages():
+            manager.handle(msg)
@@ -1,11 +1,11 @@
 # core polymarket api
 # https://github.com/Polymarket/py-clob-client/tree/main/examples
 
+import asyncio
 import os
 import sys
 import pdb
 import time
-import ast
 import requests
 
 from dotenv import load_dotenv
@@ -44,30 +44,66 @@ from py_clob_client.clob_types import (
     MarketOrderArgs,
     OrderType,
     OrderBookSummary,
+    BookParams,
 )
 from py_clob_client.order_builder.constants import BUY
 
-from agents.utils.objects import SimpleMarket, SimpleEvent
+from agents.utils.objects import OrderLeg, OrderResult, SimpleMarket, SimpleEvent
+from agents.polymarket.table import MarketTable
+from agents.polymarket.presign import PresignedOrderPool
+from agents.polymarket.batch import BatchOrderClient
+from agents.polymarket.router import SmartOrderRouter
+from agents.polymarket.orders import OrderManager, UserFeed
+from agents.polymarket.risk import RiskEngine, RiskLimits
+from agents.polymarket.multicall import Call, Multicall, encode_call, eth_balance
+from agents.utils.rpc import AsyncRPCPool
+from agents.utils.transactions import TransactionSender
+from agents.utils.http_cache import HTTPCache
+from agents.utils.records import decode_events, decode_markets, json_floats, json_list
 
 load_dotenv()
 
 
+def contract_transaction(to: str, signature: str, *args) -> dict:
+    return {
+        "to": Web3.to_checksum_address(to),
+        "data": "0x" + encode_call(signature, args).hex(),
+    }
+
+
 class Polymarket:
     def __init__(self) -> None:
         self.gamma_url = "https://gamma-api.polymarket.com"
         self.gamma_markets_endpoint = self.gamma_url + "/markets"
         self.gamma_events_endpoint = self.gamma_url + "/events"
+        # the trading loop serves the last Gamma payload and refreshes it in
+        # the background instead of blocking on every poll, but never acts on
+        # one more than a minute old (e.g. left by a previous run)
+        self.http = HTTPCache(stale_while_revalidate=True, max_stale=60.0)
 
         self.clob_url = "https://clob.polymarket.com"
         self.clob_auth_endpoint = self.clob_url + "/auth/api-key"
 
         self.chain_id = 137  # POLYGON
         self.private_key = os.getenv("POLYGON_WALLET_PRIVATE_KEY")
-        self.polygon_rpc = "https://polygon-rpc.com"
-        self.w3 = Web3(Web3.HTTPProvider(self.polygon_rpc))
+        # comma-separated endpoints; the async pool fails over between them
+        self.polygon_rpc_urls = os.getenv(
+            "POLYGON_RPC_URLS",
+            "https://polygon-rpc.com,https://polygon-bor-rpc.publicnode.com",
+        ).split(",")
+        self.polygon_rpc = self.polygon_rpc_urls[0]
+        self.rpc = AsyncRPCPool(self.polygon_rpc_urls)
+        # derived once; signing state is reused across orders
+        self._address = None
+        self._order_builder = None
+        self._sender = None
+        # CTF exchange nonce for our orders; only changes after an on-chain
+        # incrementNonce (cancel-all), so orders must not use a timestamp
+        self.order_nonce = int(os.getenv("POLYMARKET_ORDER_NONCE", 0))
 
         self.exchange_address = "0x4bfb41d5b3570defd03c39a9a4d8de6bd8b8982e"
         self.neg_risk_exchange_address = "0xC5d563A36AE78145C45a50134d48A1215220f80a"
+        self.neg_risk_adapter_address = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
 
         self.erc20_approve = """[{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"owner","type":"address"},{"indexed":true,"internalType":"address","name":"spender","type":"address"},{"indexed":false,"internalType":"uint256","name":"value","type":"uint256"}],"name":"Approval","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"authorizer","type":"address"},{"indexed":true,"internalType":"bytes32","name":"nonce","type":"bytes32"}],"name":"AuthorizationCanceled","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"authorizer","type":"address"},{"indexed":true,"internalType":"bytes32","name":"nonce","type":"bytes32"}],"name":"AuthorizationUsed","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"account","type":"address"}],"name":"Blacklisted","type":"event"},{"anonymous":false,"inputs":[{"indexed":false,"internalType":"address","name":"userAddress","type":"address"},{"indexed":false,"internalType":"address payable","name":"relayerAddress","type":"address"},{"indexed":false,"internalType":"bytes","name":"functionSignature","type":"bytes"}],"name":"MetaTransactionExecuted","type":"event"},{"anonymous":false,"inputs":[],"name":"Pause","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"newRescuer","type":"address"}],"name":"RescuerChanged","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"role","type":"bytes32"},{"indexed":true,"internalType":"bytes32","name":"previousAdminRole","type":"bytes32"},{"indexed":true,"internalType":"bytes32","name":"newAdminRole","type":"bytes32"}],"name":"RoleAdminChanged","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"role","type":"bytes32"},{"indexed":true,"internalType":"address","name":"account","type":"address"},{"indexed":true,"internalType":"address","name":"sender","type":"address"}],"name":"RoleGranted","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"role","type":"bytes32"},{"indexed":true,"internalType":"address","name":"account","type":"address"},{"indexed":true,"internalType":"address","name":"sender","type":"address"}],"name":"RoleRevoked","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"from","type":"address"},{"indexed":true,"internalType":"address","name":"to","type":"address"},{"indexed":false,"internalType":"uint256","name":"value","type":"uint256"}],"name":"Transfer","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"account","type":"address"}],"name":"UnBlacklisted","type":"event"},{"anonymous":false,"inputs":[],"name":"Unpause","type":"event"},{"inputs":[],"name":"APPROVE_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"BLACKLISTER_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"CANCEL_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"DECREASE_ALLOWANCE_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"DEFAULT_ADMIN_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"DEPOSITOR_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"DOMAIN_SEPARATOR","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"EIP712_VERSION","outputs":[{"internalType":"string","name":"","type":"string"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"INCREASE_ALLOWANCE_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"META_TRANSACTION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"PAUSER_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"PERMIT_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"RESCUER_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"TRANSFER_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"WITHDRAW_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"}],"name":"allowance","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"approve","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"approveWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"authorizer","type":"address"},{"internalType":"bytes32","name":"nonce","type":"bytes32"}],"name":"authorizationState","outputs":[{"internalType":"enum GasAbstraction.AuthorizationState","name":"","type":"uint8"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"balanceOf","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"blacklist","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"blacklisters","outputs":[{"internalType":"address[]","name":"","type":"address[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"authorizer","type":"address"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"cancelAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"decimals","outputs":[{"internalType":"uint8","name":"","type":"uint8"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"subtractedValue","type":"uint256"}],"name":"decreaseAllowance","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"decrement","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"decreaseAllowanceWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"user","type":"address"},{"internalType":"bytes","name":"depositData","type":"bytes"}],"name":"deposit","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"userAddress","type":"address"},{"internalType":"bytes","name":"functionSignature","type":"bytes"},{"internalType":"bytes32","name":"sigR","type":"bytes32"},{"internalType":"bytes32","name":"sigS","type":"bytes32"},{"internalType":"uint8","name":"sigV","type":"uint8"}],"name":"executeMetaTransaction","outputs":[{"internalType":"bytes","name":"","type":"bytes"}],"stateMutability":"payable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"}],"name":"getRoleAdmin","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"uint256","name":"index","type":"uint256"}],"name":"getRoleMember","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"}],"name":"getRoleMemberCount","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"address","name":"account","type":"address"}],"name":"grantRole","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"address","name":"account","type":"address"}],"name":"hasRole","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"addedValue","type":"uint256"}],"name":"increaseAllowance","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"increment","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"increaseAllowanceWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"string","name":"newName","type":"string"},{"internalType":"string","name":"newSymbol","type":"string"},{"internalType":"uint8","name":"newDecimals","type":"uint8"},{"internalType":"address","name":"childChainManager","type":"address"}],"name":"initialize","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"initialized","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"isBlacklisted","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"name","outputs":[{"internalType":"string","name":"","type":"string"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"}],"name":"nonces","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"pause","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"paused","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"pausers","outputs":[{"internalType":"address[]","name":"","type":"address[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"},{"internalType":"uint256","name":"deadline","type":"uint256"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"permit","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"address","name":"account","type":"address"}],"name":"renounceRole","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"contract IERC20","name":"tokenContract","type":"address"},{"internalType":"address","name":"to","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"rescueERC20","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"rescuers","outputs":[{"internalType":"address[]","name":"","type":"address[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"address","name":"account","type":"address"}],"name":"revokeRole","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"symbol","outputs":[{"internalType":"string","name":"","type":"string"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"totalSupply","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"recipient","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"transfer","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"sender","type":"address"},{"internalType":"address","name":"recipient","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"transferFrom","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"from","type":"address"},{"internalType":"address","name":"to","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"transferWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"unBlacklist","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"unpause","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"string","name":"newName","type":"string"},{"internalType":"string","name":"newSymbol","type":"string"}],"name":"updateMetadata","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"withdraw","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"withdrawWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"}]"""
         self.erc1155_set_approval = """[{"inputs": [{ "internalType": "address", "name": "operator", "type": "address" },{ "internalType": "bool", "name": "approved", "type": "bool" }],"name": "setApprovalForAll","outputs": [],"stateMutability": "nonpayable","type": "function"}]"""
@@ -87,7 +123,9 @@ class Polymarket:
             except Exception:
                 # If middleware injection fails, continue without it (Polygon doesn't need it)
                 pass
+        self.w3 = self.web3
 
+        self.multicall = Multicall(self.web3)
         self.usdc = self.web3.eth.contract(
             address=self.usdc_address, abi=self.erc20_approve
         )
@@ -105,115 +143,100 @@ class Polymarket:
         self.credentials = self.client.create_or_derive_api_creds()
         self.client.set_api_creds(self.credentials)
         # print(self.credentials)
+        self.risk = RiskEngine(RiskLimits.from_env(), os.getenv("RISK_AUDIT_LOG"))
+        self.order_pool = PresignedOrderPool(self.client)
+        self.batch = BatchOrderClient(self.client, self.order_pool, risk=self.risk)
+        self.orders = OrderManager(self.risk)
+        self.router = SmartOrderRouter(self)
 
     def _init_approvals(self, run: bool = False) -> None:
         if not run:
             return
-
-        priv_key = self.private_key
-        pub_key = self.get_address_for_private_key()
-        chain_id = self.chain_id
-        web3 = self.web3
-        nonce = web3.eth.get_transaction_count(pub_key)
-        usdc = self.usdc
-        ctf = self.ctf
-
-        # CTF Exchange
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
-        )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
-        )
-        print(usdc_approve_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
-        )
-        print(ctf_approval_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        # Neg Risk CTF Exchange
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0xC5d563A36AE78145C45a50134d48A1215220f80a", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
-        )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
-        )
-        print(usdc_approve_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0xC5d563A36AE78145C45a50134d48A1215220f80a", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
+        for receipt in self.send_transactions(self.approval_transactions()):
+            print(receipt)
+
+    def get_transaction_sender(self) -> TransactionSender:
+        if self._sender is None:
+            self._sender = TransactionSender(self.rpc, self.private_key, self.chain_id)
+        return self._sender
+
+    def send_transactions(self, txs: "list[dict]") -> "list[dict]":
+        """Broadcast `{to, data}` transactions back to back; receipts in order."""
+        return asyncio.run(self.get_transaction_sender().send_all(txs))
+
+    def approval_transactions(self) -> "list[dict]":
+        # USDC allowance and CTF operator approval for the CTF Exchange, the
+        # Neg Risk CTF Exchange and the Neg Risk Adapter
+        txs = []
+        for spender in (
+            self.exchange_address,
+            self.neg_risk_exchange_address,
+            self.neg_risk_adapter_address,
+        ):
+            spender = Web3.to_checksum_address(spender)
+            txs.append(
+                contract_transaction(
+                    self.usdc_address,
+                    "approve(address,uint256)",
+                    spender,
+                    int(MAX_INT, 0),
+                )
+            )
+            txs.append(
+                contract_transaction(
+                    self.ctf_address, "setApprovalForAll(address,bool)", spender, True
+                )
+            )
+        return txs
+
+    def split_position(self, condition_id: str, amount: float) -> dict:
+        """Turn `amount` USDC into `amount` YES + NO shares of a binary market."""
+        txs = [self._ctf_position_call("splitPosition", condition_id, amount)]
+        return self.send_transactions(txs)[0]
+
+    def merge_positions(self, condition_id: str, amount: float) -> dict:
+        """Turn `amount` YES + NO shares back into `amount` USDC."""
+        txs = [self._ctf_position_call("mergePositions", condition_id, amount)]
+        return self.send_transactions(txs)[0]
+
+    def _ctf_position_call(self, name: str, condition_id: str, amount: float) -> dict:
+        return contract_transaction(
+            self.ctf_address,
+            f"{name}(address,bytes32,bytes32,uint256[],uint256)",
+            Web3.to_checksum_address(self.usdc_address),
+            bytes(32),
+            bytes.fromhex(condition_id.removeprefix("0x")),
+            [1, 2],
+            int(round(amount * 1e6)),
         )
-        print(ctf_approval_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
 
-        # Neg Risk Adapter
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
-        )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
+    def redeem_positions(self, condition_ids: "list[str]") -> "list[dict]":
+        """Redeem winning shares of resolved (non neg-risk) markets, all in one go."""
+        return self.send_transactions(
+            [
+                contract_transaction(
+                    self.ctf_address,
+                    "redeemPositions(address,bytes32,bytes32,uint256[])",
+                    Web3.to_checksum_address(self.usdc_address),
+                    bytes(32),
+                    bytes.fromhex(condition_id.removeprefix("0x")),
+                    [1, 2],
+                )
+                for condition_id in condition_ids
+            ]
         )
-        print(usdc_approve_tx_receipt)
 
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
-        )
-        print(ctf_approval_tx_receipt)
+    def transfer_usdc(self, to: str, amount: float) -> dict:
+        return self.send_transactions(
+            [
+                contract_transaction(
+                    self.usdc_address,
+                    "transfer(address,uint256)",
+                    Web3.to_checksum_address(to),
+                    int(round(amount * 1e6)),
+                )
+            ]
+        )[0]
 
     def get_all_markets(self) -> "list[SimpleMarket]":
         markets = []
@@ -223,24 +246,45 @@ class Polymarket:
             "limit": 100
         }
         try:
-            # Use explicit client with timeout to avoid Python 3.14 recursion issues
-            with httpx.Client(timeout=30.0) as client:
-                res = client.get(self.gamma_markets_endpoint, params=query_params)
-                if res.status_code == 200:
-                    for market in res.json():
-                        try:
-                            market_data = self.map_api_to_market(market)
-                            markets.append(SimpleMarket(**market_data))
-                        except Exception as e:
-                            print(e)
-                            pass
+            res = self.http.get(self.gamma_markets_endpoint, params=query_params)
+            if res.status_code == 200:
+                markets = decode_markets(res.content)
         except RecursionError as e:
             print(f"RecursionError: Python 3.14 compatibility issue with httpx. Error: {e}")
             print("RECOMMENDATION: Use Python 3.11 or 3.12 instead of Python 3.14")
             raise Exception("Python 3.14 incompatibility with httpx. Please use Python 3.11 or 3.12.")
         return markets
 
+    def get_market_table(
+        self, page_size: int = 500, max_markets: int = None
+    ) -> MarketTable:
+        """Every active market (up to `max_markets`), paging through Gamma."""
+        records = []
+        while max_markets is None or len(records) < max_markets:
+            query_params = {
+                "active": "true",
+                "closed": "false",
+                "limit": page_size,
+                "offset": len(records),
+            }
+            try:
+                res = self.http.get(self.gamma_markets_endpoint, params=query_params)
+            except RecursionError as e:
+                print(f"RecursionError: Python 3.14 compatibility issue with httpx. Error: {e}")
+                print("RECOMMENDATION: Use Python 3.11 or 3.12 instead of Python 3.14")
+                raise Exception("Python 3.14 incompatibility with httpx. Please use Python 3.11 or 3.12.")
+            if res.status_code != 200:
+                print(f"Error response returned from api: HTTP {res.status_code}")
+                break
+            page = res.json()
+            records.extend(page)
+            if len(page) < page_size:
+                break
+        return MarketTable.from_records(records[:max_markets])
+
     def filter_markets_for_trading(self, markets: "list[SimpleMarket]"):
+        if isinstance(markets, MarketTable):
+            return markets.tradeable()
         tradeable_markets = []
         for market in markets:
             if market.active:
@@ -275,12 +319,12 @@ class Polymarket:
             "rewardsMaxSpread": float(market["rewardsMaxSpread"]),
             # "volume": float(market["volume"]),
             "spread": float(market["spread"]),
-            "outcomes": str(market["outcomes"]),
-            "outcome_prices": str(market["outcomePrices"]),
-            "clob_token_ids": str(market["clobTokenIds"]),
+            "outcomes": json_list(market["outcomes"]),
+            "outcome_prices": json_floats(market["outcomePrices"]),
+            "clob_token_ids": json_list(market["clobTokenIds"]),
         }
         if token_id:
-            market["clob_token_ids"] = token_id
+            market["clob_token_ids"] = [token_id]
         return market
 
     def get_all_events(self, max_retries: int = 3) -> "list[SimpleEvent]":
@@ -298,27 +342,18 @@ class Polymarket:
         
         for attempt in range(max_retries):
             try:
-                # Use explicit client with timeout to avoid Python 3.14 recursion issues
-                with httpx.Client(timeout=30.0) as client:
-                    res = client.get(self.gamma_events_endpoint, params=query_params)
-                    if res.status_code == 200:
-                        data = res.json()
-                        print(f"Fetched {len(data)} events from API")
-                        for event in data:
-                            try:
-                                event_data = self.map_api_to_event(event)
-                                events.append(SimpleEvent(**event_data))
-                            except Exception as e:
-                                print(f"Error parsing event: {e}")
-                                pass
-                        return events
-                    else:
-                        print(f"API returned status {res.status_code}, attempt {attempt + 1}/{max_retries}")
-                        if attempt < max_retries - 1:
-                            time.sleep(2 ** attempt)  # Exponential backoff
-                            continue
-                        raise Exception(f"API returned status {res.status_code}")
-                        
+                res = self.http.get(self.gamma_events_endpoint, params=query_params)
+                if res.status_code == 200:
+                    events = decode_events(res.content)
+                    print(f"Fetched {len(events)} events from API")
+                    return events
+                else:
+                    print(f"API returned status {res.status_code}, attempt {attempt + 1}/{max_retries}")
+                    if attempt < max_retries - 1:
+                        time.sleep(2 ** attempt)  # Exponential backoff
+                        continue
+                    raise Exception(f"API returned status {res.status_code}")
+                    
             except RecursionError as e:
                 print(f"RecursionError: Python 3.14 compatibility issue with httpx. Error: {e}")
                 print("RECOMMENDATION: Use Python 3.11 or 3.12 instead of Python 3.14")
@@ -392,23 +427,40 @@ class Polymarket:
     def get_orderbook(self, token_id: str) -> OrderBookSummary:
         return self.client.get_order_book(token_id)
 
+    def get_orderbooks(self, token_ids: "list[str]") -> "list[OrderBookSummary]":
+        # single POST /books round trip for every token instead of one GET each
+        return self.client.get_order_books(
+            [BookParams(token_id=token_id) for token_id in token_ids]
+        )
+
     def get_orderbook_price(self, token_id: str) -> float:
         return float(self.client.get_price(token_id))
 
     def get_address_for_private_key(self):
-        account = self.w3.eth.account.from_key(str(self.private_key))
-        return account.address
+        if self._address is None:
+            account = self.w3.eth.account.from_key(str(self.private_key))
+            self._address = account.address
+        return self._address
+
+    def get_order_builder(self) -> OrderBuilder:
+        if self._order_builder is None:
+            signer = Signer(self.private_key)
+            self._order_builder = OrderBuilder(
+                self.exchange_address, self.chain_id, signer
+            )
+        return self._order_builder
 
     def build_order(
         self,
         market_token: str,
         amount: float,
-        nonce: str = str(round(time.time())),  # for cancellations
+        nonce: str = None,  # exchange nonce, defaults to self.order_nonce
         side: str = "BUY",
         expiration: str = "0",  # timestamp after which order expires
     ):
-        signer = Signer(self.private_key)
-        builder = OrderBuilder(self.exchange_address, self.chain_id, signer)
+        builder = self.get_order_builder()
+        if nonce is None:
+            nonce = str(self.order_nonce)
 
         buy = side == "BUY"
         side = 0 if buy else 1
@@ -427,23 +479,105 @@ class Polymarket:
         order = builder.build_signed_order(order_data)
         return order
 
+    def watch_orders(
+        self, token_id: str, prices: "list[float]", size: float, side: str = BUY
+    ) -> None:
+        """Pre-sign limit orders at these price levels so execute_order only posts."""
+        self.order_pool.watch(token_id, prices, size, side)
+
     def execute_order(self, price, size, side, token_id) -> str:
-        return self.client.create_and_post_order(
-            OrderArgs(price=price, size=size, side=side, token_id=token_id)
-        )
+        self.risk.check(token_id, price, size, side)
+        try:
+            response = self.order_pool.post(token_id, price, size, side)
+        except Exception:
+            self.risk.release(token_id, price, size, side)
+            raise
+        if not (isinstance(response, dict) and response.get("success")):
+            self.risk.release(token_id, price, size, side)
+        self.orders.track(response, token_id, price, size, side)
+        return response
+
+    def execute_orders(
+        self, legs: "list[OrderLeg]", order_type: str = OrderType.GTC
+    ) -> "list[OrderResult]":
+        """Sign and post several legs together; one result per leg, in order."""
+        results = self.batch.post(legs, order_type)
+        self.orders.track_results(results)
+        return results
+
+    def cancel_orders(self, order_ids: "list[str]"):
+        response = self.batch.cancel(order_ids)
+        self.orders.on_cancel(response)
+        return response
+
+    def cancel_market_orders(self, market: str = "", token_ids: "list[str]" = None):
+        responses = self.batch.cancel_market(market, token_ids)
+        for response in responses:
+            self.orders.on_cancel(response)
+        return responses
+
+    def user_feed(self, markets: "list[str]" = None) -> UserFeed:
+        """User channel feed; `await feed.run(self.orders)` keeps order state live."""
+        return UserFeed(self.credentials, markets)
+
+    def execute_market_order(self, market, amount, **routing) -> dict:
+        """
+        Buy `amount` USDC of the market's token through the smart order router
+        instead of one FOK order. `routing` is passed to `SmartOrderRouter.plan`
+        (slices, interval, display_size, limit_price).
+        """
+        metadata = market[0].dict()["metadata"]
+        token_id = json_list(metadata["clob_token_ids"])[1]
+        self.risk.register(token_id, metadata.get("id"))
+        report = self.router.route(token_id, amount, BUY, **routing)
+        print("Execute market order... ", report)
+        return report
+
+    def get_onchain_state(self, token_ids: "list[str]" = ()) -> dict:
+        """
+        USDC and MATIC balances, USDC allowances and CTF approvals for the
+        exchanges and neg-risk adapter, and CTF balances of `token_ids`, all
+        read in a single Multicall3 round trip. Failed reads come back as None.
+        """
+        owner = self.get_address_for_private_key()
+        spenders = {
+            "exchange": self.exchange_address,
+            "neg_risk_exchange": self.neg_risk_exchange_address,
+            "neg_risk_adapter": self.neg_risk_adapter_address,
+        }
+        calls = {
+            ("usdc",): Call(self.usdc_address, "balanceOf(address)", [owner]),
+            ("matic",): eth_balance(owner, self.multicall.address),
+        }
+        for name, spender in spenders.items():
+            calls[("allowances", name)] = Call(
+                self.usdc_address, "allowance(address,address)", [owner, spender]
+            )
+            calls[("approved", name)] = Call(
+                self.ctf_address,
+                "isApprovedForAll(address,address)",
+                [owner, spender],
+                ["bool"],
+            )
+        for token_id in token_ids:
+            calls[("positions", token_id)] = Call(
+                self.ctf_address, "balanceOf(address,uint256)", [owner, int(token_id)]
+            )
 
-    def execute_market_order(self, market, amount) -> str:
-        token_id = ast.literal_eval(market[0].dict()["metadata"]["clob_token_ids"])[1]
-        order_args = MarketOrderArgs(
-            token_id=token_id,
-            amount=amount,
-        )
-        signed_order = self.client.create_market_order(order_args)
-        print("Execute market order... signed_order ", signed_order)
-        resp = self.client.post_order(signed_order, orderType=OrderType.FOK)
-        print(resp)
-        print("Done!")
-        return resp
+        def scaled(value, decimals=6):
+            return value / 10**decimals if value is not None else None
+
+        state = {"allowances": {}, "approved": {}, "positions": {}}
+        for key, value in self.multicall.call_named(calls).items():
+            if key == ("usdc",):
+                state["usdc"] = scaled(value)
+            elif key == ("matic",):
+                state["matic"] = scaled(value, 18)
+            elif key[0] == "approved":
+                state["approved"][key[1]] = value
+            else:
+                state[key[0]][key[1]] = scaled(value)
+        return state
 
     def get_usdc_balance(self) -> float:
         balance_res = self.usdc.functions.balanceOf(
@@ -561,7 +695,7 @@ if __name__ == "__main__":
     # test_size = 0.0001
     test_size = 1
     test_side = BUY
-    test_price = float(ast.literal_eval(test_market_data["outcome_prices"])[0])
+    test_price = test_market_data["outcome_prices"][0]
 
     # order = p.execute_order(
     #    test_price,
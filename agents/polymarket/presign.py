@@ -0,0 +1,107 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from py_clob_client.clob_types import OrderArgs, OrderType
+
+
+def template_key(token_id: str, price: float, size: float, side: str) -> tuple:
+    return (str(token_id), round(float(price), 6), round(float(size), 6), side)
+
+
+class PresignedOrderPool:
+    """
+    Keeps `depth` signed limit orders ready per watched (token, price, size,
+    side) template, so placing one of them is just the POST.
+
+    Every signed order carries a random salt and can be posted only once, so
+    `take()` removes it from the pool and a single background worker signs
+    its replacement. Orders for templates that are not watched (or whose
+    stock is exhausted) are signed on demand, as before.
+
+    Pre-signed orders stay valid until the exchange nonce changes; call
+    `clear()` after an on-chain cancel-all.
+    """
+
+    def __init__(self, client, depth: int = 2) -> None:
+        self.client = client
+        self.depth = depth
+        self.orders: "dict[tuple, deque]" = {}
+        self.lock = threading.Lock()
+        self.worker = ThreadPoolExecutor(max_workers=1)
+        self.hits = 0
+        self.misses = 0
+
+    def sign(self, key: tuple):
+        token_id, price, size, side = key
+        return self.client.create_order(
+            OrderArgs(price=price, size=size, side=side, token_id=token_id)
+        )
+
+    def watch(
+        self, token_id: str, prices: "list[float]", size: float, side: str = "BUY"
+    ) -> None:
+        """Register templates for each price level and sign them now."""
+        with self.lock:
+            for price in prices:
+                self.orders.setdefault(
+                    template_key(token_id, price, size, side), deque()
+                )
+        self.refill()
+
+    def unwatch(self, token_id: str) -> None:
+        with self.lock:
+            for key in [k for k in self.orders if k[0] == str(token_id)]:
+                del self.orders[key]
+
+    def refill(self) -> None:
+        with self.lock:
+            wanted = [
+                (key, self.depth - len(stock)) for key, stock in self.orders.items()
+            ]
+        for key, missing in wanted:
+            for _ in range(missing):
+                try:
+                    order = self.sign(key)
+                except Exception as e:
+                    print(f"[PresignedOrderPool] signing {key} failed: {e}")
+                    break
+                with self.lock:
+                    stock = self.orders.get(key)
+                    if stock is None or len(stock) >= self.depth:
+                        break
+                    stock.append(order)
+
+    def take(self, token_id: str, price: float, size: float, side: str = "BUY"):
+        """A ready signed order for the template, or one signed right now."""
+        key = template_key(token_id, price, size, side)
+        with self.lock:
+            stock = self.orders.get(key)
+            order = stock.popleft() if stock else None
+        if order is None:
+            self.misses += 1
+            return self.sign(key)
+        self.hits += 1
+        self.worker.submit(self.refill)
+        return order
+
+    def post(
+        self,
+        token_id: str,
+        price: float,
+        size: float,
+        side: str = "BUY",
+        order_type: str = OrderType.GTC,
+    ):
+        order = self.take(token_id, price, size, side)
+        return self.client.post_order(order, orderType=order_type)
+
+    def clear(self) -> None:
+        with self.lock:
+            for stock in self.orders.values():
+                stock.clear()
+        self.worker.submit(self.refill)
+
+    def wait(self) -> None:
+        """Block until queued refills have run."""
+        self.worker.submit(lambda: None).result()
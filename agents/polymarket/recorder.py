@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from agents.polymarket.feed import BookEvent, TradeEvent, BUY, SELL
+
+# One fixed-width row per book level / price change / trade. A book snapshot
+# is a KIND_BOOK header row whose `size` is the number of KIND_LEVEL rows that
+# follow it.
+TICK_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),  # exchange timestamp, ms
+        ("asset", "<u4"),  # index into the block's asset table
+        ("kind", "u1"),
+        ("side", "u1"),
+        ("price", "<f8"),
+        ("size", "<f8"),
+    ]
+)
+KIND_BOOK = 0
+KIND_LEVEL = 1
+KIND_PRICE_CHANGE = 2
+KIND_TRADE = 3
+
+# Block layout: header, zlib(json asset table), zlib(raw TICK_DTYPE rows)
+BLOCK_MAGIC = b"TKB1"
+BLOCK_HEADER = struct.Struct("<4sIII")  # magic, n_rows, assets_len, rows_len
+
+DAY_MS = 86_400_000
+
+
+def day_for(ts: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts / 1000))
+
+
+def log_path(directory: str, day: str) -> str:
+    return os.path.join(directory, f"{day}.ticks")
+
+
+def encode_block(assets: "list[str]", rows: np.ndarray, level: int = 6) -> bytes:
+    asset_bytes = zlib.compress(json.dumps(assets).encode("utf-8"), level)
+    row_bytes = zlib.compress(rows.tobytes(), level)
+    header = BLOCK_HEADER.pack(BLOCK_MAGIC, len(rows), len(asset_bytes), len(row_bytes))
+    return header + asset_bytes + row_bytes
+
+
+class Recorder:
+    """
+    Appends CLOB feed events to compressed, day-partitioned tick logs.
+
+    Events are buffered and written as self-contained zlib blocks to
+    `<directory>/<YYYY-MM-DD>.ticks` (UTC day of the event timestamp), so a
+    crash loses at most one unflushed block and files can be read while they
+    are still being appended to.
+    """
+
+    def __init__(
+        self,
+        directory: str = "./local_db_ticks",
+        block_rows: int = 65536,
+        compression_level: int = 6,
+    ) -> None:
+        self.directory = directory
+        self.block_rows = block_rows
+        self.compression_level = compression_level
+        self.rows: "list[tuple]" = []
+        self.assets: "dict[str, int]" = {}
+        self.day = None
+        self.day_start = 0
+        self.day_end = -1
+        self.events_recorded = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _asset(self, asset_id: str) -> int:
+        i = self.assets.get(asset_id)
+        if i is None:
+            i = self.assets[asset_id] = len(self.assets)
+        return i
+
+    def record(self, event) -> None:
+        ts = event.ts
+        if not self.day_start <= ts < self.day_end:
+            self.flush()
+            self.day = day_for(ts)
+            self.day_start = ts - ts % DAY_MS
+            self.day_end = self.day_start + DAY_MS
+
+        asset = self._asset(event.asset_id)
+        rows = self.rows
+        if isinstance(event, BookEvent):
+            rows.append(
+                (ts, asset, KIND_BOOK, 0, 0.0, len(event.bids) + len(event.asks))
+            )
+            for price, size in event.bids:
+                rows.append((ts, asset, KIND_LEVEL, BUY, price, size))
+            for price, size in event.asks:
+                rows.append((ts, asset, KIND_LEVEL, SELL, price, size))
+        else:
+            kind = KIND_TRADE if isinstance(event, TradeEvent) else KIND_PRICE_CHANGE
+            rows.append((ts, asset, kind, event.side, event.price, event.size))
+        self.events_recorded += 1
+
+        if len(rows) >= self.block_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        block = encode_block(
+            sorted(self.assets, key=self.assets.get),
+            np.array(self.rows, dtype=TICK_DTYPE),
+            self.compression_level,
+        )
+        with open(log_path(self.directory, self.day), "ab") as f:
+            f.write(block)
+        self.rows = []
+        self.assets = {}
+
+    def close(self) -> None:
+        self.flush()
+
+    async def record_feed(self, feed, flush_interval: float = 5.0) -> None:
+        """Record a MarketFeed until it stops, flushing at least every `flush_interval` s."""
+        last_flush = time.monotonic()
+        try:
+            async for event in feed.events():
+                self.record(event)
+                now = time.monotonic()
+                if now - last_flush >= flush_interval:
+                    self.flush()
+                    last_flush = now
+        finally:
+            self.flush()
+
+
+if __name__ == "__main__":
+    import sys
+
+    from agents.polymarket.feed import MarketFeed
+
+    recorder = Recorder()
+    asyncio.run(recorder.record_feed(MarketFeed(sys.argv[1:])))
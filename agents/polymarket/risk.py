@@ -0,0 +1,353 @@
+# pre-trade risk checks, after polymarket-arbitrage-agent's execution/risk.ts
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+from agents.utils.rate_limit import RateLimiter
+
+
+class RiskRejected(Exception):
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+        super().__init__(reason)
+
+
+class RiskLimits:
+    """
+    Pre-trade limits; `None` disables a check. Sizes are shares, everything
+    else USDC. With `kill_switch` a breach of `max_daily_loss` halts all
+    trading until `RiskEngine.resume()`, not just until the next UTC day.
+    """
+
+    __slots__ = (
+        "max_order_size",
+        "max_order_notional",
+        "max_market_exposure",
+        "max_event_exposure",
+        "max_side_exposure",
+        "max_orders_per_second",
+        "order_burst",
+        "max_orders_per_day",
+        "max_daily_loss",
+        "kill_switch",
+    )
+
+    def __init__(
+        self,
+        max_order_size: float = None,
+        max_order_notional: float = None,
+        max_market_exposure: float = None,
+        max_event_exposure: float = None,
+        max_side_exposure: float = None,
+        max_orders_per_second: float = None,
+        order_burst: int = 10,
+        max_orders_per_day: int = None,
+        max_daily_loss: float = None,
+        kill_switch: bool = True,
+    ) -> None:
+        self.max_order_size = max_order_size
+        self.max_order_notional = max_order_notional
+        self.max_market_exposure = max_market_exposure
+        self.max_event_exposure = max_event_exposure
+        self.max_side_exposure = max_side_exposure
+        self.max_orders_per_second = max_orders_per_second
+        self.order_burst = order_burst
+        self.max_orders_per_day = max_orders_per_day
+        self.max_daily_loss = max_daily_loss
+        self.kill_switch = kill_switch
+
+    @classmethod
+    def from_env(cls) -> "RiskLimits":
+        """`RISK_<FIELD>` variables, e.g. RISK_MAX_MARKET_EXPOSURE=250."""
+        limits = cls()
+        for name in cls.__slots__:
+            value = os.getenv("RISK_" + name.upper())
+            if value in (None, ""):
+                continue
+            if name == "kill_switch":
+                value = value.lower() in ("1", "true", "yes")
+            elif name in ("order_burst", "max_orders_per_day"):
+                value = int(value)
+            else:
+                value = float(value)
+            setattr(limits, name, value)
+        return limits
+
+    def dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RiskEngine:
+    """
+    Stateful pre-trade checks, run on every order before it is signed.
+
+    `check()` reserves the order's notional against running totals per
+    market, event and order side, so the decision is a handful of dict
+    lookups however many orders are live. Reservations are given back with
+    `release()` when a post fails or a resting order is cancelled, and
+    fills feed `on_fill()` for realized PnL. Orders that would only shrink
+    a market or event exposure are never blocked by its limit.
+
+    Tokens map to their market (condition id) and event through
+    `register()`; unregistered tokens count as a market of their own.
+    Every decision and state change is kept in `audit` and, with
+    `audit_path`, appended to that file as JSON lines until `close()` (or
+    the end of a `with` block).
+    """
+
+    def __init__(
+        self,
+        limits: RiskLimits = None,
+        audit_path: str = None,
+        audit_size: int = 10_000,
+    ) -> None:
+        self.limits = limits or RiskLimits()
+        self.rate = RateLimiter(
+            self.limits.max_orders_per_second, self.limits.order_burst
+        )
+        self.markets: "dict[str, tuple]" = {}
+        self.market_exposure: "dict[str, float]" = {}
+        self.event_exposure: "dict[str, float]" = {}
+        self.side_exposure: "dict[str, float]" = {"BUY": 0.0, "SELL": 0.0}
+        self.holdings: "dict[str, list]" = {}  # token -> [shares, cost]
+        self.day = self.today()
+        self.daily_pnl = 0.0
+        self.orders_today = 0
+        self.rejected = 0
+        self.halted = None  # reason, while the kill switch is on
+        self.audit = deque(maxlen=audit_size)
+        self.audit_file = open(audit_path, "a", buffering=1) if audit_path else None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def today() -> int:
+        return int(time.time() // 86400)
+
+    def register(self, token_id: str, market: str = None, event: str = None) -> None:
+        self.markets[str(token_id)] = (str(market or token_id), event and str(event))
+
+    # --- pre-trade ---
+
+    def check(
+        self, token_id: str, price: float, size: float, side: str = "BUY"
+    ) -> None:
+        """Reserve the order or raise `RiskRejected`."""
+        with self.lock:
+            self._roll()
+            self._admit(str(token_id), float(price), float(size), side)
+
+    def check_all(self, legs: list) -> None:
+        """All legs are reserved together, or none of them."""
+        with self.lock:
+            self._roll()
+            done = []
+            try:
+                for leg in legs:
+                    self._admit(str(leg.token_id), leg.price, leg.size, leg.side)
+                    done.append(leg)
+            except RiskRejected:
+                for leg in done:
+                    self._reserve(str(leg.token_id), leg.price, leg.size, leg.side, -1)
+                self.orders_today -= len(done)
+                raise
+
+    def cap_notional(self, amount: float) -> float:
+        """Clamp a USDC amount (e.g. one sized by the LLM) to the order limit."""
+        amount = float(amount)
+        if not math.isfinite(amount) or amount <= 0:
+            raise RiskRejected(f"invalid order amount {amount}")
+        limit = self.limits.max_order_notional
+        if limit is not None and amount > limit:
+            with self.lock:
+                self._log("cap", amount=amount, capped=limit)
+            return limit
+        return amount
+
+    # --- post-trade ---
+
+    def release(
+        self, token_id: str, price: float, size: float, side: str = "BUY"
+    ) -> None:
+        """Give back the reservation of an order that did not (fully) trade."""
+        if size <= 0:
+            return
+        with self.lock:
+            self._reserve(str(token_id), float(price), float(size), side, -1)
+            self._log("release", token_id=token_id, side=side, price=price, size=size)
+
+    def release_all(self, legs: list) -> None:
+        for leg in legs:
+            self.release(leg.token_id, leg.price, leg.size, leg.side)
+
+    def on_fill(self, token_id: str, side: str, price: float, size: float) -> None:
+        """Average-cost position keeping; sells realize PnL."""
+        with self.lock:
+            self._roll()
+            holding = self.holdings.setdefault(str(token_id), [0.0, 0.0])
+            if side == "BUY":
+                holding[0] += size
+                holding[1] += price * size
+                return
+            sold = min(size, holding[0])
+            if sold <= 0:
+                return
+            cost = holding[1] * sold / holding[0]
+            holding[0] -= sold
+            holding[1] -= cost
+            self._pnl(price * sold - cost)
+
+    def record_pnl(self, pnl: float) -> None:
+        """PnL realized outside the order book, e.g. redemptions."""
+        with self.lock:
+            self._roll()
+            self._pnl(pnl)
+
+    # --- kill switch ---
+
+    def halt(self, reason: str = "manual") -> None:
+        with self.lock:
+            self.halted = reason
+            self._log("halt", reason=reason)
+
+    def resume(self) -> None:
+        with self.lock:
+            self.halted = None
+            self._log("resume")
+
+    def close(self) -> None:
+        with self.lock:
+            if self.audit_file is not None:
+                self.audit_file.close()
+                self.audit_file = None
+
+    def __enter__(self) -> "RiskEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "limits": self.limits.dict(),
+                "halted": self.halted,
+                "daily_pnl": self.daily_pnl,
+                "orders_today": self.orders_today,
+                "rejected": self.rejected,
+                "market_exposure": dict(self.market_exposure),
+                "event_exposure": dict(self.event_exposure),
+                "side_exposure": dict(self.side_exposure),
+            }
+
+    # --- internals, called with the lock held ---
+
+    def _admit(self, token_id: str, price: float, size: float, side: str) -> None:
+        reason = self._reason(token_id, price, size, side)
+        if reason is None and not self.rate.try_acquire():
+            reason = f"order rate above {self.limits.max_orders_per_second}/s"
+        if reason is not None:
+            self.rejected += 1
+            self._log(
+                "reject",
+                token_id=token_id,
+                side=side,
+                price=price,
+                size=size,
+                reason=reason,
+            )
+            raise RiskRejected(reason)
+        self._reserve(token_id, price, size, side, 1)
+        self.orders_today += 1
+        self._log("accept", token_id=token_id, side=side, price=price, size=size)
+
+    def _reason(self, token_id: str, price: float, size: float, side: str):
+        limits = self.limits
+        if self.halted is not None:
+            return f"kill switch: {self.halted}"
+        if side not in ("BUY", "SELL"):
+            return f"unknown side {side!r}"
+        if not (0 < price < 1) or not (size > 0) or not math.isfinite(size):
+            return f"invalid order {size} @ {price}"
+        notional = price * size
+        if limits.max_order_size is not None and size > limits.max_order_size:
+            return f"size {size:g} > {limits.max_order_size:g}"
+        if (
+            limits.max_order_notional is not None
+            and notional > limits.max_order_notional
+        ):
+            return f"notional {notional:.2f} > {limits.max_order_notional:g}"
+        if (
+            limits.max_orders_per_day is not None
+            and self.orders_today >= limits.max_orders_per_day
+        ):
+            return f"{self.orders_today} orders today >= {limits.max_orders_per_day}"
+        if (
+            limits.max_daily_loss is not None
+            and self.daily_pnl <= -limits.max_daily_loss
+        ):
+            return f"daily pnl {self.daily_pnl:.2f} <= -{limits.max_daily_loss:g}"
+        side_exposure = self.side_exposure[side] + notional
+        if (
+            limits.max_side_exposure is not None
+            and side_exposure > limits.max_side_exposure
+        ):
+            return f"{side} exposure {side_exposure:.2f} > {limits.max_side_exposure:g}"
+        signed = notional if side == "BUY" else -notional
+        market, event = self.markets.get(token_id, (token_id, None))
+        if exceeds(
+            self.market_exposure.get(market, 0.0), signed, limits.max_market_exposure
+        ):
+            return f"market {market} exposure above {limits.max_market_exposure:g}"
+        if event is not None and exceeds(
+            self.event_exposure.get(event, 0.0), signed, limits.max_event_exposure
+        ):
+            return f"event {event} exposure above {limits.max_event_exposure:g}"
+        return None
+
+    def _reserve(self, token_id, price, size, side, sign: int) -> None:
+        notional = price * size
+        signed = sign * (notional if side == "BUY" else -notional)
+        market, event = self.markets.get(token_id, (token_id, None))
+        self.market_exposure[market] = self.market_exposure.get(market, 0.0) + signed
+        if event is not None:
+            self.event_exposure[event] = self.event_exposure.get(event, 0.0) + signed
+        self.side_exposure[side] = self.side_exposure.get(side, 0.0) + sign * notional
+
+    def _pnl(self, pnl: float) -> None:
+        self.daily_pnl += pnl
+        limit = self.limits.max_daily_loss
+        if (
+            limit is not None
+            and self.limits.kill_switch
+            and self.halted is None
+            and self.daily_pnl <= -limit
+        ):
+            self.halted = f"daily loss {self.daily_pnl:.2f}"
+            self._log("halt", reason=self.halted)
+
+    def _roll(self) -> None:
+        day = self.today()
+        if day != self.day:
+            self._log("roll", daily_pnl=self.daily_pnl, orders=self.orders_today)
+            self.day = day
+            self.daily_pnl = 0.0
+            self.orders_today = 0
+
+    def _log(self, action: str, **fields) -> None:
+        fields["ts"] = time.time()
+        fields["action"] = action
+        self.audit.append(fields)
+        if self.audit_file is not None:
+            self.audit_file.write(json.dumps(fields) + "\n")
+
+
+def exceeds(current: float, change: float, limit: float) -> bool:
+    """Over `limit` after the change, unless the change reduces the exposure."""
+    if limit is None:
+        return False
+    after = abs(current + change)
+    return after > limit and after > abs(current)
@@ -0,0 +1,232 @@
+import time
+
+from py_clob_client.clob_types import OrderType
+
+from agents.utils.objects import OrderLeg, OrderResult
+
+# CLOB order sizes are in hundredths of a share
+SIZE_DECIMALS = 2
+
+
+def book_levels(levels, side: str) -> "list[tuple[float, float]]":
+    """Levels to take from, best first: asks for a BUY, bids for a SELL."""
+    parsed = [(float(l.price), float(l.size)) for l in levels or []]
+    return sorted(parsed, reverse=side != "BUY")
+
+
+class FillEstimate:
+    """
+    Expected result of taking liquidity for `amount`: USDC for a BUY,
+    shares for a SELL (the same units as `MarketOrderArgs.amount`).
+    `fills` holds the `(price, shares)` taken at each level.
+    """
+
+    __slots__ = ("side", "amount", "fills", "shares", "notional", "best_price")
+
+    def __init__(self, side: str, amount: float, fills: list, best_price: float):
+        self.side = side
+        self.amount = amount
+        self.fills = fills
+        self.shares = sum(s for _, s in fills)
+        self.notional = sum(p * s for p, s in fills)
+        self.best_price = best_price
+
+    @property
+    def avg_price(self) -> float:
+        return self.notional / self.shares if self.shares else float("nan")
+
+    @property
+    def complete(self) -> bool:
+        filled = self.notional if self.side == "BUY" else self.shares
+        # sizes are rounded to the share tick, so allow one tick of shortfall
+        return filled >= self.amount - 10**-SIZE_DECIMALS
+
+    @property
+    def slippage_bps(self) -> float:
+        return slippage_bps(self.side, self.best_price, self.avg_price)
+
+    def __repr__(self) -> str:
+        return (
+            f"FillEstimate({self.side} {self.shares:.2f} @ {self.avg_price:.4f}, "
+            f"best {self.best_price}, {self.slippage_bps:.1f}bps, "
+            f"{len(self.fills)} levels)"
+        )
+
+
+def slippage_bps(side: str, best_price: float, avg_price: float) -> float:
+    """Cost versus the touch, positive when worse, in basis points."""
+    if not best_price:
+        return float("nan")
+    worse = avg_price - best_price if side == "BUY" else best_price - avg_price
+    return worse / best_price * 10_000
+
+
+def estimate_fill(
+    levels: "list[tuple[float, float]]",
+    amount: float,
+    side: str = "BUY",
+    limit_price: float = None,
+) -> FillEstimate:
+    """Walk `levels` (best first) until `amount` is filled or `limit_price` hit."""
+    fills = []
+    remaining = amount
+    for price, size in levels:
+        if remaining <= 1e-9:
+            break
+        if limit_price is not None and (
+            price > limit_price if side == "BUY" else price < limit_price
+        ):
+            break
+        take = min(size, remaining / price if side == "BUY" else remaining)
+        take = round(take, SIZE_DECIMALS)
+        if take <= 0:
+            break
+        fills.append((price, take))
+        remaining -= take * price if side == "BUY" else take
+    best = levels[0][0] if levels else float("nan")
+    return FillEstimate(side, amount, fills, best)
+
+
+def fold_small(sizes: "list[float]", min_size: float) -> "list[float]":
+    """Drop empty sizes and merge a trailing one below `min_size` into the one before."""
+    sizes = [size for size in sizes if size > 1e-9]
+    if len(sizes) > 1 and sizes[-1] < min_size - 1e-9:
+        tail = sizes.pop()
+        sizes[-1] = round(sizes[-1] + tail, SIZE_DECIMALS)
+    return sizes
+
+
+class ChildOrder:
+    __slots__ = ("leg", "slice", "order", "result")
+
+    def __init__(self, leg: OrderLeg, slice: int) -> None:
+        self.leg = leg
+        self.slice = slice
+        self.order = None
+        self.result: "OrderResult | None" = None
+
+
+class ExecutionPlan:
+    __slots__ = ("token_id", "side", "estimate", "children", "interval")
+
+    def __init__(self, token_id, side, estimate, children, interval) -> None:
+        self.token_id = token_id
+        self.side = side
+        self.estimate = estimate
+        self.children = children
+        self.interval = interval
+
+    @property
+    def slices(self) -> "list[list[ChildOrder]]":
+        grouped: "dict[int, list]" = {}
+        for child in self.children:
+            grouped.setdefault(child.slice, []).append(child)
+        return [grouped[i] for i in sorted(grouped)]
+
+
+class SmartOrderRouter:
+    """
+    Slices a parent order against the live L2 book.
+
+    `plan()` reads the book, estimates the fill and slippage for the amount,
+    and splits it into child limit orders at the book's price levels,
+    spread over `slices` time slices (TWAP) and capped at `display_size`
+    shares each (iceberg). All children are signed in parallel up front.
+    `execute()` posts one slice at a time as fill-and-kill orders, so a
+    level that has moved away is skipped rather than left resting, and
+    returns a report of expected versus realized price and slippage.
+    """
+
+    def __init__(self, polymarket, max_slippage_bps: float = None) -> None:
+        self.polymarket = polymarket
+        self.max_slippage_bps = max_slippage_bps
+
+    def plan(
+        self,
+        token_id: str,
+        amount: float,
+        side: str = "BUY",
+        slices: int = 1,
+        interval: float = 0.0,
+        display_size: float = None,
+        limit_price: float = None,
+    ) -> ExecutionPlan:
+        book = self.polymarket.get_orderbook(token_id)
+        levels = book_levels(book.asks if side == "BUY" else book.bids, side)
+        estimate = estimate_fill(levels, amount, side, limit_price)
+        if (
+            self.max_slippage_bps is not None
+            and estimate.slippage_bps > self.max_slippage_bps
+        ):
+            raise ValueError(
+                f"expected slippage {estimate.slippage_bps:.1f}bps exceeds "
+                f"{self.max_slippage_bps}bps: {estimate}"
+            )
+
+        # children below the market's minimum size would be rejected
+        min_size = float(getattr(book, "min_order_size", None) or 0)
+        display = max(display_size or 0, min_size) or None
+        children = []
+        for price, shares in estimate.fills:
+            if shares < min_size - 1e-9:
+                # too thin to carry even one order the CLOB accepts
+                continue
+            n = slices if not min_size else max(1, min(slices, int(shares // min_size)))
+            per_slice = round(shares / n, SIZE_DECIMALS)
+            # the last slice takes the rounding remainder
+            sizes = [per_slice] * (n - 1) + [round(shares - per_slice * (n - 1), 2)]
+            for i, size in enumerate(fold_small(sizes, min_size)):
+                pieces = [display] * int(size // display) if display else []
+                pieces.append(round(size - sum(pieces), SIZE_DECIMALS))
+                for piece in fold_small(pieces, min_size):
+                    leg = OrderLeg(
+                        token_id=token_id, price=price, size=piece, side=side
+                    )
+                    children.append(ChildOrder(leg, i))
+
+        orders = self.polymarket.batch.sign_all([c.leg for c in children])
+        for child, order in zip(children, orders):
+            child.order = order
+        return ExecutionPlan(token_id, side, estimate, children, interval)
+
+    def execute(self, plan: ExecutionPlan, sleep=time.sleep) -> dict:
+        start = time.perf_counter()
+        for i, children in enumerate(plan.slices):
+            if i and plan.interval:
+                sleep(plan.interval)
+            results = self.polymarket.batch.post_signed(
+                [c.leg for c in children],
+                [c.order for c in children],
+                OrderType.FAK,
+            )
+            for child, result in zip(children, results):
+                child.result = result
+            self.polymarket.orders.track_results(results)
+        return self.report(plan, time.perf_counter() - start)
+
+    def report(self, plan: ExecutionPlan, elapsed: float) -> dict:
+        results = [c.result for c in plan.children if c.result is not None]
+        shares = sum(r.filled_size for r in results)
+        notional = sum(r.filled_notional for r in results)
+        realized = notional / shares if shares else float("nan")
+        estimate = plan.estimate
+        return {
+            "token_id": plan.token_id,
+            "side": plan.side,
+            "children": len(plan.children),
+            "rejected": sum(1 for r in results if not r.success),
+            "expected_shares": estimate.shares,
+            "expected_price": estimate.avg_price,
+            "expected_slippage_bps": estimate.slippage_bps,
+            "filled_shares": shares,
+            "filled_notional": notional,
+            "realized_price": realized,
+            "realized_slippage_bps": slippage_bps(
+                plan.side, estimate.best_price, realized
+            ),
+            "max_child_latency_ms": max((r.latency_ms for r in results), default=0.0),
+            "elapsed_s": elapsed,
+        }
+
+    def route(self, token_id: str, amount: float, side: str = "BUY", **kwargs) -> dict:
+        return self.execute(self.plan(token_id, amount, side, **kwargs))
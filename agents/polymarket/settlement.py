@@ -0,0 +1,163 @@
+import httpx
+
+from agents.polymarket.multicall import Call
+from agents.polymarket.polymarket import contract_transaction
+
+DATA_API = "https://data-api.polymarket.com"
+
+
+class SettlementAction:
+    """A redeem or merge for one condition; `amount` is in raw 1e6 units."""
+
+    __slots__ = ("kind", "condition_id", "neg_risk", "amounts")
+
+    def __init__(
+        self, kind: str, condition_id: str, neg_risk: bool, amounts: "list[int]"
+    ) -> None:
+        self.kind = kind
+        self.condition_id = condition_id
+        self.neg_risk = neg_risk
+        self.amounts = amounts
+
+    def __repr__(self) -> str:
+        return (
+            f"SettlementAction({self.kind}, {self.condition_id}, "
+            f"neg_risk={self.neg_risk}, amounts={self.amounts})"
+        )
+
+
+def condition_bytes(condition_id: str) -> bytes:
+    return bytes.fromhex(condition_id.removeprefix("0x"))
+
+
+class SettlementEngine:
+    """
+    Frees capital held in CTF positions.
+
+    `scan()` takes the wallet's positions from the data API, then checks
+    every condition's `payoutDenominator` and every token balance on chain
+    in one multicall. Resolved conditions with a balance are redeemed;
+    unresolved ones holding both outcomes are merged back to USDC for the
+    overlapping amount. `settle()` sends all of it as one pipelined
+    transaction sequence, so it normally lands in a single block.
+    """
+
+    def __init__(self, polymarket, data_api: str = DATA_API, min_merge: float = 1.0):
+        self.polymarket = polymarket
+        self.data_api = data_api
+        self.min_merge = int(min_merge * 1e6)
+        self.http = httpx.Client(timeout=30.0)
+
+    def fetch_positions(self, page_size: int = 500) -> "list[dict]":
+        owner = self.polymarket.get_address_for_private_key()
+        positions, offset = [], 0
+        while True:
+            response = self.http.get(
+                f"{self.data_api}/positions",
+                params={
+                    "user": owner,
+                    "limit": page_size,
+                    "offset": offset,
+                    "sizeThreshold": 0,
+                },
+            )
+            response.raise_for_status()
+            page = response.json()
+            positions.extend(page)
+            if len(page) < page_size:
+                return positions
+            offset += page_size
+
+    def scan(self, positions: "list[dict]" = None) -> "list[SettlementAction]":
+        if positions is None:
+            positions = self.fetch_positions()
+        owner = self.polymarket.get_address_for_private_key()
+        ctf = self.polymarket.ctf_address
+
+        conditions: "dict[str, dict]" = {}
+        for p in positions:
+            condition = conditions.setdefault(
+                p["conditionId"],
+                {"neg_risk": bool(p.get("negativeRisk")), "tokens": [None, None]},
+            )
+            condition["tokens"][int(p.get("outcomeIndex", 0))] = p["asset"]
+
+        calls = {}
+        for condition_id, condition in conditions.items():
+            calls[(condition_id, "resolved")] = Call(
+                ctf, "payoutDenominator(bytes32)", [condition_bytes(condition_id)]
+            )
+            for i, token_id in enumerate(condition["tokens"]):
+                if token_id is not None:
+                    calls[(condition_id, i)] = Call(
+                        ctf, "balanceOf(address,uint256)", [owner, int(token_id)]
+                    )
+        values = self.polymarket.multicall.call_named(calls)
+
+        actions = []
+        for condition_id, condition in conditions.items():
+            balances = [values.get((condition_id, i)) or 0 for i in (0, 1)]
+            if not any(balances):
+                continue
+            if values.get((condition_id, "resolved")):
+                actions.append(
+                    SettlementAction(
+                        "redeem", condition_id, condition["neg_risk"], balances
+                    )
+                )
+            elif min(balances) >= self.min_merge:
+                actions.append(
+                    SettlementAction(
+                        "merge", condition_id, condition["neg_risk"], [min(balances)]
+                    )
+                )
+        return actions
+
+    def transaction(self, action: SettlementAction) -> dict:
+        pm = self.polymarket
+        condition = condition_bytes(action.condition_id)
+        if action.neg_risk:
+            # neg-risk positions are wrapped collateral, settled by the adapter
+            if action.kind == "redeem":
+                return contract_transaction(
+                    pm.neg_risk_adapter_address,
+                    "redeemPositions(bytes32,uint256[])",
+                    condition,
+                    action.amounts,
+                )
+            return contract_transaction(
+                pm.neg_risk_adapter_address,
+                "mergePositions(bytes32,uint256)",
+                condition,
+                action.amounts[0],
+            )
+        if action.kind == "redeem":
+            return contract_transaction(
+                pm.ctf_address,
+                "redeemPositions(address,bytes32,bytes32,uint256[])",
+                pm.usdc_address,
+                bytes(32),
+                condition,
+                [1, 2],
+            )
+        return contract_transaction(
+            pm.ctf_address,
+            "mergePositions(address,bytes32,bytes32,uint256[],uint256)",
+            pm.usdc_address,
+            bytes(32),
+            condition,
+            [1, 2],
+            action.amounts[0],
+        )
+
+    def settle(self, actions: "list[SettlementAction]") -> "list[dict]":
+        if not actions:
+            return []
+        return self.polymarket.send_transactions([self.transaction(a) for a in actions])
+
+    def run(self) -> "list[SettlementAction]":
+        actions = self.scan()
+        for action in actions:
+            print(f"SETTLING {action}")
+        self.settle(actions)
+        return actions
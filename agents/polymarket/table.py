@@ -0,0 +1,165 @@
+import numpy as np
+
+# Gamma /markets fields held as typed columns; everything else stays in the
+# raw row and is only looked at when a row is materialized.
+FLOAT_COLUMNS = (
+    "liquidityNum",
+    "volumeNum",
+    "volume24hr",
+    "spread",
+    "bestBid",
+    "bestAsk",
+    "lastTradePrice",
+    "orderPriceMinTickSize",
+    "orderMinSize",
+    "rewardsMinSize",
+    "rewardsMaxSpread",
+    "competitive",
+)
+BOOL_COLUMNS = (
+    "active",
+    "closed",
+    "archived",
+    "restricted",
+    "funded",
+    "enableOrderBook",
+    "acceptingOrders",
+    "negRisk",
+)
+STRING_COLUMNS = ("question", "conditionId", "slug", "endDate")
+# low-cardinality strings, stored as int32 codes into a category list
+DICTIONARY_COLUMNS = ("category", "resolutionSource", "groupItemTitle")
+
+
+def float_column(rows: "list[dict]", key: str) -> np.ndarray:
+    values = [row.get(key) for row in rows]
+    try:
+        # fast path: all numbers / numeric strings, None becomes NaN
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        out = np.full(len(values), np.nan)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                pass
+        return out
+
+
+def dictionary_column(rows: "list[dict]", key: str):
+    index = {}
+    codes = np.fromiter(
+        (index.setdefault(row.get(key), len(index)) for row in rows),
+        dtype=np.int32,
+        count=len(rows),
+    )
+    return codes, list(index)
+
+
+class MarketTable:
+    """
+    Columnar view over a Gamma `/markets` response.
+
+    Numeric and boolean fields are NumPy arrays (missing floats are NaN,
+    missing booleans are False), free-text fields are object arrays and
+    low-cardinality fields are dictionary encoded. `filter`, `sort` and
+    `top_k` are vectorized and return new tables sharing the raw rows;
+    `market(i)` builds the pydantic `Market` only for the rows that are used.
+    """
+
+    def __init__(
+        self, rows: "list[dict]", index: np.ndarray, columns: dict, categories: dict
+    ):
+        self.rows = rows
+        self.index = index
+        self.columns = columns
+        self.categories = categories
+
+    @classmethod
+    def from_records(cls, rows: "list[dict]") -> "MarketTable":
+        columns = {"id": float_column(rows, "id").astype(np.int64)}
+        for key in FLOAT_COLUMNS:
+            columns[key] = float_column(rows, key)
+        for key in BOOL_COLUMNS:
+            columns[key] = np.fromiter(
+                (row.get(key) is True for row in rows), dtype=bool, count=len(rows)
+            )
+        for key in STRING_COLUMNS:
+            column = np.empty(len(rows), dtype=object)
+            column[:] = [row.get(key) for row in rows]
+            columns[key] = column
+        categories = {}
+        for key in DICTIONARY_COLUMNS:
+            columns[key], categories[key] = dictionary_column(rows, key)
+        return cls(rows, np.arange(len(rows)), columns, categories)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self.categories:
+            values = np.empty(len(self.categories[name]), dtype=object)
+            values[:] = self.categories[name]
+            return values[self.columns[name]]
+        return self.columns[name]
+
+    def take(self, positions) -> "MarketTable":
+        positions = np.asarray(positions, dtype=np.intp)
+        return MarketTable(
+            self.rows,
+            self.index[positions],
+            {name: column[positions] for name, column in self.columns.items()},
+            self.categories,
+        )
+
+    def filter(self, mask: np.ndarray) -> "MarketTable":
+        return self.take(np.flatnonzero(mask))
+
+    def where(self, **equals) -> "MarketTable":
+        """`table.where(active=True, category="Politics")`"""
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in equals.items():
+            if name in self.categories:
+                try:
+                    code = self.categories[name].index(value)
+                except ValueError:
+                    return self.take([])
+                mask &= self.columns[name] == code
+            else:
+                mask &= self.columns[name] == value
+        return self.filter(mask)
+
+    def tradeable(self) -> "MarketTable":
+        return self.filter(self.columns["active"])
+
+    def sort(self, by: str, descending: bool = False) -> "MarketTable":
+        """Stable sort on a numeric column; NaN rows go last either way."""
+        values = self.columns[by]
+        key = -values if descending else values
+        return self.take(np.argsort(key, kind="stable"))
+
+    def top_k(self, by: str, k: int, descending: bool = True) -> "MarketTable":
+        values = self.columns[by]
+        key = -values if descending else values
+        if k >= len(self):
+            return self.take(np.argsort(key, kind="stable"))
+        candidates = np.argpartition(key, k)[:k]
+        return self.take(candidates[np.argsort(key[candidates], kind="stable")])
+
+    def head(self, n: int) -> "MarketTable":
+        return self.take(np.arange(min(n, len(self))))
+
+    def raw(self, i: int) -> dict:
+        return self.rows[self.index[i]]
+
+    def market(self, i: int):
+        from agents.polymarket.gamma import GammaMarketClient
+
+        row = dict(self.raw(i))
+        # parsing replaces nested dicts in place; keep the raw rows reusable
+        if "events" in row:
+            row["events"] = [dict(e) for e in row["events"]]
+        return GammaMarketClient().parse_pydantic_market(row)
+
+    def markets(self) -> list:
+        return [self.market(i) for i in range(len(self))]
@@ -0,0 +1,218 @@
+import sys
+from array import array
+
+from agents.utils.records import Field, Record, json_floats, json_list
+
+
+def optional(convert):
+    def wrapper(value):
+        return None if value is None else convert(value)
+
+    return wrapper
+
+
+def intern(value):
+    return None if value is None else sys.intern(str(value))
+
+
+def intern_list(value) -> tuple:
+    return tuple(sys.intern(v) for v in json_list(value))
+
+
+def tag_labels(tags: list) -> tuple:
+    return tuple(sys.intern(t["label"]) for t in tags or () if t.get("label"))
+
+
+def market_ids(markets: list) -> tuple:
+    return tuple(int(m["id"]) for m in markets or ())
+
+
+def first_event_id(events: list):
+    return int(events[0]["id"]) if events else None
+
+
+class TextArena:
+    """
+    Append-only UTF-8 buffer for long texts. Identical texts are stored once
+    and every record keeps a single int reference instead of its own string.
+    """
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.offsets = array("Q", [0])
+        self.by_hash: "dict[int, int]" = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def add(self, text: str) -> int:
+        if text is None:
+            return -1
+        encoded = text.encode()
+        key = hash(encoded)
+        ref = self.by_hash.get(key)
+        if ref is not None and self.get_bytes(ref) == encoded:
+            return ref
+        self.data += encoded
+        self.offsets.append(len(self.data))
+        ref = len(self.offsets) - 2
+        self.by_hash.setdefault(key, ref)
+        return ref
+
+    def get_bytes(self, ref: int) -> bytes:
+        return bytes(self.data[self.offsets[ref] : self.offsets[ref + 1]])
+
+    def get(self, ref: int) -> str:
+        return None if ref < 0 else self.get_bytes(ref).decode()
+
+
+class CompactMarket(Record):
+    """Gamma market with interned strings; description lives in the arena."""
+
+    __slots__ = (
+        "id",
+        "question",
+        "slug",
+        "conditionId",
+        "endDate",
+        "category",
+        "resolutionSource",
+        "active",
+        "closed",
+        "archived",
+        "restricted",
+        "enableOrderBook",
+        "negRisk",
+        "liquidity",
+        "volume",
+        "volume24hr",
+        "spread",
+        "outcomes",
+        "outcome_prices",
+        "clob_token_ids",
+        "event_id",
+        "description_ref",
+    )
+    FIELDS = (
+        Field("id", convert=int),
+        Field("question", convert=intern, default=None),
+        Field("slug", convert=intern, default=None),
+        Field("conditionId", convert=intern, default=None),
+        Field("endDate", convert=intern, default=None),
+        Field("category", convert=intern, default=None),
+        Field("resolutionSource", convert=intern, default=None),
+        Field("active", default=None),
+        Field("closed", default=None),
+        Field("archived", default=None),
+        Field("restricted", default=None),
+        Field("enableOrderBook", default=None),
+        Field("negRisk", default=None),
+        Field("liquidity", "liquidityNum", optional(float), None),
+        Field("volume", "volumeNum", optional(float), None),
+        Field("volume24hr", convert=optional(float), default=None),
+        Field("spread", convert=optional(float), default=None),
+        Field("outcomes", convert=optional(intern_list), default=()),
+        Field("outcome_prices", "outcomePrices", optional(json_floats), ()),
+        Field("clob_token_ids", "clobTokenIds", optional(intern_list), ()),
+        Field("event_id", "events", first_event_id, None),
+    )
+
+
+class CompactEvent(Record):
+    """Gamma event with interned strings, tag labels and child market ids."""
+
+    __slots__ = (
+        "id",
+        "ticker",
+        "slug",
+        "title",
+        "category",
+        "endDate",
+        "active",
+        "closed",
+        "archived",
+        "restricted",
+        "liquidity",
+        "volume",
+        "tags",
+        "market_ids",
+        "description_ref",
+    )
+    FIELDS = (
+        Field("id", convert=int),
+        Field("ticker", convert=intern, default=None),
+        Field("slug", convert=intern, default=None),
+        Field("title", convert=intern, default=None),
+        Field("category", convert=intern, default=None),
+        Field("endDate", convert=intern, default=None),
+        Field("active", default=None),
+        Field("closed", default=None),
+        Field("archived", default=None),
+        Field("restricted", default=None),
+        Field("liquidity", convert=optional(float), default=None),
+        Field("volume", convert=optional(float), default=None),
+        Field("tags", convert=tag_labels, default=()),
+        Field("market_ids", "markets", market_ids, ()),
+    )
+
+
+class UniverseCache:
+    """
+    In-memory cache of the active Gamma universe for long-running agents.
+
+    Repeated strings (slugs, categories, tag labels, outcomes, resolution
+    sources) are interned, records are `__slots__` objects and descriptions
+    are deduplicated into one TextArena. Markets nested in `/events` rows are
+    cached too.
+    """
+
+    def __init__(self) -> None:
+        self.arena = TextArena()
+        self.markets: "dict[int, CompactMarket]" = {}
+        self.events: "dict[int, CompactEvent]" = {}
+
+    def __len__(self) -> int:
+        return len(self.markets) + len(self.events)
+
+    def add_market(self, row: dict, event_id: int = None) -> CompactMarket:
+        market = CompactMarket.from_api(row)
+        if market.event_id is None:
+            market.event_id = event_id
+        market.description_ref = self.arena.add(row.get("description"))
+        self.markets[market.id] = market
+        return market
+
+    def add_event(self, row: dict) -> CompactEvent:
+        event = CompactEvent.from_api(row)
+        event.description_ref = self.arena.add(row.get("description"))
+        self.events[event.id] = event
+        for market in row.get("markets") or ():
+            self.add_market(market, event.id)
+        return event
+
+    def load_markets(self, rows: "list[dict]") -> int:
+        count = 0
+        for row in rows:
+            try:
+                self.add_market(row)
+                count += 1
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"[UniverseCache] skipping market {row.get('id')}: {e!r}")
+        return count
+
+    def load_events(self, rows: "list[dict]") -> int:
+        count = 0
+        for row in rows:
+            try:
+                self.add_event(row)
+                count += 1
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"[UniverseCache] skipping event {row.get('id')}: {e!r}")
+        return count
+
+    def description(self, record) -> str:
+        return self.arena.get(record.description_ref)
+
+    def event_markets(self, event_id: int) -> "list[CompactMarket]":
+        event = self.events[event_id]
+        return [self.markets[i] for i in event.market_ids if i in self.markets]
@@ -0,0 +1,142 @@
+from collections import Counter
+
+from agents.utils.records import json_list
+
+
+def number(digits: int = 0):
+    def format(value) -> str:
+        value = round(float(value), digits)
+        if digits == 0:
+            return str(int(value))
+        return f"{value:.{digits}f}".rstrip("0").rstrip(".")
+
+    return format
+
+
+def text(max_chars: int = None):
+    def format(value) -> str:
+        value = " ".join(str(value).split())
+        if max_chars is not None and len(value) > max_chars:
+            value = value[: max_chars - 1] + "…"
+        return value
+
+    return format
+
+
+def date(value) -> str:
+    return str(value)[:10]
+
+
+def values(digits: int = None):
+    """JSON-encoded or plain lists, e.g. outcomes / outcomePrices, as `a/b`."""
+
+    def format(value) -> str:
+        items = json_list(value)
+        if digits is not None:
+            items = [number(digits)(v) for v in items]
+        return "/".join(items)
+
+    return format
+
+
+def ids(value) -> str:
+    return ",".join(str(v["id"]) for v in value)
+
+
+class Column:
+    """A projected field: output name, source key and a cell formatter."""
+
+    __slots__ = ("name", "key", "format")
+
+    def __init__(self, name: str, key: str = None, format=None) -> None:
+        self.name = name
+        self.key = key or name
+        self.format = format or text()
+
+
+EVENT_COLUMNS = (
+    Column("id"),
+    Column("title"),
+    Column("end", "endDate", date),
+    Column("liquidity", format=number(0)),
+    Column("volume", format=number(0)),
+    Column("markets", format=ids),
+    Column("description", format=text(400)),
+)
+MARKET_COLUMNS = (
+    Column("id"),
+    Column("question"),
+    Column("outcomes", format=values()),
+    Column("prices", "outcomePrices", values(3)),
+    # token ids let the model call the orderbook / price / history tools
+    Column("tokens", "clobTokenIds", values()),
+    Column("bid", "bestBid", number(3)),
+    Column("ask", "bestAsk", number(3)),
+    Column("spread", format=number(3)),
+    Column("end", "endDate", date),
+    Column("liquidity", format=number(0)),
+    Column("volume", format=number(0)),
+    Column("description", format=text(400)),
+)
+
+
+def cells(record: dict, columns: "tuple[Column, ...]") -> "list[str]":
+    row = []
+    for column in columns:
+        value = record.get(column.key)
+        if value is None or value == "":
+            row.append("")
+            continue
+        try:
+            cell = column.format(value)
+        except (TypeError, ValueError):
+            cell = text()(value)
+        row.append(cell.replace("|", "/"))
+    return row
+
+
+def row_text(record: dict, columns: "tuple[Column, ...]") -> str:
+    """One record as it appears in a table, before dictionary encoding."""
+    return "|".join(cells(record, columns))
+
+
+def compact_tables(
+    tables: "list[tuple[str, list, tuple]]", min_repeats: int = 2, min_length: int = 16
+) -> str:
+    """
+    Render `(name, records, columns)` tables as dense pipe-separated text.
+
+    Cell values of at least `min_length` characters that occur `min_repeats`
+    or more times (shared event descriptions, repeated questions) are written
+    once in a legend and referenced as `@n` in the rows.
+    """
+    rendered = [
+        (name, columns, [cells(r, columns) for r in records])
+        for name, records, columns in tables
+    ]
+    counts = Counter(
+        cell
+        for _, _, rows in rendered
+        for row in rows
+        for cell in row
+        if len(cell) >= min_length
+    )
+    legend = {}
+    for cell, count in counts.items():
+        if count >= min_repeats:
+            legend[cell] = f"@{len(legend) + 1}"
+
+    lines = []
+    if legend:
+        lines.append("repeated text:")
+        lines.extend(f"{ref}={cell}" for cell, ref in legend.items())
+    for name, columns, rows in rendered:
+        lines.append(f"{name} ({'|'.join(c.name for c in columns)}):")
+        lines.extend("|".join(legend.get(c, c) for c in row) for row in rows)
+    return "\n".join(lines)
+
+
+def compact_polymarket(events: "list[dict]", markets: "list[dict]") -> str:
+    return compact_tables(
+        [("events", events, EVENT_COLUMNS), ("markets", markets, MARKET_COLUMNS)]
+    )
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlencode
+
+import httpx
+
+from agents.utils.records import loads
+
+
+class CachedResponse:
+    """The parts of `httpx.Response` the Gamma callers use."""
+
+    __slots__ = ("status_code", "content", "from_cache")
+
+    def __init__(self, status_code: int, content: bytes, from_cache: bool) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = from_cache
+
+    def json(self):
+        return loads(self.content)
+
+
+class HTTPCache:
+    """
+    On-disk GET cache keyed by URL and query params.
+
+    Bodies are stored with their `ETag` / `Last-Modified` validators and
+    revalidated with `If-None-Match` / `If-Modified-Since`, so an unchanged
+    payload costs a 304 instead of a full download. Entries younger than
+    `max_age` seconds are served without a request.
+
+    With `stale_while_revalidate=True` a cached entry is returned immediately
+    and refreshed on a background thread (one per key at a time), so callers
+    only block when nothing is cached yet or the entry is older than
+    `max_stale` seconds (the cache is shared across processes, so it may hold
+    a payload from a previous run). If a refresh fails the cached body keeps
+    being served.
+    """
+
+    def __init__(
+        self,
+        directory: str = "./local_db_http_cache",
+        max_age: float = 0.0,
+        stale_while_revalidate: bool = False,
+        max_stale: float = None,
+        timeout: float = 30.0,
+    ) -> None:
+        self.directory = directory
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        self.client = httpx.Client(timeout=timeout)
+        self.lock = threading.Lock()
+        self.refreshing: "dict[str, threading.Thread]" = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, url: str, params: dict = None) -> str:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha1(f"{url}?{query}".encode()).hexdigest()
+
+    def _paths(self, key: str) -> "tuple[str, str]":
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def load(self, key: str):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def store(self, key: str, meta: dict, body: bytes = None) -> None:
+        meta_path, body_path = self._paths(key)
+        # write-then-rename so readers never see a half-written entry
+        if body is not None:
+            with open(body_path + ".tmp", "wb") as f:
+                f.write(body)
+            os.replace(body_path + ".tmp", body_path)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def get(self, url: str, params: dict = None) -> CachedResponse:
+        key = self.key(url, params)
+        meta, body = self.load(key)
+        if meta is not None:
+            age = time.time() - meta["fetched_at"]
+            if age < self.max_age:
+                self.hits += 1
+                return CachedResponse(200, body, True)
+            if self.stale_while_revalidate and (
+                self.max_stale is None or age < self.max_stale
+            ):
+                self.hits += 1
+                self._refresh_in_background(key, url, params, meta, body)
+                return CachedResponse(200, body, True)
+        return self._fetch(key, url, params, meta, body)
+
+    def _fetch(self, key, url, params, meta, body) -> CachedResponse:
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = self.client.get(url, params=params, headers=headers)
+        except httpx.HTTPError as e:
+            if meta is None:
+                raise
+            print(f"[HTTPCache] {url} refresh failed, serving cached body: {e}")
+            return CachedResponse(200, body, True)
+
+        if response.status_code == 304 and meta is not None:
+            self.revalidated += 1
+            meta["fetched_at"] = time.time()
+            self.store(key, meta)
+            return CachedResponse(200, body, True)
+        if response.status_code >= 500 and meta is not None:
+            print(
+                f"[HTTPCache] {url} returned {response.status_code}, serving cached body"
+            )
+            return CachedResponse(200, body, True)
+        if response.status_code == 200:
+            self.misses += 1
+            self.store(
+                key,
+                {
+                    "url": url,
+                    "params": params,
+                    "etag": response.headers.get("etag"),
+                    "last_modified": response.headers.get("last-modified"),
+                    "fetched_at": time.time(),
+                },
+                response.content,
+            )
+        return CachedResponse(response.status_code, response.content, False)
+
+    def _refresh_in_background(self, key, url, params, meta, body) -> None:
+        with self.lock:
+            if key in self.refreshing:
+                return
+
+            def refresh():
+                try:
+                    self._fetch(key, url, params, meta, body)
+                except Exception as e:
+                    print(f"[HTTPCache] background refresh of {url} failed: {e}")
+                finally:
+                    with self.lock:
+                        self.refreshing.pop(key, None)
+
+            thread = threading.Thread(target=refresh, daemon=True)
+            self.refreshing[key] = thread
+            thread.start()
+
+    def wait(self, timeout: float = None) -> None:
+        """Block until in-flight background refreshes finish."""
+        with self.lock:
+            threads = list(self.refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import time
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Whitespace-insensitive form, so re-indented prompt templates still hit."""
+    return " ".join(str(prompt).split())
+
+
+def fingerprint(data) -> str:
+    """Stable hash of the market data a response depended on."""
+    if data is None:
+        return ""
+    if hasattr(data, "dict"):
+        data = data.dict()
+    encoded = json.dumps(
+        data,
+        sort_keys=True,
+        default=lambda o: o.dict() if hasattr(o, "dict") else str(o),
+    )
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    Disk cache of LLM responses keyed by model, normalized prompt hash and a
+    fingerprint of the market data behind the prompt. Entries expire after
+    `ttl` seconds (`None` keeps them forever); `bypass=True` on a lookup
+    forces a fresh call while still storing its result.
+    """
+
+    def __init__(
+        self, directory: str = "./local_db_llm_cache", ttl: float = 3600.0
+    ) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, model: str, prompt: str, data=None) -> str:
+        digest = hashlib.sha256()
+        for part in (model, normalize_prompt(prompt), fingerprint(data)):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str, bypass: bool = False):
+        if bypass:
+            self.misses += 1
+            return None
+        try:
+            with open(self.path(key), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["response"]
+
+    def put(self, key: str, response: str, model: str = None) -> None:
+        entry = {"created_at": time.time(), "model": model, "response": response}
+        tmp = self.path(key) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self.path(key))
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
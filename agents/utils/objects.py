@@ -39,9 +39,9 @@ class SimpleMarket(BaseModel):
     rewardsMaxSpread: float
     # volume: Optional[float]
     spread: float
-    outcomes: str
-    outcome_prices: str
-    clob_token_ids: Optional[str]
+    outcomes: list[str]
+    outcome_prices: list[float]
+    clob_token_ids: Optional[list[str]]
 
 
 class ClobReward(BaseModel):
@@ -212,6 +212,43 @@ class SimpleEvent(BaseModel):
     markets: str
 
 
+class MarketPair(BaseModel):
+    kalshi_ticker: str
+    polymarket_yes_token_id: str
+    polymarket_no_token_id: str
+    question: Optional[str] = None
+
+
+class ArbitrageOpportunity(BaseModel):
+    kalshi_ticker: str
+    polymarket_token_id: str  # token bought on polymarket
+    direction: str  # "kalshi_yes_poly_no" or "kalshi_no_poly_yes"
+    kalshi_price: float
+    polymarket_price: float
+    edge: float  # per contract, after fees
+    size: float
+    estimated_profit: float
+    timestamp: float
+
+
+class OrderLeg(BaseModel):
+    token_id: str
+    price: float
+    size: float
+    side: str = "BUY"
+
+
+class OrderResult(BaseModel):
+    leg: OrderLeg
+    success: bool
+    order_id: Optional[str] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+    latency_ms: float  # from batch start (signing included) to this leg's response
+    filled_size: float = 0.0  # shares matched immediately
+    filled_notional: float = 0.0  # USDC matched immediately
+
+
 class Source(BaseModel):
     id: Optional[str]
     name: Optional[str]
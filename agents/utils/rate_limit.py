@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads or asyncio tasks: `rate` acquisitions per
+    second on average, bursts of up to `burst`. `rate=None` disables it.
+    """
+
+    def __init__(self, rate: float = None, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token now and return how long the caller must wait for it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1.0
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available now, without waiting."""
+        if self.rate is None:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens < 1.0:
+                return False
+            self.tokens -= 1.0
+            return True
+
+    def acquire(self) -> None:
+        if self.rate is None:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        if self.rate is None:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
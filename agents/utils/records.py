@@ -0,0 +1,194 @@
+import json
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+MISSING = object()
+
+
+class Field:
+    """One record attribute: source key in the API payload and a converter."""
+
+    __slots__ = ("name", "key", "convert", "default")
+
+    def __init__(self, name: str, key: str = None, convert=None, default=MISSING):
+        self.name = name
+        self.key = key or name
+        self.convert = convert
+        self.default = default
+
+
+def text(value) -> str:
+    if not isinstance(value, str):
+        raise TypeError(f"expected str, got {type(value).__name__}")
+    return value
+
+
+def flag(value) -> bool:
+    if not isinstance(value, bool):
+        raise TypeError(f"expected bool, got {type(value).__name__}")
+    return value
+
+
+def json_list(value) -> list:
+    """Gamma sends list fields as JSON-encoded strings; decode them once."""
+    if isinstance(value, str):
+        value = loads(value)
+    if not isinstance(value, list):
+        raise TypeError(f"expected list, got {type(value).__name__}")
+    return [str(v) for v in value]
+
+
+def json_floats(value) -> "list[float]":
+    return [float(v) for v in json_list(value)]
+
+
+def join_ids(markets: list) -> str:
+    return ",".join([m["id"] for m in markets])
+
+
+class Record:
+    """
+    Base for compact `__slots__` records decoded straight from API payloads.
+
+    Subclasses declare `FIELDS`; a decoder specialized to those fields is
+    generated once per class, so decoding a row is one function call with no
+    per-field dispatch and no validation beyond the converters. Records keep
+    the attribute names and `.dict()` of the pydantic models they stand in for.
+    """
+
+    __slots__ = ()
+    FIELDS: "tuple[Field, ...]" = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        names = {"cls": cls, "new": object.__new__, "MISSING": MISSING}
+        lines = ["def from_api(row):", "    o = new(cls)"]
+        for i, field in enumerate(cls.FIELDS):
+            names[f"c{i}"] = field.convert
+            names[f"d{i}"] = field.default
+            value = f"row[{field.key!r}]"
+            if field.convert is not None:
+                value = f"c{i}({value})"
+            if field.default is MISSING:
+                lines.append(f"    o.{field.name} = {value}")
+            else:
+                lines.append(f"    if {field.key!r} in row:")
+                lines.append(f"        o.{field.name} = {value}")
+                lines.append("    else:")
+                lines.append(f"        o.{field.name} = d{i}")
+        lines.append("    return o")
+        exec("\n".join(lines), names)
+        cls.from_api = staticmethod(names["from_api"])
+
+    def __init__(self, **values) -> None:
+        for field in self.FIELDS:
+            value = values.get(field.name, field.default)
+            if value is MISSING:
+                raise TypeError(f"{type(self).__name__} missing field {field.name}")
+            setattr(self, field.name, value)
+
+    def dict(self) -> dict:
+        return {field.name: getattr(self, field.name) for field in self.FIELDS}
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.dict() == other.dict()
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{k}={v!r}" for k, v in self.dict().items())
+        return f"{type(self).__name__}({values})"
+
+
+class MarketRecord(Record):
+    """Same fields as `SimpleMarket` / `Polymarket.map_api_to_market`."""
+
+    __slots__ = (
+        "id",
+        "question",
+        "end",
+        "description",
+        "active",
+        "funded",
+        "rewardsMinSize",
+        "rewardsMaxSpread",
+        "spread",
+        "outcomes",
+        "outcome_prices",
+        "clob_token_ids",
+    )
+    FIELDS = (
+        Field("id", convert=int),
+        Field("question", convert=text),
+        Field("end", "endDate", text),
+        Field("description", convert=text),
+        Field("active", convert=flag),
+        Field("funded", convert=flag),
+        Field("rewardsMinSize", convert=float),
+        Field("rewardsMaxSpread", convert=float),
+        Field("spread", convert=float),
+        Field("outcomes", convert=json_list),
+        Field("outcome_prices", "outcomePrices", json_floats),
+        Field("clob_token_ids", "clobTokenIds", json_list),
+    )
+
+
+class EventRecord(Record):
+    """Same fields as `SimpleEvent` / `Polymarket.map_api_to_event`."""
+
+    __slots__ = (
+        "id",
+        "ticker",
+        "slug",
+        "title",
+        "description",
+        "active",
+        "closed",
+        "archived",
+        "new",
+        "featured",
+        "restricted",
+        "end",
+        "markets",
+    )
+    FIELDS = (
+        Field("id", convert=int),
+        Field("ticker", convert=text),
+        Field("slug", convert=text),
+        Field("title", convert=text),
+        Field("description", convert=text, default=""),
+        Field("active", convert=flag),
+        Field("closed", convert=flag),
+        Field("archived", convert=flag),
+        Field("new", convert=flag),
+        Field("featured", convert=flag),
+        Field("restricted", convert=flag),
+        Field("end", "endDate", text),
+        Field("markets", convert=join_ids),
+    )
+
+
+def decode(record_cls, content: bytes) -> list:
+    """
+    Decode a JSON array response body into records in one pass. Rows that
+    don't fit the schema are skipped, as the pydantic path did.
+    """
+    from_api = record_cls.from_api
+    records = []
+    for row in loads(content):
+        try:
+            records.append(from_api(row))
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"[decode] skipping {record_cls.__name__} {row.get('id')}: {e!r}")
+    return records
+
+
+def decode_markets(content: bytes) -> "list[MarketRecord]":
+    return decode(MarketRecord, content)
+
+
+def decode_events(content: bytes) -> "list[EventRecord]":
+    return decode(EventRecord, content)
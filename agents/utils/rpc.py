@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+import time
+
+import httpx
+
+
+class RPCError(Exception):
+    def __init__(self, error: dict) -> None:
+        self.code = error.get("code")
+        self.message = error.get("message", "")
+        super().__init__(f"{self.code}: {self.message}")
+
+
+class AsyncRPCPool:
+    """
+    Async JSON-RPC client over a shared `httpx.AsyncClient`.
+
+    Calls to `request()` issued in the same event-loop tick are coalesced
+    into one JSON-RPC batch POST. Each POST goes to the first healthy URL in
+    `urls`; on a connection error, timeout, 429 or 5xx that endpoint is
+    benched for `cooldown` seconds and the batch is retried on the next one.
+    """
+
+    def __init__(
+        self,
+        urls: "list[str]",
+        timeout: float = 10.0,
+        max_batch: int = 100,
+        cooldown: float = 30.0,
+    ) -> None:
+        self.urls = list(urls)
+        self.timeout = timeout
+        self.max_batch = max_batch
+        self.cooldown = cooldown
+        self.down_until: "dict[str, float]" = {}
+        self.ids = itertools.count(1)
+        self.pending: list = []
+        self.client = None
+        self.loop = None
+        self.posts = 0
+
+    def session(self) -> httpx.AsyncClient:
+        # an AsyncClient is bound to the loop it was first used on
+        loop = asyncio.get_running_loop()
+        if self.client is None or self.loop is not loop:
+            self.client = httpx.AsyncClient(timeout=self.timeout)
+            self.loop = loop
+        return self.client
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def endpoints(self) -> "list[str]":
+        now = time.monotonic()
+        healthy = [u for u in self.urls if self.down_until.get(u, 0) <= now]
+        return healthy or list(self.urls)
+
+    async def post(self, payload: list) -> list:
+        last_error = None
+        for url in self.endpoints():
+            try:
+                self.posts += 1
+                response = await self.session().post(url, json=payload)
+            except httpx.HTTPError as e:
+                last_error = e
+            else:
+                if response.status_code == 429 or response.status_code >= 500:
+                    last_error = RuntimeError(f"{url} returned {response.status_code}")
+                else:
+                    response.raise_for_status()
+                    body = response.json()
+                    return body if isinstance(body, list) else [body]
+            print(f"[AsyncRPCPool] {url} failed ({last_error}), failing over")
+            self.down_until[url] = time.monotonic() + self.cooldown
+        raise last_error
+
+    async def batch(self, calls: "list[tuple[str, list]]") -> list:
+        """Send `(method, params)` calls as JSON-RPC batches; results in order."""
+        results = []
+        for i in range(0, len(calls), self.max_batch):
+            chunk = calls[i : i + self.max_batch]
+            payload = [
+                {"jsonrpc": "2.0", "id": next(self.ids), "method": m, "params": p}
+                for m, p in chunk
+            ]
+            by_id = {r.get("id"): r for r in await self.post(payload)}
+            for request in payload:
+                reply = by_id.get(request["id"], {})
+                if "error" in reply:
+                    results.append(RPCError(reply["error"]))
+                else:
+                    results.append(reply.get("result"))
+        return results
+
+    async def request(self, method: str, params: list = ()):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((method, list(params), future))
+        if len(self.pending) == 1:
+            asyncio.get_running_loop().call_soon(
+                lambda: asyncio.ensure_future(self.flush())
+            )
+        result = await future
+        if isinstance(result, RPCError):
+            raise result
+        return result
+
+    async def flush(self) -> None:
+        pending, self.pending = self.pending, []
+        try:
+            results = await self.batch([(m, p) for m, p, _ in pending])
+        except Exception as e:
+            for _, _, future in pending:
+                future.set_exception(e)
+            return
+        for (_, _, future), result in zip(pending, results):
+            future.set_result(result)
+
+    async def send_raw_transactions(self, raw_transactions: "list[bytes]") -> list:
+        """Submit signed transactions together; returns tx hashes or RPCErrors."""
+        return await self.batch(
+            [
+                ("eth_sendRawTransaction", ["0x" + bytes(raw).hex()])
+                for raw in raw_transactions
+            ]
+        )
+
+    async def wait_for_receipts(
+        self, tx_hashes: "list[str]", timeout: float = 600.0, poll: float = 2.0
+    ) -> "list[dict]":
+        """Poll receipts for all hashes at once until every one is mined."""
+        receipts = {}
+        deadline = time.monotonic() + timeout
+        while len(receipts) < len(tx_hashes):
+            waiting = [h for h in tx_hashes if h not in receipts]
+            results = await self.batch(
+                [("eth_getTransactionReceipt", [h]) for h in waiting]
+            )
+            for tx_hash, receipt in zip(waiting, results):
+                if receipt and not isinstance(receipt, RPCError):
+                    receipts[tx_hash] = receipt
+            if len(receipts) == len(tx_hashes):
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"{len(tx_hashes) - len(receipts)} transactions not mined in {timeout}s"
+                )
+            await asyncio.sleep(poll)
+        return [receipts[h] for h in tx_hashes]
+
+    async def send_and_wait(
+        self, raw_transactions: "list[bytes]", timeout: float = 600.0, poll: float = 2.0
+    ) -> "list[dict]":
+        hashes = await self.send_raw_transactions(raw_transactions)
+        failed = [h for h in hashes if isinstance(h, RPCError)]
+        if failed:
+            raise failed[0]
+        return await self.wait_for_receipts(hashes, timeout, poll)
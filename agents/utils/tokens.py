@@ -0,0 +1,63 @@
+# Optional tiktoken import; without it token counts fall back to len // 4
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+class TokenCounter:
+    """
+    Counts prompt tokens with a real BPE tokenizer and remembers the result
+    per text, so records that reappear across polls are only encoded once.
+
+    Grok does not publish its tokenizer; `o200k_base` is a close proxy for
+    modern BPE vocabularies and far better than a characters/4 estimate.
+    """
+
+    def __init__(self, encoding: str = "o200k_base", max_cache: int = 65536) -> None:
+        self.encoding = None
+        if TIKTOKEN_AVAILABLE:
+            try:
+                self.encoding = tiktoken.get_encoding(encoding)
+            except Exception as e:
+                print(f"[TokenCounter] tiktoken encoding {encoding} unavailable: {e}")
+        self.max_cache = max_cache
+        self.cache: "dict[int, int]" = {}
+
+    def count(self, text: str) -> int:
+        key = hash(text)
+        n = self.cache.get(key)
+        if n is None:
+            if self.encoding is not None:
+                n = len(self.encoding.encode(text, disallowed_special=()))
+            else:
+                n = len(text) // 4
+            if len(self.cache) >= self.max_cache:
+                self.cache.clear()
+            self.cache[key] = n
+        return n
+
+
+def pack(sizes: "list[int]", budget: int) -> "list[list[int]]":
+    """
+    First-fit-decreasing bin packing of item sizes under `budget`.
+
+    Returns bins of item indices, each in original order. Items larger than
+    the budget cannot be split and get a bin of their own.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i], reverse=True)
+    bins: "list[list[int]]" = []
+    free: "list[int]" = []
+    for i in order:
+        size = sizes[i]
+        for b, room in enumerate(free):
+            if size <= room:
+                bins[b].append(i)
+                free[b] -= size
+                break
+        else:
+            bins.append([i])
+            free.append(budget - size)
+    return [sorted(b) for b in bins]
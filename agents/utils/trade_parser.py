@@ -0,0 +1,73 @@
+import re
+
+# how far back a field can start before the newest chunk, e.g. `size : '0.125'`
+LOOKBACK = 64
+
+PATTERNS = {
+    "price": re.compile(r"price\s*:\s*['\"]?(\d*\.?\d+)['\"]?\s*[,\n}`]", re.I),
+    "size": re.compile(r"size\s*:\s*['\"]?(\d*\.?\d+)['\"]?\s*[,\n}`]", re.I),
+    "side": re.compile(r"side\s*:\s*['\"]?(BUY|SELL)\b", re.I),
+}
+
+
+class TradeDecision:
+    """The `price:` / `size:` / `side:` block of a one_best_trade answer."""
+
+    __slots__ = ("price", "size", "side")
+
+    def __init__(self, price: float, size: float, side: str) -> None:
+        self.price = price
+        self.size = size
+        self.side = side
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TradeDecision) and (
+            (self.price, self.size, self.side) == (other.price, other.size, other.side)
+        )
+
+    def __repr__(self) -> str:
+        return f"TradeDecision(price={self.price}, size={self.size}, side={self.side})"
+
+
+class TradeParser:
+    """
+    Incremental parser for streamed trade answers.
+
+    `feed()` each chunk as it arrives; it returns the `TradeDecision` as soon
+    as all three fields have been seen, so the caller can stop generation.
+    A number only counts once it is terminated (`,`, newline, `}` or a
+    backtick), so `0.5` is not taken from a half-streamed `0.55`.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.fields: "dict[str, str]" = {}
+        self.decision = None
+
+    def feed(self, chunk: str) -> "TradeDecision | None":
+        if self.decision is not None or not chunk:
+            return self.decision
+        start = max(0, len(self.text) - LOOKBACK)
+        self.text += chunk
+        for name, pattern in PATTERNS.items():
+            if name not in self.fields:
+                match = pattern.search(self.text, start)
+                if match:
+                    self.fields[name] = match.group(1)
+        if len(self.fields) == len(PATTERNS):
+            self.decision = TradeDecision(
+                float(self.fields["price"]),
+                float(self.fields["size"]),
+                self.fields["side"].upper(),
+            )
+        return self.decision
+
+    def finish(self) -> "TradeDecision | None":
+        """End of stream: a trailing unterminated number is now complete."""
+        return self.feed("\n")
+
+
+def parse_trade(text: str) -> "TradeDecision | None":
+    parser = TradeParser()
+    parser.feed(text)
+    return parser.finish()
@@ -0,0 +1,250 @@
+import asyncio
+import time
+
+from eth_account import Account
+
+from agents.utils.rpc import AsyncRPCPool, RPCError
+
+
+def to_int(value) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+class TransactionReverted(RuntimeError):
+    """Mined, but at least one receipt has status 0; all receipts attached."""
+
+    def __init__(self, receipts: "list[dict]") -> None:
+        self.receipts = receipts
+        reverted = [r.get("transactionHash") for r in receipts if not succeeded(r)]
+        super().__init__(
+            f"{len(reverted)} of {len(receipts)} transactions reverted: {reverted}"
+        )
+
+
+def succeeded(receipt: dict) -> bool:
+    return to_int(receipt.get("status", 1)) == 1
+
+
+class NonceManager:
+    """
+    Hands out consecutive nonces for one account without asking the node
+    before every transaction. The first call reads the `pending` count;
+    `reset()` forces a re-read after any rejected broadcast.
+    """
+
+    def __init__(self, rpc: AsyncRPCPool, address: str) -> None:
+        self.rpc = rpc
+        self.address = address
+        self.nonce = None
+        self.lock = None
+        self.loop = None
+
+    async def next(self) -> int:
+        # the nonce outlives event loops (one asyncio.run per flow), the lock can't
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.lock, self.loop = asyncio.Lock(), loop
+        async with self.lock:
+            if self.nonce is None:
+                self.nonce = to_int(
+                    await self.rpc.request(
+                        "eth_getTransactionCount", [self.address, "pending"]
+                    )
+                )
+            nonce = self.nonce
+            self.nonce += 1
+            return nonce
+
+    def reset(self) -> None:
+        self.nonce = None
+
+
+class PendingTransaction:
+    __slots__ = ("tx", "hashes", "sent_at", "bumps", "receipt")
+
+    def __init__(self, tx: dict) -> None:
+        self.tx = tx
+        self.hashes: "list[str]" = []
+        self.sent_at = 0.0
+        self.bumps = 0
+        self.receipt = None
+
+    @property
+    def nonce(self) -> int:
+        return self.tx["nonce"]
+
+
+class TransactionSender:
+    """
+    Signs a sequence of EIP-1559 transactions with locally tracked nonces,
+    broadcasts them back to back in one JSON-RPC batch and watches all
+    receipts together, so N transactions can land in the same block.
+
+    A transaction still unmined after `stuck_after` seconds is re-signed
+    with the same nonce and fees raised by `bump` (at least the 10% nodes
+    require for a replacement), up to `max_bumps` times. A receipt for any
+    of its hashes completes it.
+    """
+
+    def __init__(
+        self,
+        rpc: AsyncRPCPool,
+        private_key: str,
+        chain_id: int,
+        bump: float = 1.125,
+        stuck_after: float = 30.0,
+        max_bumps: int = 5,
+        default_gas: int = 300_000,
+    ) -> None:
+        self.rpc = rpc
+        self.account = Account.from_key(private_key)
+        self.chain_id = chain_id
+        self.bump = bump
+        self.stuck_after = stuck_after
+        self.max_bumps = max_bumps
+        self.default_gas = default_gas
+        self.nonces = NonceManager(rpc, self.account.address)
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    async def fees(self) -> "tuple[int, int]":
+        """(maxFeePerGas, maxPriorityFeePerGas) from the latest base fee."""
+        block, tip = await asyncio.gather(
+            self.rpc.request("eth_getBlockByNumber", ["latest", False]),
+            self.rpc.request("eth_maxPriorityFeePerGas"),
+        )
+        tip = to_int(tip)
+        return 2 * to_int(block["baseFeePerGas"]) + tip, tip
+
+    async def prepare(self, txs: "list[dict]") -> "list[PendingTransaction]":
+        """Fill in nonce, fees, chain id and gas for `{to, data, value}` dicts."""
+        max_fee, tip = await self.fees()
+        missing = [tx for tx in txs if "gas" not in tx]
+        estimates = await self.rpc.batch(
+            [
+                (
+                    "eth_estimateGas",
+                    [
+                        {
+                            "from": self.address,
+                            "to": tx["to"],
+                            "data": tx.get("data", "0x"),
+                        }
+                    ],
+                )
+                for tx in missing
+            ]
+        )
+        # later steps can depend on earlier ones (split after approve), so a
+        # failed estimate falls back to the default limit
+        for tx, estimate in zip(missing, estimates):
+            if estimate is None or isinstance(estimate, RPCError):
+                tx["gas"] = self.default_gas
+            else:
+                tx["gas"] = to_int(estimate) * 6 // 5
+        pending = []
+        for tx in txs:
+            tx = dict(tx)
+            tx.setdefault("value", 0)
+            tx.setdefault("maxFeePerGas", max_fee)
+            tx.setdefault("maxPriorityFeePerGas", tip)
+            tx["chainId"] = self.chain_id
+            tx["nonce"] = await self.nonces.next()
+            pending.append(PendingTransaction(tx))
+        return pending
+
+    def sign(self, pending: PendingTransaction) -> bytes:
+        return bytes(self.account.sign_transaction(pending.tx).raw_transaction)
+
+    async def broadcast(self, pending: "list[PendingTransaction]") -> None:
+        hashes = await self.rpc.send_raw_transactions([self.sign(p) for p in pending])
+        now = time.monotonic()
+        for p, tx_hash in zip(pending, hashes):
+            if isinstance(tx_hash, RPCError):
+                # whatever the reason, the node never took this nonce; carrying
+                # on from the local counter would leave a gap every later
+                # transaction waits behind
+                self.nonces.reset()
+                print(f"[TransactionSender] nonce {p.nonce} rejected: {tx_hash}")
+                continue
+            p.hashes.append(tx_hash)
+            p.sent_at = now
+
+    async def cancel_from(
+        self, pending: "list[PendingTransaction]", nonce: int
+    ) -> None:
+        """
+        Turn every transaction from `nonce` on into a 0-value self-transfer.
+        A rejected nonce leaves the accepted ones above it queued; filling
+        the gap later (any unrelated send) would release them, so the gap is
+        filled now and the queued ones are replaced with no-ops.
+        """
+        noops = []
+        for p in pending:
+            if p.nonce < nonce:
+                continue
+            p.tx = dict(p.tx, to=self.address, value=0, data="0x", gas=21_000)
+            if p.hashes:
+                # replacing a queued transaction needs higher fees
+                self.bumped(p)
+            noops.append(p)
+        print(f"[TransactionSender] cancelling nonces {nonce}-{noops[-1].nonce}")
+        await self.broadcast(noops)
+
+    def bumped(self, pending: PendingTransaction) -> PendingTransaction:
+        tx = pending.tx
+        tx["maxFeePerGas"] = int(tx["maxFeePerGas"] * self.bump) + 1
+        tx["maxPriorityFeePerGas"] = int(tx["maxPriorityFeePerGas"] * self.bump) + 1
+        pending.bumps += 1
+        return pending
+
+    async def send_all(
+        self, txs: "list[dict]", timeout: float = 600.0, poll: float = 2.0
+    ) -> "list[dict]":
+        """
+        Send `txs` in order and return their receipts, in the same order.
+        Raises RuntimeError if the node rejects any of them, after cancelling
+        the rejected one and everything after it (`cancel_from`), and
+        TransactionReverted if any is mined with status 0.
+        """
+        pending = await self.prepare(txs)
+        await self.broadcast(pending)
+        unsent = [p for p in pending if not p.hashes]
+        if unsent:
+            await self.cancel_from(pending, unsent[0].nonce)
+            raise RuntimeError(f"{len(unsent)} of {len(pending)} transactions rejected")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            waiting = [p for p in pending if p.receipt is None]
+            if not waiting:
+                receipts = [p.receipt for p in pending]
+                if not all(succeeded(r) for r in receipts):
+                    raise TransactionReverted(receipts)
+                return receipts
+            hashes = [(p, h) for p in waiting for h in p.hashes]
+            receipts = await self.rpc.batch(
+                [("eth_getTransactionReceipt", [h]) for _, h in hashes]
+            )
+            for (p, _), receipt in zip(hashes, receipts):
+                if receipt and not isinstance(receipt, RPCError):
+                    p.receipt = receipt
+
+            now = time.monotonic()
+            if now > deadline:
+                raise TimeoutError(
+                    f"{len(waiting)} transactions not mined in {timeout}s"
+                )
+            stuck = [
+                self.bumped(p)
+                for p in pending
+                if p.receipt is None
+                and p.bumps < self.max_bumps
+                and now - p.sent_at > self.stuck_after
+            ]
+            if stuck:
+                print(f"[TransactionSender] replacing {len(stuck)} stuck transactions")
+                await self.broadcast(stuck)
+            await asyncio.sleep(poll)
@@ -8,6 +8,8 @@ from web3 import Web3
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from agents.polymarket.multicall import Call, Multicall, eth_balance
+
 load_dotenv()
 
 private_key = os.getenv("POLYGON_WALLET_PRIVATE_KEY")
@@ -30,13 +32,18 @@ address = account.address
 print(f"📍 Wallet Address: {address}")
 print(f"🔗 View on PolygonScan: https://polygonscan.com/address/{address}")
 
-# Check USDC balance
+# USDC and MATIC balances in a single Multicall3 eth_call
 usdc_address = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
-usdc_abi = [{"constant": True, "inputs": [{"name": "_owner", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "balance", "type": "uint256"}], "type": "function"}]
-usdc_contract = w3.eth.contract(address=usdc_address, abi=usdc_abi)
+try:
+    balance_raw, matic_balance = Multicall(w3).call(
+        [Call(usdc_address, "balanceOf(address)", [address]), eth_balance(address)]
+    )
+except Exception as e:
+    print(f"❌ Error reading balances: {e}")
+    sys.exit(1)
 
+# Check USDC balance
 try:
-    balance_raw = usdc_contract.functions.balanceOf(address).call()
     balance_usdc = balance_raw / 1e6  # USDC has 6 decimals
     print(f"💰 USDC Balance: ${balance_usdc:,.2f}")
     
@@ -57,7 +64,6 @@ except Exception as e:
 
 # Check MATIC balance (for gas)
 try:
-    matic_balance = w3.eth.get_balance(address)
     matic_balance_ether = w3.from_wei(matic_balance, 'ether')
     print(f"⛽ MATIC Balance: {matic_balance_ether:.4f} MATIC")
     
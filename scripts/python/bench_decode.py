@@ -0,0 +1,124 @@
+"""
+Compare Gamma /markets decoding paths on a 5k-market payload.
+
+    python scripts/python/bench_decode.py --record   # fetch and save a live payload
+    python scripts/python/bench_decode.py            # bench (synthesizes one if none saved)
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+import httpx
+
+from agents.polymarket.polymarket import Polymarket
+from agents.utils.objects import SimpleMarket
+from agents.utils.records import decode_markets, loads
+
+GAMMA_MARKETS = "https://gamma-api.polymarket.com/markets"
+
+
+def record(path: str, n: int) -> None:
+    rows = []
+    with httpx.Client(timeout=30.0) as client:
+        while len(rows) < n:
+            params = {
+                "active": "true",
+                "closed": "false",
+                "limit": 100,
+                "offset": len(rows),
+            }
+            batch = client.get(GAMMA_MARKETS, params=params).json()
+            if not batch:
+                break
+            rows.extend(batch)
+    with open(path, "w") as f:
+        json.dump(rows[:n], f)
+    print(f"recorded {len(rows[:n])} markets to {path}")
+
+
+def synthesize(n: int) -> list:
+    rng = random.Random(0)
+    rows = []
+    for i in range(n):
+        price = round(rng.random(), 3)
+        rows.append(
+            {
+                "id": str(500000 + i),
+                "question": f"Will outcome {i} happen by the end of the month?",
+                "conditionId": "0x" + "%064x" % rng.getrandbits(256),
+                "slug": f"will-outcome-{i}-happen",
+                "endDate": "2025-12-31T12:00:00Z",
+                "description": "This market resolves YES if the outcome happens. " * 8,
+                "outcomes": '["Yes", "No"]',
+                "outcomePrices": json.dumps([str(price), str(round(1 - price, 3))]),
+                "clobTokenIds": json.dumps(
+                    [str(rng.getrandbits(255)), str(rng.getrandbits(255))]
+                ),
+                "volume": str(rng.random() * 1e6),
+                "liquidity": str(rng.random() * 1e5),
+                "active": True,
+                "closed": False,
+                "funded": rng.random() < 0.5,
+                "rewardsMinSize": 50,
+                "rewardsMaxSpread": 3.5,
+                "spread": round(rng.random() / 10, 3),
+                "events": [{"id": str(i // 4), "title": f"Event {i // 4}"}],
+            }
+        )
+    return rows
+
+
+def old_path(content: bytes) -> list:
+    markets = []
+    for market in json.loads(content):
+        try:
+            # map_api_to_market does not touch instance state
+            markets.append(SimpleMarket(**Polymarket.map_api_to_market(None, market)))
+        except Exception as e:
+            print(e)
+    return markets
+
+
+def bench(fn, content: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payload", default="./local_db_bench/markets_5k.json")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("-n", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    directory = os.path.dirname(args.payload)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    if args.record:
+        record(args.payload, args.n)
+    if os.path.isfile(args.payload):
+        with open(args.payload, "rb") as f:
+            content = f.read()
+        print(f"payload: {args.payload}")
+    else:
+        content = json.dumps(synthesize(args.n)).encode()
+        print(f"payload: {args.n} synthesized markets")
+
+    old = bench(old_path, content, args.repeat)
+    new = bench(decode_markets, content, args.repeat)
+    parse = bench(loads, content, args.repeat)
+    assert [m.dict() for m in old_path(content)] == [
+        m.dict() for m in decode_markets(content)
+    ]
+    print(f"json + map_api_to_market + SimpleMarket: {old * 1e3:8.1f} ms")
+    print(f"decode_markets:                          {new * 1e3:8.1f} ms")
+    print(f"  of which JSON parsing:                 {parse * 1e3:8.1f} ms")
+    print(f"speedup: {old / new:.1f}x")
@@ -0,0 +1,162 @@
+"""
+Resident memory of the active universe: pydantic models vs UniverseCache.
+
+    python scripts/python/bench_memory.py --record   # fetch and save live /events
+    python scripts/python/bench_memory.py            # bench (synthesizes if none saved)
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import tracemalloc
+
+import httpx
+
+from agents.polymarket.gamma import GammaMarketClient
+from agents.utils.compact import UniverseCache
+from agents.utils.objects import PolymarketEvent, Tag
+
+GAMMA_EVENTS = "https://gamma-api.polymarket.com/events"
+
+
+def record(path: str, limit: int) -> None:
+    rows = []
+    with httpx.Client(timeout=30.0) as client:
+        while len(rows) < limit:
+            params = {
+                "active": "true",
+                "closed": "false",
+                "limit": 100,
+                "offset": len(rows),
+            }
+            batch = client.get(GAMMA_EVENTS, params=params).json()
+            if not batch:
+                break
+            rows.extend(batch)
+    with open(path, "w") as f:
+        json.dump(rows[:limit], f)
+    print(f"recorded {len(rows[:limit])} events to {path}")
+
+
+def synthesize(n_events: int, markets_per_event: int = 4) -> list:
+    rng = random.Random(0)
+    labels = [f"Tag {i}" for i in range(40)]
+    categories = ["Politics", "Sports", "Crypto", "Pop Culture", "Business"]
+    sources = [f"https://source{i}.example.com/" for i in range(8)]
+    rows = []
+    market_id = 500000
+    for e in range(n_events):
+        description = f"Event {e}. " + "This event covers the listed outcomes. " * 20
+        tags = [
+            {"id": str(i), "label": labels[i], "slug": labels[i].lower()}
+            for i in rng.sample(range(len(labels)), 3)
+        ]
+        markets = []
+        for m in range(markets_per_event):
+            market_id += 1
+            price = round(rng.random(), 3)
+            markets.append(
+                {
+                    "id": str(market_id),
+                    "question": f"Will outcome {m} of event {e} happen?",
+                    "conditionId": "0x" + "%064x" % rng.getrandbits(256),
+                    "slug": f"event-{e}-outcome-{m}",
+                    "endDate": "2025-12-31T12:00:00Z",
+                    "category": rng.choice(categories),
+                    "resolutionSource": rng.choice(sources),
+                    # markets in an event usually share the resolution text
+                    "description": description + " Resolves per the source above.",
+                    "outcomes": '["Yes", "No"]',
+                    "outcomePrices": json.dumps([str(price), str(round(1 - price, 3))]),
+                    "clobTokenIds": json.dumps(
+                        [str(rng.getrandbits(255)), str(rng.getrandbits(255))]
+                    ),
+                    "active": True,
+                    "closed": False,
+                    "archived": False,
+                    "restricted": True,
+                    "enableOrderBook": True,
+                    "negRisk": False,
+                    "liquidityNum": rng.random() * 1e5,
+                    "volumeNum": rng.random() * 1e6,
+                    "volume24hr": rng.random() * 1e4,
+                    "spread": 0.01,
+                }
+            )
+        rows.append(
+            {
+                "id": str(e),
+                "ticker": f"event-{e}",
+                "slug": f"event-{e}",
+                "title": f"Event {e}",
+                "category": rng.choice(categories),
+                "description": description,
+                "endDate": "2025-12-31T12:00:00Z",
+                "active": True,
+                "closed": False,
+                "archived": False,
+                "restricted": True,
+                "liquidity": rng.random() * 1e5,
+                "volume": rng.random() * 1e6,
+                "tags": tags,
+                "markets": markets,
+            }
+        )
+    return rows
+
+
+def pydantic_universe(content: bytes) -> list:
+    gamma = GammaMarketClient()
+    events = []
+    for row in json.loads(content):
+        row["markets"] = [gamma.parse_pydantic_market(m) for m in row["markets"]]
+        row["tags"] = [Tag(**t) for t in row.get("tags", [])]
+        events.append(PolymarketEvent(**row))
+    return events
+
+
+def compact_universe(content: bytes) -> UniverseCache:
+    cache = UniverseCache()
+    cache.load_events(json.loads(content))
+    return cache
+
+
+def retained(build, content: bytes) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    universe = build(content)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del universe
+    return size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payload", default="./local_db_bench/events.json")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("-n", type=int, default=2000, help="events")
+    args = parser.parse_args()
+
+    directory = os.path.dirname(args.payload)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    if args.record:
+        record(args.payload, args.n)
+    if os.path.isfile(args.payload):
+        with open(args.payload, "rb") as f:
+            content = f.read()
+        print(f"payload: {args.payload}")
+    else:
+        content = json.dumps(synthesize(args.n)).encode()
+        print(f"payload: {args.n} synthesized events")
+
+    baseline = retained(pydantic_universe, content)
+    compact = retained(compact_universe, content)
+    print(f"pydantic PolymarketEvent/Market: {baseline / 1e6:8.1f} MB")
+    print(f"UniverseCache:                   {compact / 1e6:8.1f} MB")
+    print(f"reduction: {baseline / compact:.1f}x")
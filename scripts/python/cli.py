@@ -1,12 +1,18 @@
+import asyncio
+
 import typer
 from devtools import pprint
 
 from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.feed import MarketFeed
+from agents.polymarket.gamma import GammaMarketClient
+from agents.polymarket.history import HistorySampler, PriceHistoryStore, poll_gamma
 from agents.connectors.chroma import PolymarketRAG
 from agents.connectors.news import News
 from agents.application.trade import Trader
 from agents.application.executor import Executor
 from agents.application.creator import Creator
+from agents.utils.records import json_list
 
 app = typer.Typer()
 polymarket = Polymarket()
@@ -20,12 +26,12 @@ def get_all_markets(limit: int = 5, sort_by: str = "spread") -> None:
     Query Polymarket's markets
     """
     print(f"limit: int = {limit}, sort_by: str = {sort_by}")
-    markets = polymarket.get_all_markets()
-    markets = polymarket.filter_markets_for_trading(markets)
+    markets = polymarket.get_market_table().tradeable()
     if sort_by == "spread":
-        markets = sorted(markets, key=lambda x: x.spread, reverse=True)
-    markets = markets[:limit]
-    pprint(markets)
+        markets = markets.top_k("spread", limit)
+    else:
+        markets = markets.head(limit)
+    pprint(markets.markets())
 
 
 @app.command()
@@ -124,5 +130,27 @@ def run_autonomous_trader() -> None:
     trader.one_best_trade()
 
 
+@app.command()
+def sample_price_history(interval: float = 60.0, websocket: bool = False) -> None:
+    """
+    Fill the local price-history store: poll Gamma every `interval` seconds,
+    or with --websocket stream the CLOB market channel for active tokens.
+    """
+    store = PriceHistoryStore()
+    gamma = GammaMarketClient()
+    if not websocket:
+        poll_gamma(store, gamma, interval)
+        return
+    token_ids = [
+        token_id
+        for market in gamma.get_all_current_markets()
+        for token_id in json_list(market.get("clobTokenIds"))
+    ]
+    try:
+        asyncio.run(MarketFeed(token_ids).run(HistorySampler(store)))
+    finally:
+        store.flush()
+
+
 if __name__ == "__main__":
     app()
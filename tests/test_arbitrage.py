@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse
+
+from py_clob_client.clob_types import OrderBookSummary, OrderSummary
+
+from agents.application.arbitrage import ArbitrageScanner, PairRegistry
+from agents.kalshi.kalshi import Kalshi
+from agents.utils.objects import MarketPair
+
+# cents, ascending, bids only - the shape Kalshi's /orderbook returns
+KALSHI_BOOKS = {
+    "PRES-A": {"yes": [[38, 100], [40, 50]], "no": [[55, 80], [57, 20]]},
+    "PRES-B": {"yes": [[60, 10]], "no": [[35, 10]]},
+}
+
+
+class KalshiStandIn(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = urlparse(self.path).path
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "markets" and parts[2] == "orderbook":
+            book = KALSHI_BOOKS.get(parts[1])
+            if book is not None:
+                return self._send(200, {"orderbook": book})
+        return self._send(404, {"error": "not found"})
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakePolymarket:
+    def __init__(self, asks):
+        self.asks = asks
+
+    def get_orderbooks(self, token_ids):
+        return [
+            OrderBookSummary(
+                asset_id=token_id,
+                bids=[],
+                asks=[
+                    OrderSummary(price=str(p), size=str(s))
+                    for p, s in self.asks[token_id]
+                ],
+            )
+            for token_id in token_ids
+            if token_id in self.asks
+        ]
+
+
+class TestArbitrageScanner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), KalshiStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.kalshi = Kalshi(base_url=f"http://127.0.0.1:{cls.server.server_port}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.kalshi.close()
+        cls.server.shutdown()
+
+    def test_kalshi_orderbook_in_dollars(self):
+        book = self.kalshi.get_orderbook("PRES-A")
+        self.assertEqual(book["yes"][-1], [0.40, 50.0])
+        self.assertEqual(book["no"][-1], [0.57, 20.0])
+
+    def test_scan_computes_fee_adjusted_edges(self):
+        registry = PairRegistry(local_file_path=None)
+        registry.add(
+            MarketPair(
+                kalshi_ticker="PRES-A",
+                polymarket_yes_token_id="a-yes",
+                polymarket_no_token_id="a-no",
+            )
+        )
+        registry.add(
+            MarketPair(
+                kalshi_ticker="PRES-B",
+                polymarket_yes_token_id="b-yes",
+                polymarket_no_token_id="b-no",
+            )
+        )
+        registry.add(
+            MarketPair(
+                kalshi_ticker="MISSING",
+                polymarket_yes_token_id="c-yes",
+                polymarket_no_token_id="c-no",
+            )
+        )
+        polymarket = FakePolymarket(
+            {
+                "a-yes": [(0.62, 100), (0.60, 30)],
+                "a-no": [(0.52, 100), (0.50, 40)],
+                "b-yes": [(0.45, 100)],
+                "b-no": [(0.70, 100)],
+            }
+        )
+        scanner = ArbitrageScanner(
+            registry, polymarket, kalshi=self.kalshi, kalshi_fee_rate=0.0
+        )
+        scan = scanner.scan()
+
+        # PRES-A: kalshi yes ask = 1 - 0.57, poly no ask = 0.50
+        self.assertAlmostEqual(scan.edge_kalshi_yes[0], 1 - (0.43 + 0.50))
+        self.assertAlmostEqual(scan.best_size[0], 20.0)
+        # PRES-B: kalshi no ask = 1 - 0.60, poly yes ask = 0.45 -> 0.15 edge
+        self.assertEqual(scan.direction[1], 1)
+        self.assertAlmostEqual(scan.best_edge[1], 0.15)
+        # no kalshi book at all
+        self.assertTrue(scan.best_edge[2] != scan.best_edge[2])
+
+        opportunities = scan.opportunities(min_edge=0.0)
+        self.assertEqual([o.kalshi_ticker for o in opportunities], ["PRES-B", "PRES-A"])
+        self.assertEqual(opportunities[0].polymarket_token_id, "b-yes")
+
+        # fees eat the thinner edge
+        scanner.kalshi_fee_rate = 0.07
+        self.assertAlmostEqual(
+            scanner.scan().edge_kalshi_yes[0], 1 - (0.43 + 0.07 * 0.43 * 0.57 + 0.50)
+        )
+
+    def test_registry_round_trip(self):
+        path = os.path.join(tempfile.mkdtemp(), "pairs", "pairs.json")
+        registry = PairRegistry(local_file_path=path)
+        registry.add(
+            MarketPair(
+                kalshi_ticker="X",
+                polymarket_yes_token_id="1",
+                polymarket_no_token_id="2",
+            )
+        )
+        registry.save()
+        self.assertEqual(
+            PairRegistry(local_file_path=path).get("X").polymarket_no_token_id, "2"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from agents.application.backtest import Backtester, BookSeries, Forecasts
+from agents.polymarket.feed import BookEvent, PriceChangeEvent, TradeEvent, BUY, SELL
+
+
+def books():
+    return BookSeries.from_events(
+        [
+            BookEvent(100, "a", [(0.38, 50.0)], [(0.40, 10.0), (0.45, 100.0)]),
+            BookEvent(100, "b", [(0.70, 20.0), (0.65, 20.0)], [(0.75, 5.0)]),
+            # a's best ask lifted before the second forecast
+            PriceChangeEvent(200, "a", SELL, 0.40, 0.0),
+        ],
+        depth=3,
+    )
+
+
+class TestBacktester(unittest.TestCase):
+    def setUp(self):
+        self.forecasts = Forecasts.from_records(
+            [
+                {"market_id": "a", "ts": 150, "probability": 0.6, "side": "BUY"},
+                {"market_id": "a", "ts": 250, "probability": 0.6, "side": "BUY"},
+                {"market_id": "b", "ts": 150, "probability": 0.5, "side": "SELL"},
+                {"market_id": "c", "ts": 150, "probability": 0.9, "side": "BUY"},
+                {"market_id": "a", "ts": 50, "probability": 0.6, "side": "BUY"},
+            ]
+        )
+        self.backtester = Backtester(self.forecasts, books(), {"a": 1.0, "b": 0.0})
+
+    def test_fills_walk_depth(self):
+        result = self.backtester.run(min_edge=0.1, notional=20.0)
+        # 10 @ 0.40 then (20 - 4) / 0.45 @ 0.45
+        np.testing.assert_allclose(result["shares"][0], 10 + 16 / 0.45)
+        # 0.40 level gone, only 0.45 is within the 0.50 limit
+        np.testing.assert_allclose(result["shares"][1], 20 / 0.45)
+        # sell 20 USDC into bids >= 0.60: 14 @ 0.70 then 6 @ 0.65
+        np.testing.assert_allclose(result["cash"][2], 20.0)
+        np.testing.assert_allclose(result["pnl"][2], 20.0)
+        # no book for c, no snapshot yet at ts=50
+        self.assertEqual(result["shares"][3], 0.0)
+        self.assertEqual(result["shares"][4], 0.0)
+        self.assertEqual(result["trades"], 3)
+
+        # tighter edge requirement filters the 0.45 level
+        self.assertEqual(self.backtester.run(min_edge=0.18)["trades"], 2)
+
+    def test_trades_do_not_change_the_book(self):
+        series = BookSeries.from_events(
+            [
+                BookEvent(100, "a", [(0.38, 50.0)], [(0.40, 10.0)]),
+                TradeEvent(150, "a", BUY, 0.40, 3.0),
+            ],
+            depth=2,
+        )
+        self.assertEqual(len(series.ts), 1)
+        np.testing.assert_allclose(series.bid_px[0], [0.38, np.nan])
+        np.testing.assert_allclose(series.ask_sz[0], [10.0, 0.0])
+
+    def test_scores(self):
+        # c is unresolved and excluded
+        expected = np.mean([0.16, 0.16, 0.25, 0.16])
+        self.assertAlmostEqual(self.backtester.brier_score(), expected)
+        calibration = self.backtester.calibration(n_bins=10)
+        self.assertEqual(calibration["count"][6], 3)
+        self.assertEqual(calibration["frequency"][6], 1.0)
+
+    def test_sweep_across_processes(self):
+        results = self.backtester.sweep(
+            {"min_edge": [0.0, 0.18], "notional": [5.0, 20.0]}, processes=2
+        )
+        self.assertEqual(len(results), 4)
+        self.assertEqual([r["trades"] for r in results], [3, 3, 2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
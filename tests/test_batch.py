@@ -0,0 +1,95 @@
+import threading
+import time
+import unittest
+
+from py_clob_client.clob_types import OrderType
+
+from agents.polymarket.batch import MAX_BATCH, BatchOrderClient
+from agents.polymarket.risk import RiskEngine
+from agents.utils.objects import OrderLeg
+
+
+class SingleOrderClient:
+    """A client without post_orders: one POST per order, 50ms each."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cancelled = []
+
+    def create_order(self, args):
+        return {"token_id": args.token_id, "price": args.price}
+
+    def post_order(self, order, orderType=None):
+        time.sleep(0.05)
+        if order["price"] > 0.99:
+            raise RuntimeError("price out of range")
+        return {"success": True, "orderID": f"id-{order['token_id']}"}
+
+    def cancel_market_orders(self, market="", asset_id=""):
+        with self.lock:
+            self.cancelled.append((market, asset_id))
+        return {"canceled": [asset_id]}
+
+
+class BatchClient(SingleOrderClient):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def post_orders(self, args):
+        self.batches.append(len(args))
+        return [
+            {"success": True, "orderID": f"id-{a.order['token_id']}", "status": "live"}
+            for a in args
+        ]
+
+
+class ShortReplyClient(BatchClient):
+    """Answers every batch but its last order; nothing ever fills."""
+
+    def post_orders(self, args):
+        return super().post_orders(args)[:-1]
+
+
+class TestBatchOrders(unittest.TestCase):
+    def test_batch_endpoint_in_chunks(self):
+        client = BatchClient()
+        legs = [OrderLeg(token_id=str(i), price=0.5, size=1) for i in range(20)]
+        results = BatchOrderClient(client).post(legs)
+        self.assertEqual(client.batches, [MAX_BATCH, 5])
+        self.assertEqual([r.order_id for r in results], [f"id-{i}" for i in range(20)])
+        self.assertTrue(all(r.success and r.latency_ms > 0 for r in results))
+
+    def test_concurrent_fallback_reports_each_leg(self):
+        legs = [
+            OrderLeg(token_id="yes", price=0.4, size=5),
+            OrderLeg(token_id="no", price=1.5, size=5, side="SELL"),
+            OrderLeg(token_id="other", price=0.3, size=5),
+        ]
+        start = time.monotonic()
+        results = BatchOrderClient(SingleOrderClient()).post(legs)
+        self.assertLess(time.monotonic() - start, 0.12)
+        self.assertEqual([r.success for r in results], [True, False, True])
+        self.assertIn("out of range", results[1].error)
+
+    def test_short_reply_and_unfilled_kill_release_risk(self):
+        risk = RiskEngine()
+        legs = [OrderLeg(token_id=str(i), price=0.5, size=10) for i in range(3)]
+        results = BatchOrderClient(ShortReplyClient(), risk=risk).post(
+            legs, OrderType.FAK
+        )
+        self.assertEqual([r.success for r in results], [True, True, False])
+        self.assertIn("no response", results[2].error)
+        # killed without a fill, so nothing stays reserved
+        self.assertEqual(risk.market_exposure, {"0": 0.0, "1": 0.0, "2": 0.0})
+
+    def test_cancel_by_token(self):
+        client = SingleOrderClient()
+        BatchOrderClient(client).cancel_market("0xcondition", ["yes", "no"])
+        self.assertEqual(
+            sorted(client.cancelled), [("0xcondition", "no"), ("0xcondition", "yes")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from agents.utils.compact import TextArena, UniverseCache
+
+
+def event_row(event_id, market_ids, description="Shared resolution text."):
+    return {
+        "id": str(event_id),
+        "ticker": f"t-{event_id}",
+        "slug": f"s-{event_id}",
+        "title": f"Event {event_id}",
+        "description": description,
+        "active": True,
+        "tags": [{"id": "1", "label": "Politics"}, {"id": "2", "label": None}],
+        "markets": [
+            {
+                "id": str(i),
+                "question": f"Q{i}?",
+                "category": "Politics",
+                "description": description,
+                "outcomes": '["Yes", "No"]',
+                "outcomePrices": '["0.25", "0.75"]',
+                "clobTokenIds": '["a", "b"]',
+                "spread": None,
+            }
+            for i in market_ids
+        ],
+    }
+
+
+class TestUniverseCache(unittest.TestCase):
+    def test_arena_dedupes(self):
+        arena = TextArena()
+        a = arena.add("héllo")
+        self.assertEqual(arena.add("héllo"), a)
+        b = arena.add("world")
+        self.assertEqual((arena.get(a), arena.get(b)), ("héllo", "world"))
+        self.assertEqual(len(arena), 2)
+        self.assertIsNone(arena.get(arena.add(None)))
+
+    def test_load_events(self):
+        cache = UniverseCache()
+        self.assertEqual(cache.load_events([event_row(1, [10, 11]), {"id": "x"}]), 1)
+        self.assertEqual(cache.load_events([event_row(2, [12], "Other text.")]), 1)
+        event = cache.events[1]
+        self.assertEqual(event.tags, ("Politics",))
+        self.assertEqual([m.id for m in cache.event_markets(1)], [10, 11])
+
+        market = cache.markets[11]
+        self.assertEqual(market.event_id, 1)
+        self.assertEqual(market.outcome_prices, [0.25, 0.75])
+        self.assertIsNone(market.spread)
+        self.assertFalse(hasattr(market, "__dict__"))
+        # repeated strings are shared, descriptions stored once
+        self.assertIs(market.category, cache.markets[10].category)
+        self.assertIs(market.outcomes[0], cache.markets[12].outcomes[0])
+        self.assertEqual(len(cache.arena), 2)
+        self.assertEqual(cache.description(market), "Shared resolution text.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from agents.utils.compaction import (
+    MARKET_COLUMNS,
+    Column,
+    compact_polymarket,
+    compact_tables,
+    number,
+    row_text,
+)
+
+SHARED = "Resolves to the official result published by the league."
+
+
+class TestCompaction(unittest.TestCase):
+    def test_projection_and_rounding(self):
+        market = {
+            "id": "12",
+            "question": "Will A win?",
+            "outcomes": '["Yes", "No"]',
+            "outcomePrices": '["0.4049999", "0.595"]',
+            "endDate": "2025-06-01T12:00:00Z",
+            "liquidity": "10234.567",
+            "volume": None,
+            "description": "multi\nline | text",
+            "clobTokenIds": '["1", "2"]',
+            "bestBid": 0.4,
+            "bestAsk": "0.41",
+            "spread": 0.01,
+            "image": "https://example.com/a.png",
+        }
+        self.assertEqual(
+            row_text(market, MARKET_COLUMNS),
+            "12|Will A win?|Yes/No|0.405/0.595|1/2|0.4|0.41|0.01|2025-06-01|10235||"
+            "multi line / text",
+        )
+        self.assertEqual(number(3)(0.5), "0.5")
+        self.assertEqual(number(3)(1), "1")
+
+    def test_dictionary_encoding(self):
+        columns = (Column("id"), Column("description"))
+        text = compact_tables(
+            [
+                ("a", [{"id": 1, "description": SHARED}], columns),
+                ("b", [{"id": 2, "description": SHARED}, {"id": 3}], columns),
+            ]
+        )
+        self.assertEqual(
+            text.split("\n"),
+            [
+                "repeated text:",
+                f"@1={SHARED}",
+                "a (id|description):",
+                "1|@1",
+                "b (id|description):",
+                "2|@1",
+                "3|",
+            ],
+        )
+
+    def test_event_markets_referenced_by_id(self):
+        text = compact_polymarket(
+            [{"id": "7", "title": "Finals", "markets": [{"id": "12"}, {"id": "13"}]}],
+            [],
+        )
+        self.assertIn("7|Finals||||12,13|", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
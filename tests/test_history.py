@@ -0,0 +1,138 @@
+import json
+import tempfile
+import unittest
+
+import numpy as np
+
+from agents.polymarket.feed import BookEvent, PriceChangeEvent, TradeEvent, BUY
+from agents.polymarket.history import HistorySampler, PriceHistoryStore, poll_gamma
+from agents.polymarket.grok_tools import execute_polymarket_tool
+
+HOUR_MS = 3_600_000
+
+
+class TestPriceHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.store = PriceHistoryStore(tempfile.mkdtemp())
+        for i, price in enumerate([0.50, 0.55, 0.45, 0.52, 0.60, 0.58]):
+            self.store.append("101", i * 30 * 60_000, price, price, 0.02)
+        self.store.flush()
+
+    def test_range_and_persistence(self):
+        rows = self.store.range("101", 30 * 60_000, 2 * HOUR_MS)
+        np.testing.assert_allclose(rows["price"], [0.55, 0.45, 0.52])
+
+        # out-of-order samples are dropped; reopening reads the same columns
+        self.store.append("101", 0, 0.99)
+        self.store.flush()
+        reopened = PriceHistoryStore(self.store.directory)
+        self.assertEqual(len(reopened.range("101")["ts"]), 6)
+        self.assertEqual(reopened.tokens(), ["101"])
+        self.assertEqual(len(reopened.range("999")["ts"]), 0)
+
+    def test_reopened_store_appends_without_mapping(self):
+        for token in range(200):
+            self.store.append(str(token), 5, 0.5)
+        self.store.flush()
+        reopened = PriceHistoryStore(self.store.directory, max_open=8)
+        for token in range(200):
+            reopened.append(str(token), 6, 0.6)
+            reopened.append(str(token), 4, 0.4)  # older than disk, dropped
+        self.assertEqual(len(reopened.maps), 0)
+        reopened.flush()
+        for token in range(200):
+            reopened.range(str(token))
+        self.assertEqual(len(reopened.maps), 8)
+        np.testing.assert_array_equal(reopened.range("199")["ts"], [5, 6])
+
+    def test_ohlc_and_resample(self):
+        candles = self.store.ohlc("101", HOUR_MS)
+        np.testing.assert_array_equal(candles["ts"], [0, HOUR_MS, 2 * HOUR_MS])
+        np.testing.assert_allclose(candles["open"], [0.50, 0.45, 0.60])
+        np.testing.assert_allclose(candles["high"], [0.55, 0.52, 0.60])
+        np.testing.assert_allclose(candles["low"], [0.50, 0.45, 0.58])
+        np.testing.assert_allclose(candles["close"], [0.55, 0.52, 0.58])
+        np.testing.assert_array_equal(candles["count"], [2, 2, 2])
+        ts, close = self.store.resample("101", 2 * HOUR_MS)
+        np.testing.assert_allclose(close, [0.52, 0.58])
+        self.assertEqual(
+            len(self.store.ohlc("101", HOUR_MS, start=10 * HOUR_MS)["ts"]), 0
+        )
+
+    def test_gamma_sampler(self):
+        n = self.store.sample_gamma_markets(
+            [
+                {
+                    "clobTokenIds": json.dumps(["201", "202"]),
+                    "outcomePrices": json.dumps(["0.3", "0.7"]),
+                    "bestBid": 0.29,
+                    "bestAsk": 0.31,
+                    "spread": 0.02,
+                }
+            ],
+            ts=1000,
+        )
+        self.assertEqual(n, 2)
+        np.testing.assert_allclose(self.store.range("202")["mid"], [0.7])
+
+    def test_feed_sampler(self):
+        sampler = HistorySampler(self.store, min_interval_ms=100)
+        sampler.on_book(BookEvent(10_000_000, "301", [(0.40, 5.0)], [(0.44, 5.0)]))
+        sampler.on_price_change(PriceChangeEvent(10_000_050, "301", BUY, 0.42, 1.0))
+        sampler.on_trade(TradeEvent(10_000_060, "301", BUY, 0.43, 1.0))
+        self.store.flush()
+        rows = self.store.range("301")
+        np.testing.assert_allclose(rows["mid"], [0.42, 0.43])
+        np.testing.assert_allclose(rows["price"], [0.42, 0.43])
+
+    def test_grok_tool(self):
+        result = json.loads(
+            execute_polymarket_tool(
+                "get_polymarket_price_history",
+                {"token_id": "101", "interval": "1h", "lookback_hours": 1e6},
+                None,
+                None,
+                self.store,
+            )
+        )
+        self.assertEqual(len(result["candles"]), 3)
+        self.assertEqual(result["candles"][2]["close"], 0.58)
+
+    def test_token_id_cannot_escape_store(self):
+        for token_id in ("../101", "/tmp/x", "101/..", ""):
+            with self.assertRaises(ValueError):
+                self.store.append(token_id, 0, 0.5)
+        result = json.loads(
+            execute_polymarket_tool(
+                "get_polymarket_price_history",
+                {"token_id": "../../etc"},
+                None,
+                None,
+                self.store,
+            )
+        )
+        self.assertIn("invalid token id", result["error"])
+
+    def test_poll_gamma(self):
+        class Gamma:
+            calls = 0
+
+            def get_all_current_markets(self):
+                Gamma.calls += 1
+                if Gamma.calls == 2:
+                    raise OSError("gamma down")
+                return [
+                    {
+                        "clobTokenIds": json.dumps(["401", "402"]),
+                        "outcomePrices": json.dumps(["0.4", "0.6"]),
+                    }
+                ]
+
+        sleeps = []
+        poll_gamma(self.store, Gamma(), interval=5, iterations=3, sleep=sleeps.append)
+        self.assertEqual(sleeps, [5, 5])
+        np.testing.assert_allclose(self.store.range("402")["price"], [0.6, 0.6])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from agents.utils.http_cache import HTTPCache
+
+
+class GammaStandIn(BaseHTTPRequestHandler):
+    version = 1
+    requests = []
+
+    def do_GET(self):
+        etag = f'"v{GammaStandIn.version}"'
+        GammaStandIn.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        payload = json.dumps([{"id": "1", "version": GammaStandIn.version}]).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHTTPCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), GammaStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/markets"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        GammaStandIn.version = 1
+        GammaStandIn.requests = []
+
+    def test_conditional_get(self):
+        cache = HTTPCache(tempfile.mkdtemp())
+        first = cache.get(self.url, {"limit": 100, "active": "true"})
+        self.assertFalse(first.from_cache)
+        # same params in another order hit the same entry and revalidate
+        second = cache.get(self.url, {"active": "true", "limit": 100})
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(GammaStandIn.requests[-1][1], '"v1"')
+        self.assertEqual((cache.misses, cache.revalidated), (1, 1))
+
+        GammaStandIn.version = 2
+        third = cache.get(self.url, {"active": "true", "limit": 100})
+        self.assertEqual(third.json()[0]["version"], 2)
+
+        # entries within max_age are served without a request
+        fresh = HTTPCache(cache.directory, max_age=60.0)
+        count = len(GammaStandIn.requests)
+        self.assertEqual(
+            fresh.get(self.url, {"active": "true", "limit": 100}).json()[0]["version"],
+            2,
+        )
+        self.assertEqual(len(GammaStandIn.requests), count)
+
+    def test_stale_while_revalidate(self):
+        cache = HTTPCache(tempfile.mkdtemp(), stale_while_revalidate=True)
+        cache.get(self.url)
+        GammaStandIn.version = 2
+        stale = cache.get(self.url)
+        self.assertEqual(stale.json()[0]["version"], 1)
+        cache.wait(5.0)
+        self.assertEqual(cache.get(self.url).json()[0]["version"], 2)
+
+    def test_max_stale_blocks_on_old_entries(self):
+        cache = HTTPCache(
+            tempfile.mkdtemp(), stale_while_revalidate=True, max_stale=60.0
+        )
+        cache.get(self.url)
+        meta, body = cache.load(cache.key(self.url))
+        meta["fetched_at"] -= 3600.0  # left by an earlier run
+        cache.store(cache.key(self.url), meta)
+        GammaStandIn.version = 2
+        response = cache.get(self.url)
+        self.assertFalse(response.from_cache)
+        self.assertEqual(response.json()[0]["version"], 2)
+        self.assertEqual(cache.refreshing, {})
+
+    def test_serves_cache_when_origin_down(self):
+        cache = HTTPCache(tempfile.mkdtemp())
+        down = "http://127.0.0.1:1/markets"
+        with self.assertRaises(Exception):
+            cache.get(down)
+        cache.store(cache.key(down), {"fetched_at": 0.0, "etag": '"v1"'}, b"[1]")
+        response = cache.get(down)
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.json(), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import time
+import unittest
+
+from agents.application.executor import Executor
+from agents.utils.llm_cache import LLMCache
+
+
+class CachedExecutor(Executor):
+    """Executor whose Grok calls are counted instead of made."""
+
+    def __init__(self, directory, bypass_cache=False):
+        self.model = "grok-test"
+        self.llm_cache = LLMCache(directory)
+        self.bypass_cache = bypass_cache
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_key_ignores_whitespace_but_not_data_or_model(self):
+        cache = LLMCache(self.directory)
+        data = [{"id": 1, "outcomePrices": [0.4, 0.6]}]
+        key = cache.key("grok", "Pick  the\n best trade", data)
+        self.assertEqual(key, cache.key("grok", "Pick the best trade", data))
+        moved = [{"id": 1, "outcomePrices": [0.45, 0.55]}]
+        self.assertNotEqual(key, cache.key("grok", "Pick the best trade", moved))
+        self.assertNotEqual(key, cache.key("other", "Pick the best trade", data))
+
+    def test_ttl_expires_entries(self):
+        cache = LLMCache(self.directory, ttl=0.05)
+        cache.put("k", "yes")
+        self.assertEqual(cache.get("k"), "yes")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_executor_reuses_and_bypasses(self):
+        executor = CachedExecutor(self.directory)
+        first = executor.cached_response("prompt", {"id": 1}, executor.compute)
+        again = executor.cached_response(" prompt ", {"id": 1}, executor.compute)
+        self.assertEqual((first, again, executor.calls), ("answer 1", "answer 1", 1))
+
+        executor.bypass_cache = True
+        fresh = executor.cached_response("prompt", {"id": 1}, executor.compute)
+        self.assertEqual((fresh, executor.calls), ("answer 2", 2))
+        # the bypassed result replaces the stored one
+        executor.bypass_cache = False
+        self.assertEqual(
+            executor.cached_response("prompt", {"id": 1}, executor.compute), "answer 2"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import time
+import unittest
+
+from agents.application.executor import Executor
+from agents.utils.rate_limit import RateLimiter
+
+
+class ChunkExecutor(Executor):
+    """Executor with the Grok calls replaced by timed local answers."""
+
+    def __init__(self, delays, max_concurrency=4):
+        self.delays = delays
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(None)
+
+    def process_data_chunk(self, data1, data2, user_input):
+        delay = self.delays[data1[0]]
+        if delay is None:
+            raise RuntimeError("chunk failed")
+        time.sleep(delay)
+        return f"answer {data1[0]}"
+
+
+class TestMapReduce(unittest.TestCase):
+    def test_chunks_run_concurrently_and_stream(self):
+        executor = ChunkExecutor({0: 0.3, 1: 0.05, 2: 0.15, 3: None})
+        chunks = [([i], []) for i in range(4)]
+        start = time.monotonic()
+        results = list(executor.map_chunks(chunks, "q"))
+        elapsed = time.monotonic() - start
+        # completion order, failed chunk skipped, bounded by the slowest chunk
+        self.assertEqual([i for i, _ in results], [1, 2, 0])
+        self.assertLess(elapsed, 0.45)
+
+    def test_rate_limiter_paces_calls(self):
+        limiter = RateLimiter(rate=20.0, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        # two free from the burst, then four at 50ms each
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+
+if __name__ == "__main__":
+    unittest.main()
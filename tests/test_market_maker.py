@@ -0,0 +1,191 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+
+from agents.application.market_maker import (
+    MarketMaker,
+    QuotedMarket,
+    reward_scores,
+    select_markets,
+    target_quotes,
+)
+from agents.polymarket.feed import BUY, SELL, BookEvent, PriceChangeEvent
+from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.table import MarketTable
+from agents.utils.objects import OrderResult
+
+
+def row(i, daily, min_size=100, competitive=0.0, **extra):
+    return dict(
+        {
+            "id": str(i),
+            "conditionId": f"0x{i}",
+            "clobTokenIds": json.dumps([f"yes{i}", f"no{i}"]),
+            "active": True,
+            "closed": False,
+            "enableOrderBook": True,
+            "acceptingOrders": True,
+            "rewardsMinSize": min_size,
+            "rewardsMaxSpread": 3.5,
+            "orderPriceMinTickSize": 0.01,
+            "competitive": competitive,
+            "clobRewards": [{"rewardsDailyRate": daily}] if daily else [],
+        },
+        **extra,
+    )
+
+
+class Exchange:
+    def __init__(self, failures=0):
+        self.posted = []
+        self.cancelled = []
+        self.failures = failures  # batches to reject before accepting any
+
+    def execute_orders(self, legs):
+        self.posted.append([(l.token_id, l.price) for l in legs])
+        if self.failures:
+            self.failures -= 1
+            return [
+                OrderResult(leg=l, success=False, error="rejected", latency_ms=1.0)
+                for l in legs
+            ]
+        return [
+            OrderResult(
+                leg=l,
+                success=True,
+                order_id=f"{l.token_id}-{len(self.posted)}",
+                latency_ms=1.0,
+            )
+            for l in legs
+        ]
+
+    def cancel_orders(self, ids):
+        self.cancelled.extend(ids)
+
+
+class PagedGamma:
+    """Serves `total` market rows through limit / offset pages."""
+
+    def __init__(self, total):
+        self.rows = [row(i, 10) for i in range(total)]
+        self.offsets = []
+
+    def get(self, url, params=None):
+        self.offsets.append(params["offset"])
+        page = self.rows[params["offset"] : params["offset"] + params["limit"]]
+        return SimpleNamespace(status_code=200, json=lambda: page)
+
+
+class ScriptedFeed:
+    def __init__(self, events):
+        self.events = events
+
+    async def run(self, handler):
+        for event in self.events:
+            if isinstance(event, BookEvent):
+                handler.on_book(event)
+            else:
+                handler.on_price_change(event)
+            # let in-flight requotes finish before the next event
+            for _ in range(20):
+                await asyncio.sleep(0)
+
+
+class TestMarketMaker(unittest.TestCase):
+    def test_scores_rank_reward_per_dollar(self):
+        table = MarketTable.from_records(
+            [
+                row(1, 50, min_size=200),
+                row(2, 50, min_size=50),
+                row(3, 0),
+                row(4, 80, min_size=50, competitive=1.0),
+                row(5, 500, acceptingOrders=False),
+            ]
+        )
+        scores = reward_scores(table)
+        self.assertEqual(scores[2], -float("inf"))
+        self.assertEqual(scores[4], -float("inf"))
+        self.assertEqual(list(select_markets(table, 3)["id"]), [2, 4, 1])
+
+    def test_market_table_pages_through_gamma(self):
+        polymarket = Polymarket.__new__(Polymarket)
+        polymarket.gamma_markets_endpoint = "gamma/markets"
+        polymarket.http = PagedGamma(1050)
+        table = polymarket.get_market_table(page_size=500)
+        self.assertEqual(len(table), 1050)
+        self.assertEqual(polymarket.http.offsets, [0, 500, 1000])
+        self.assertEqual(len(polymarket.get_market_table(100, max_markets=250)), 250)
+
+    def test_quotes_stay_in_band_and_off_the_book(self):
+        self.assertEqual(target_quotes(0.48, 0.52, 0.01, 3.5), (0.48, 0.52))
+        self.assertEqual(target_quotes(0.30, 0.50, 0.01, 3.5), (0.38, 0.42))
+        self.assertEqual(target_quotes(0.495, 0.505, 0.001, 2.0, 1.0), (0.48, 0.52))
+        self.assertIsNone(target_quotes(0.0, 0.52, 0.01, 3.5))
+
+    def test_requotes_only_on_meaningful_moves(self):
+        exchange = Exchange()
+        markets = [
+            QuotedMarket(f"0x{i}", f"yes{i}", f"no{i}", 0.01, 100, 3.5)
+            for i in range(300)
+        ]
+        maker = MarketMaker(exchange, markets, requote_ticks=2)
+        events = [
+            BookEvent(0, f"yes{i}", [(0.40, 500)], [(0.60, 500)]) for i in range(300)
+        ]
+        events += [
+            # tighter by a tick each side: the target barely moves
+            PriceChangeEvent(1, "yes0", BUY, 0.41, 100),
+            PriceChangeEvent(2, "yes0", SELL, 0.59, 100),
+            # the market lifts: the quotes are re-centered
+            BookEvent(3, "yes1", [(0.55, 100)], [(0.65, 100)]),
+        ]
+
+        async def main():
+            await maker.run(ScriptedFeed(events))
+
+        asyncio.run(main())
+        self.assertEqual(len(exchange.posted), 301)
+        self.assertEqual(exchange.posted[0], [("yes0", 0.48), ("no0", 0.48)])
+        self.assertEqual(exchange.posted[-1], [("yes1", 0.58), ("no1", 0.38)])
+        # yes0 is only cancelled on shutdown; yes1 was replaced once before that
+        cancelled = [i.split("-")[0] for i in exchange.cancelled]
+        self.assertEqual((cancelled.count("yes0"), cancelled.count("yes1")), (1, 2))
+        stats = maker.latency_percentiles()
+        self.assertEqual(stats["events"], 303)
+        self.assertGreater(stats["p99_us"], 0)
+
+    def test_only_the_drifted_leg_is_replaced(self):
+        exchange = Exchange()
+        market = QuotedMarket("0x0", "yes0", "no0", 0.01, 100, 3.5)
+        maker = MarketMaker(exchange, [market], requote_ticks=1)
+        events = [
+            BookEvent(0, "yes0", [(0.40, 500)], [(0.60, 500)]),
+            # mid 0.505: the bid target stays at 0.48, the ask moves to 0.53
+            PriceChangeEvent(1, "yes0", BUY, 0.41, 100),
+        ]
+        asyncio.run(maker.run(ScriptedFeed(events)))
+        self.assertEqual(
+            exchange.posted,
+            [[("yes0", 0.48), ("no0", 0.48)], [("no0", 0.47)]],
+        )
+        self.assertEqual(exchange.cancelled[0], "no0-1")
+        self.assertEqual(sorted(exchange.cancelled[1:]), ["no0-2", "yes0-1"])
+
+    def test_rejected_quotes_are_retried(self):
+        exchange = Exchange(failures=1)
+        market = QuotedMarket("0x0", "yes0", "no0", 0.01, 100, 3.5)
+        maker = MarketMaker(exchange, [market])
+        events = [
+            BookEvent(0, "yes0", [(0.40, 500)], [(0.60, 500)]),
+            # the best prices do not move, but nothing is resting
+            PriceChangeEvent(1, "yes0", BUY, 0.30, 10),
+        ]
+        asyncio.run(maker.run(ScriptedFeed(events)))
+        self.assertEqual(len(exchange.posted), 2)
+        self.assertEqual(market.bid, (0.48, "yes0-2"))
+        self.assertEqual(market.ask, (0.52, "no0-2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import json
+import tempfile
+import unittest
+import zlib
+
+import numpy as np
+
+from agents.application.arbitrage import PairRegistry
+from agents.application.matcher import MarketMatcher
+
+
+class HashingRAG:
+    """Bag-of-words hashing embedder standing in for PolymarketRAG."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_texts(self, texts):
+        self.calls += len(texts)
+        vectors = np.zeros((len(texts), 64))
+        for i, text in enumerate(texts):
+            for word in text.lower().replace("?", "").split():
+                vectors[i, zlib.crc32(word.encode()) % 64] += 1.0
+        return vectors.tolist()
+
+
+def poly_market(id, question, end, category="politics"):
+    return {
+        "id": id,
+        "question": question,
+        "endDate": end,
+        "category": category,
+        "outcomes": json.dumps(["Yes", "No"]),
+        "clobTokenIds": json.dumps([f"{id}-yes", f"{id}-no"]),
+    }
+
+
+def kalshi_market(ticker, title, close, category="politics"):
+    return {"ticker": ticker, "title": title, "close_time": close, "category": category}
+
+
+class TestMarketMatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.rag = HashingRAG()
+
+    def matcher(self):
+        return MarketMatcher(
+            rag=self.rag,
+            registry=PairRegistry(local_file_path=None),
+            local_directory=self.directory,
+            min_similarity=0.8,
+        )
+
+    def test_blocked_match_with_rules(self):
+        poly = [
+            poly_market(
+                "1", "Will the Fed cut rates in March 2025?", "2025-03-20T00:00:00Z"
+            ),
+            poly_market(
+                "2", "Will inflation be above 3% in 2025?", "2025-12-31T00:00:00Z"
+            ),
+            poly_market(
+                "3",
+                "Will the Fed cut rates in March 2025?",
+                "2025-03-20T00:00:00Z",
+                "sports",
+            ),
+        ]
+        kalshi = [
+            kalshi_market(
+                "FED-MAR",
+                "Will the Fed cut rates in March 2025?",
+                "2025-03-19T18:00:00Z",
+            ),
+            # same words, different threshold: rejected by the number rule
+            kalshi_market(
+                "CPI-4", "Will inflation be above 4% in 2025?", "2025-12-31T00:00:00Z"
+            ),
+        ]
+        matcher = self.matcher()
+        pairs = matcher.match(poly, kalshi)
+        self.assertEqual(
+            [(p.kalshi_ticker, p.polymarket_yes_token_id) for p in pairs],
+            [("FED-MAR", "1-yes")],
+        )
+
+    def test_runner_up_tried_when_best_hit_is_rejected(self):
+        poly = [
+            poly_market(
+                "5", "Will inflation be above 5% in 2025?", "2025-12-31T00:00:00Z"
+            )
+        ]
+        # rungs of one ladder embed identically, so the 4% rung can rank first
+        kalshi = [
+            kalshi_market(
+                f"CPI-{n}",
+                f"Will inflation be above {n}% in 2025?",
+                "2025-12-31T00:00:00Z",
+            )
+            for n in (4, 5, 6)
+        ]
+        matcher = self.matcher()
+        pairs = matcher.match(poly, kalshi)
+        self.assertEqual([p.kalshi_ticker for p in pairs], ["CPI-5"])
+
+        # with top_k=1 the other rungs are never tried, so the market stays
+        # open and is scored again by the next run
+        self.directory = tempfile.mkdtemp()
+        matcher = self.matcher()
+        matcher.top_k = 1
+        poly[0]["question"] = "Will inflation be above 7% in 2025?"
+        self.assertEqual(matcher.match(poly, kalshi), [])
+        self.assertNotIn("5", matcher.index.seen_polymarket)
+        self.assertEqual(len(matcher.index.seen_kalshi), 3)
+
+    def test_index_only_rematches_new_markets(self):
+        poly = [
+            poly_market(
+                "1", "Will the Fed cut rates in March 2025?", "2025-03-20T00:00:00Z"
+            )
+        ]
+        kalshi = [
+            kalshi_market(
+                "FED-MAR",
+                "Will the Fed cut rates in March 2025?",
+                "2025-03-20T00:00:00Z",
+            )
+        ]
+        self.matcher().match(poly, kalshi)
+        embedded = self.rag.calls
+
+        # warm start from disk: nothing new, nothing embedded, nothing matched
+        self.assertEqual(self.matcher().match(poly, kalshi), [])
+        self.assertEqual(self.rag.calls, embedded)
+
+        poly.append(
+            poly_market(
+                "9", "Will the ECB cut rates in April 2025?", "2025-04-10T00:00:00Z"
+            )
+        )
+        kalshi.append(
+            kalshi_market(
+                "ECB-APR",
+                "Will the ECB cut rates in April 2025?",
+                "2025-04-10T00:00:00Z",
+            )
+        )
+        pairs = self.matcher().match(poly, kalshi)
+        self.assertEqual([p.kalshi_ticker for p in pairs], ["ECB-APR"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from eth_abi import decode, encode
+from web3 import Web3
+
+from agents.polymarket.multicall import (
+    AGGREGATE3,
+    MULTICALL3_ADDRESS,
+    Call,
+    Multicall,
+    selector,
+)
+from agents.polymarket.polymarket import Polymarket
+
+OWNER = "0x00000000000000000000000000000000000000aa"
+USDC = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+CTF = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
+
+
+def usdc_call(fn, args):
+    if fn == selector("balanceOf(address)"):
+        return encode(["uint256"], [12_500_000])
+    if fn == selector("allowance(address,address)"):
+        owner, spender = decode(["address", "address"], args)
+        approved = spender.lower() != "0xd91e80cf2e7be2e162c6513ced06f1dd0da35296"
+        return encode(["uint256"], [2**256 - 1 if approved else 0])
+
+
+def ctf_call(fn, args):
+    if fn == selector("isApprovedForAll(address,address)"):
+        return encode(["bool"], [True])
+    if fn == selector("balanceOf(address,uint256)"):
+        owner, token_id = decode(["address", "uint256"], args)
+        balance = {1: 3_000_000, 2: 0}.get(token_id)
+        return None if balance is None else encode(["uint256"], [balance])
+
+
+def multicall_call(fn, args):
+    if fn == selector("getEthBalance(address)"):
+        return encode(["uint256"], [2 * 10**17])
+
+
+CONTRACTS = {
+    USDC.lower(): usdc_call,
+    CTF.lower(): ctf_call,
+    MULTICALL3_ADDRESS.lower(): multicall_call,
+}
+
+
+class EVMStandIn(BaseHTTPRequestHandler):
+    """JSON-RPC node answering eth_chainId and Multicall3 `aggregate3` calls."""
+
+    requests = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if body["method"] == "eth_chainId":
+            return self.reply(body, hex(137))
+        EVMStandIn.requests += 1
+        tx = body["params"][0]
+        data = bytes.fromhex(tx["data"][2:])
+        assert tx["to"].lower() == MULTICALL3_ADDRESS.lower()
+        assert data[:4] == AGGREGATE3
+        results = []
+        for target, allow_failure, calldata in decode(
+            ["(address,bool,bytes)[]"], data[4:]
+        )[0]:
+            handler = CONTRACTS.get(target.lower())
+            out = handler(calldata[:4], calldata[4:]) if handler else None
+            results.append((out is not None, out or b""))
+        self.reply(body, "0x" + encode(["(bool,bytes)[]"], [results]).hex())
+
+    def reply(self, body, result):
+        payload = json.dumps({"jsonrpc": "2.0", "id": body["id"], "result": result})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class TestMulticall(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), EVMStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.web3 = Web3(Web3.HTTPProvider(url))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def test_portfolio_state_in_one_round_trip(self):
+        polymarket = Polymarket.__new__(Polymarket)
+        polymarket._address = Web3.to_checksum_address(OWNER)
+        polymarket.usdc_address = USDC
+        polymarket.ctf_address = CTF
+        polymarket.exchange_address = "0x4bfb41d5b3570defd03c39a9a4d8de6bd8b8982e"
+        polymarket.neg_risk_exchange_address = (
+            "0xC5d563A36AE78145C45a50134d48A1215220f80a"
+        )
+        polymarket.neg_risk_adapter_address = (
+            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
+        )
+        polymarket.multicall = Multicall(self.web3)
+
+        before = EVMStandIn.requests
+        state = polymarket.get_onchain_state(["1", "2", "3"])
+        self.assertEqual(EVMStandIn.requests - before, 1)
+
+        self.assertEqual(state["usdc"], 12.5)
+        self.assertEqual(state["matic"], 0.2)
+        self.assertEqual(state["allowances"]["neg_risk_adapter"], 0)
+        self.assertGreater(state["allowances"]["exchange"], 1e60)
+        self.assertTrue(all(state["approved"].values()))
+        # token 3 reverts in the stand-in; allow_failure turns it into None
+        self.assertEqual(state["positions"], {"1": 3.0, "2": 0.0, "3": None})
+
+    def test_batches_are_split(self):
+        reader = Multicall(self.web3, batch_size=2)
+        calls = [Call(USDC, "balanceOf(address)", [OWNER]) for _ in range(5)]
+        before = EVMStandIn.requests
+        self.assertEqual(reader.call(calls), [12_500_000] * 5)
+        self.assertEqual(EVMStandIn.requests - before, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
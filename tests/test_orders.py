@@ -0,0 +1,97 @@
+import unittest
+
+from agents.polymarket.orders import OrderManager
+
+
+class PollingClient:
+    def __init__(self, open_orders, orders):
+        self.open_orders = open_orders
+        self.orders = orders
+
+    def get_orders(self):
+        return self.open_orders
+
+    def get_order(self, order_id):
+        return self.orders[order_id]
+
+
+class TestOrderManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = OrderManager()
+        self.manager.track({"orderID": "a", "status": "live"}, "yes", 0.4, 10, "BUY")
+        self.manager.track({"orderID": "b", "status": "live"}, "no", 0.7, 5, "SELL")
+
+    def test_partial_fill_from_trades_and_orders_counts_once(self):
+        trade = {
+            "event_type": "trade",
+            "id": "t1",
+            "status": "MATCHED",
+            "taker_order_id": "x",
+            "maker_orders": [{"order_id": "a", "matched_amount": "4"}],
+        }
+        self.manager.handle(trade)
+        self.manager.handle(dict(trade, status="CONFIRMED"))
+        self.manager.handle(
+            {"event_type": "order", "id": "a", "type": "UPDATE", "size_matched": "4"}
+        )
+        self.assertEqual(self.manager.position("yes"), 4.0)
+        order = self.manager.order("a")
+        self.assertTrue(order.is_open)
+        self.assertEqual(order.remaining, 6.0)
+
+    def test_cancel_and_full_fill_close_orders(self):
+        self.manager.handle({"event_type": "order", "id": "b", "type": "CANCELLATION"})
+        self.manager.handle(
+            {"event_type": "order", "id": "a", "type": "UPDATE", "size_matched": "10"}
+        )
+        self.assertEqual(self.manager.open_orders(), [])
+        self.assertEqual(self.manager.order("a").status, "MATCHED")
+        self.assertEqual(self.manager.position("no"), 0.0)
+
+    def test_reconcile_picks_up_fills_while_disconnected(self):
+        client = PollingClient(
+            open_orders=[
+                {
+                    "id": "c",
+                    "asset_id": "yes",
+                    "side": "BUY",
+                    "price": "0.3",
+                    "original_size": "8",
+                    "size_matched": "0",
+                    "status": "LIVE",
+                }
+            ],
+            orders={
+                "a": {"id": "a", "status": "MATCHED", "size_matched": "10"},
+                "b": {"id": "b", "status": "CANCELED", "size_matched": "2"},
+            },
+        )
+        self.manager.reconcile(client)
+        self.assertEqual([o.order_id for o in self.manager.open_orders("yes")], ["c"])
+        self.assertEqual(self.manager.position("yes"), 10.0)
+        self.assertEqual(self.manager.position("no"), -2.0)
+
+    def test_matched_response_books_only_the_matched_size(self):
+        # a FAK buy of 10 that only took 3 shares for 1.2 USDC
+        response = {
+            "orderID": "m",
+            "status": "matched",
+            "makingAmount": "1.2",
+            "takingAmount": "3",
+        }
+        self.manager.track(response, "yes", 0.4, 10, "BUY")
+        self.assertEqual(self.manager.position("yes"), 3.0)
+        self.manager.handle(
+            {
+                "event_type": "trade",
+                "id": "t9",
+                "taker_order_id": "m",
+                "size": "3",
+                "maker_orders": [],
+            }
+        )
+        self.assertEqual(self.manager.position("yes"), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from types import SimpleNamespace
+
+from eth_account import Account
+
+from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.presign import PresignedOrderPool
+
+
+class SigningClient:
+    """Records create_order / post_order calls instead of talking to the CLOB."""
+
+    def __init__(self):
+        self.signed = 0
+        self.posted = []
+
+    def create_order(self, args):
+        self.signed += 1
+        return (args.token_id, args.price, args.size, args.side, self.signed)
+
+    def post_order(self, order, orderType=None):
+        self.posted.append(order)
+        return {"success": True}
+
+
+class TestPresignedOrderPool(unittest.TestCase):
+    def test_watched_levels_are_signed_ahead(self):
+        client = SigningClient()
+        pool = PresignedOrderPool(client, depth=2)
+        pool.watch("tok", [0.45, 0.5], size=10, side="BUY")
+        self.assertEqual(client.signed, 4)
+
+        pool.post("tok", 0.5, 10, "BUY")
+        pool.post("tok", 0.5, 10, "BUY")
+        self.assertEqual(pool.hits, 2)
+        # each signed order is posted once, then replaced in the background
+        self.assertEqual(len(set(client.posted)), 2)
+        pool.wait()
+        self.assertEqual(client.signed, 6)
+        self.assertEqual(len(pool.orders[("tok", 0.5, 10.0, "BUY")]), 2)
+
+    def test_unwatched_order_is_signed_on_demand(self):
+        client = SigningClient()
+        pool = PresignedOrderPool(client)
+        pool.post("tok", 0.3, 5, "SELL")
+        self.assertEqual((pool.misses, client.signed), (1, 1))
+        self.assertEqual(client.posted[0][:4], ("tok", 0.3, 5.0, "SELL"))
+
+
+class TestOrderBuilderCache(unittest.TestCase):
+    def test_builder_and_address_are_reused(self):
+        account = Account.create()
+        polymarket = Polymarket.__new__(Polymarket)
+        polymarket.private_key = account.key.hex()
+        polymarket.exchange_address = "0x4bfb41d5b3570defd03c39a9a4d8de6bd8b8982e"
+        polymarket.chain_id = 137
+        polymarket.w3 = SimpleNamespace(eth=SimpleNamespace(account=Account))
+        polymarket._address = None
+        polymarket._order_builder = None
+        polymarket.order_nonce = 0
+
+        first = polymarket.build_order("123", 1000000)
+        second = polymarket.build_order("123", 1000000)
+        self.assertIs(polymarket.get_order_builder(), polymarket._order_builder)
+        self.assertEqual(polymarket.get_address_for_private_key(), account.address)
+        self.assertEqual(first.order["nonce"], 0)
+        self.assertEqual(second.order["nonce"], 0)
+        self.assertNotEqual(first.order["salt"], second.order["salt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from agents.polymarket.feed import (
+    BookEvent,
+    PriceChangeEvent,
+    TradeEvent,
+    BUY,
+    SELL,
+    parse_message,
+)
+from agents.polymarket.recorder import Recorder
+from agents.polymarket.replay import ReplayEngine
+
+DAY_MS = 86_400_000
+T0 = 1_735_689_600_000  # 2025-01-01T00:00:00Z
+
+
+def sample_events():
+    return [
+        BookEvent(T0 + 1, "yes", [(0.48, 100.0), (0.47, 50.0)], [(0.52, 80.0)]),
+        PriceChangeEvent(T0 + 2, "yes", BUY, 0.49, 10.0),
+        TradeEvent(T0 + 3, "no", SELL, 0.51, 5.0),
+        BookEvent(T0 + DAY_MS + 5, "no", [], [(0.55, 1.0)]),
+        TradeEvent(T0 + DAY_MS + 6, "yes", BUY, 0.5, 2.5),
+    ]
+
+
+class Collector:
+    def __init__(self):
+        self.events = []
+
+    def on_book(self, event):
+        self.events.append(event)
+
+    def on_price_change(self, event):
+        self.events.append(event)
+
+    def on_trade(self, event):
+        self.events.append(event)
+
+
+class TestRecorderReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with Recorder(self.directory, block_rows=3) as recorder:
+            for event in sample_events():
+                recorder.record(event)
+
+    def test_partitioned_by_day(self):
+        self.assertEqual(
+            sorted(os.listdir(self.directory)), ["2025-01-01.ticks", "2025-01-02.ticks"]
+        )
+
+    def test_round_trip(self):
+        collector = Collector()
+        self.assertEqual(ReplayEngine(self.directory).replay(collector), 5)
+        self.assertEqual(collector.events, sample_events())
+
+    def test_async_replay_filters(self):
+        async def collect():
+            engine = ReplayEngine(self.directory, start_day="2025-01-02")
+            return [e async for e in engine.events()]
+
+        self.assertEqual(asyncio.run(collect()), sample_events()[3:])
+
+        engine = ReplayEngine(self.directory, asset_ids=["no"])
+        self.assertEqual(
+            list(engine.iter_events()), [sample_events()[2], sample_events()[3]]
+        )
+
+    def test_parse_market_channel_messages(self):
+        events = parse_message(
+            {
+                "event_type": "book",
+                "asset_id": "yes",
+                "timestamp": str(T0),
+                "bids": [{"price": "0.48", "size": "100"}],
+                "asks": [],
+            }
+        )
+        self.assertEqual(events, [BookEvent(T0, "yes", [(0.48, 100.0)], [])])
+        events = parse_message(
+            {
+                "event_type": "price_change",
+                "timestamp": str(T0),
+                "price_changes": [
+                    {"asset_id": "yes", "price": "0.5", "size": "0", "side": "SELL"}
+                ],
+            }
+        )
+        self.assertEqual(events, [PriceChangeEvent(T0, "yes", SELL, 0.5, 0.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
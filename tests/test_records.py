@@ -0,0 +1,75 @@
+import json
+import unittest
+
+from agents.polymarket.polymarket import Polymarket
+from agents.utils.objects import SimpleEvent, SimpleMarket
+from agents.utils.records import (
+    EventRecord,
+    MarketRecord,
+    decode_events,
+    decode_markets,
+)
+
+MARKET = {
+    "id": "12",
+    "question": "Will it rain?",
+    "endDate": "2025-01-01T00:00:00Z",
+    "description": "Resolves YES if it rains.",
+    "active": True,
+    "funded": False,
+    "rewardsMinSize": 50,
+    "rewardsMaxSpread": "3.5",
+    "spread": 0.02,
+    "outcomes": '["Yes", "No"]',
+    "outcomePrices": '["0.4", "0.6"]',
+    "clobTokenIds": '["1", "2"]',
+}
+EVENT = {
+    "id": "7",
+    "ticker": "rain",
+    "slug": "rain",
+    "title": "Rain",
+    "active": True,
+    "closed": False,
+    "archived": False,
+    "new": False,
+    "featured": True,
+    "restricted": False,
+    "endDate": "2025-01-01T00:00:00Z",
+    "markets": [{"id": "12"}, {"id": "13"}],
+}
+
+
+class TestRecords(unittest.TestCase):
+    def test_same_fields_as_pydantic_path(self):
+        [market] = decode_markets(json.dumps([MARKET]).encode())
+        expected = SimpleMarket(**Polymarket.map_api_to_market(None, MARKET))
+        self.assertEqual(market.dict(), expected.model_dump())
+        self.assertEqual(market.rewardsMaxSpread, 3.5)
+        self.assertEqual(market.outcomes, ["Yes", "No"])
+        self.assertEqual(market.outcome_prices, [0.4, 0.6])
+        self.assertEqual(market.clob_token_ids, ["1", "2"])
+
+        [event] = decode_events(json.dumps([EVENT]).encode())
+        expected = SimpleEvent(**Polymarket.map_api_to_event(None, EVENT))
+        self.assertEqual(event.dict(), expected.model_dump())
+        self.assertEqual(event.description, "")
+        self.assertEqual(event.markets, "12,13")
+
+    def test_invalid_rows_skipped(self):
+        missing = dict(MARKET, id="13")
+        del missing["spread"]
+        wrong_type = dict(MARKET, id="14", question=None)
+        markets = decode_markets(json.dumps([missing, MARKET, wrong_type]).encode())
+        self.assertEqual([m.id for m in markets], [12])
+
+    def test_compact_records(self):
+        market = MarketRecord.from_api(MARKET)
+        self.assertFalse(hasattr(market, "__dict__"))
+        self.assertEqual(MarketRecord(**market.dict()), market)
+        with self.assertRaises(TypeError):
+            EventRecord(id=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
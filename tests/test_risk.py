@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+from agents.application.trade import Trader
+from agents.polymarket.batch import BatchOrderClient
+from agents.polymarket.orders import OrderManager
+from agents.polymarket.risk import RiskEngine, RiskLimits, RiskRejected
+from agents.utils.objects import OrderLeg
+
+
+class PostingClient:
+    def __init__(self):
+        self.posted = []
+
+    def create_order(self, args):
+        return {"token_id": args.token_id, "price": args.price}
+
+    def post_order(self, order, orderType=None):
+        if order["price"] > 0.9:
+            return {"success": False, "errorMsg": "not enough balance"}
+        self.posted.append(order["token_id"])
+        return {"success": True, "orderID": f"id-{order['token_id']}", "status": "live"}
+
+
+class TestRiskEngine(unittest.TestCase):
+    def test_market_and_event_exposure(self):
+        risk = RiskEngine(RiskLimits(max_market_exposure=10, max_event_exposure=15))
+        risk.register("yes", "m1", "e1")
+        risk.register("no", "m1", "e1")
+        risk.register("other", "m2", "e1")
+        risk.check("yes", 0.4, 20)  # 8 USDC
+        with self.assertRaises(RiskRejected):
+            risk.check("no", 0.5, 6)  # 11 in m1
+        risk.check("other", 0.5, 12)  # 6 in m2, 14 in e1
+        with self.assertRaises(RiskRejected) as rejected:
+            risk.check("other", 0.5, 4)
+        self.assertIn("event e1", rejected.exception.reason)
+        # selling only reduces exposure, so it passes whatever the limits
+        risk.check("yes", 0.45, 20, "SELL")
+        self.assertAlmostEqual(risk.market_exposure["m1"], -1.0)
+        risk.release("yes", 0.45, 20, "SELL")
+        self.assertAlmostEqual(risk.event_exposure["e1"], 14.0)
+
+    def test_check_all_is_all_or_nothing(self):
+        risk = RiskEngine(RiskLimits(max_order_size=10))
+        legs = [
+            OrderLeg(token_id="a", price=0.5, size=5),
+            OrderLeg(token_id="b", price=0.5, size=50),
+        ]
+        with self.assertRaises(RiskRejected):
+            risk.check_all(legs)
+        self.assertEqual(risk.market_exposure, {"a": 0.0})
+        self.assertEqual(risk.side_exposure["BUY"], 0.0)
+        self.assertEqual(risk.orders_today, 0)
+        self.assertEqual(risk.rejected, 1)
+
+    def test_daily_loss_trips_kill_switch_and_is_audited(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "risk.jsonl")
+            with RiskEngine(RiskLimits(max_daily_loss=5), audit_path=path) as risk:
+                risk.check("yes", 0.6, 20)
+                risk.on_fill("yes", "BUY", 0.6, 20)
+                risk.check("yes", 0.3, 20, "SELL")
+                risk.on_fill("yes", "SELL", 0.3, 20)
+                self.assertAlmostEqual(risk.daily_pnl, -6.0)
+                self.assertIn("daily loss", risk.halted)
+                with self.assertRaises(RiskRejected):
+                    risk.check("other", 0.5, 1)
+                risk.resume()
+                # the loss still blocks new orders until the day rolls over
+                with self.assertRaises(RiskRejected):
+                    risk.check("other", 0.5, 1)
+            self.assertIsNone(risk.audit_file)
+            with open(path) as f:
+                actions = [json.loads(line)["action"] for line in f]
+        self.assertEqual(
+            actions, ["accept", "accept", "halt", "reject", "resume", "reject"]
+        )
+
+    def test_order_rate_and_amount_cap(self):
+        risk = RiskEngine(
+            RiskLimits(max_orders_per_second=1, order_burst=2, max_order_notional=25)
+        )
+        risk.check("a", 0.5, 1)
+        risk.check("a", 0.5, 1)
+        with self.assertRaises(RiskRejected):
+            risk.check("a", 0.5, 1)
+        self.assertEqual(risk.cap_notional(100.0), 25)
+        self.assertEqual(risk.cap_notional("12.5"), 12.5)
+        with self.assertRaises(RiskRejected):
+            risk.cap_notional(float("nan"))
+
+    def test_check_latency(self):
+        risk = RiskEngine(
+            RiskLimits(max_market_exposure=1e12, max_order_size=1e6, max_daily_loss=1e6)
+        )
+        for i in range(1000):
+            risk.register(str(i), f"m{i % 50}", f"e{i % 5}")
+        start = time.perf_counter()
+        for i in range(10_000):
+            risk.check(str(i % 1000), 0.5, 10)
+        self.assertLess((time.perf_counter() - start) / 10_000, 100e-6)
+
+
+class TestRiskIntegration(unittest.TestCase):
+    def test_batch_releases_failed_legs_and_rejects_before_signing(self):
+        client = PostingClient()
+        risk = RiskEngine(RiskLimits(max_market_exposure=10))
+        batch = BatchOrderClient(client, risk=risk)
+        results = batch.post(
+            [
+                OrderLeg(token_id="a", price=0.5, size=10),
+                OrderLeg(token_id="b", price=0.95, size=10),
+            ]
+        )
+        self.assertEqual([r.success for r in results], [True, False])
+        self.assertEqual(risk.market_exposure, {"a": 5.0, "b": 0.0})
+
+        results = batch.post([OrderLeg(token_id="a", price=0.5, size=12)])
+        self.assertFalse(results[0].success)
+        self.assertIn("exposure", results[0].error)
+        self.assertEqual(client.posted, ["a"])
+
+    def test_cancel_releases_unfilled_rest(self):
+        risk = RiskEngine()
+        manager = OrderManager(risk)
+        risk.check("yes", 0.4, 10)
+        manager.track({"orderID": "o", "status": "live"}, "yes", 0.4, 10, "BUY")
+        manager.handle(
+            {"event_type": "order", "id": "o", "type": "UPDATE", "size_matched": "4"}
+        )
+        manager.on_cancel({"canceled": ["o"], "not_canceled": {}})
+        self.assertAlmostEqual(risk.market_exposure["yes"], 1.6)
+        self.assertEqual(risk.holdings["yes"], [4.0, 1.6])
+        # a later cancellation message from the user channel is not counted again
+        manager.handle({"event_type": "order", "id": "o", "type": "CANCELLATION"})
+        self.assertAlmostEqual(risk.market_exposure["yes"], 1.6)
+
+    def test_trader_does_not_retry_a_risk_rejection(self):
+        class Agent:
+            calls = 0
+
+            def filter_events_with_rag(self, events):
+                Agent.calls += 1
+                return events
+
+            def map_filtered_events_to_markets(self, events):
+                return events
+
+            def filter_markets(self, markets):
+                return markets
+
+            def source_best_trade(self, market):
+                return "price:0.5, size:0.0, side:BUY"
+
+            def format_trade_prompt_for_execution(self, best_trade):
+                return 0.0
+
+        trader = Trader.__new__(Trader)
+        trader.polymarket = SimpleNamespace(
+            risk=RiskEngine(), get_all_tradeable_events=lambda: ["event"]
+        )
+        trader.agent = Agent()
+        trader.pre_trade_logic = lambda: None
+        trader.one_best_trade()
+        self.assertEqual(Agent.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
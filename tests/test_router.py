@@ -0,0 +1,115 @@
+import unittest
+from types import SimpleNamespace
+
+from agents.polymarket.batch import BatchOrderClient
+from agents.polymarket.orders import OrderManager
+from agents.polymarket.router import SmartOrderRouter, estimate_fill
+
+ASKS = [(0.52, 100.0), (0.50, 40.0), (0.55, 1000.0)]
+BIDS = [(0.48, 30.0), (0.47, 200.0)]
+
+
+def level(price, size):
+    return SimpleNamespace(price=str(price), size=str(size))
+
+
+class Exchange:
+    """Signs instantly and fills FAK children while they fit the book."""
+
+    def __init__(self):
+        self.signed = 0
+        self.posted = []
+
+    def create_order(self, args):
+        self.signed += 1
+        return args
+
+    def post_order(self, order, orderType=None):
+        self.posted.append((order.price, order.size, orderType))
+        # the 0.50 level has been taken by someone else before slice two
+        if order.price == 0.50 and len(self.posted) > 2:
+            return {"success": True, "orderID": "x", "status": "unmatched"}
+        return {
+            "success": True,
+            "orderID": f"o{len(self.posted)}",
+            "status": "matched",
+            "makingAmount": str(order.price * order.size),
+            "takingAmount": str(order.size),
+        }
+
+
+class Market:
+    def __init__(self, asks=ASKS):
+        self.client = Exchange()
+        self.batch = BatchOrderClient(self.client)
+        self.orders = OrderManager()
+        self.asks = asks
+
+    def get_orderbook(self, token_id):
+        return SimpleNamespace(
+            asks=[level(*l) for l in self.asks],
+            bids=[level(*l) for l in BIDS],
+            min_order_size="5",
+        )
+
+
+class TestSmartOrderRouter(unittest.TestCase):
+    def test_estimate_walks_levels(self):
+        buy = estimate_fill(sorted(ASKS), 50.0, "BUY")
+        self.assertEqual(buy.fills, [(0.50, 40.0), (0.52, 57.69)])
+        self.assertTrue(buy.complete)
+        self.assertAlmostEqual(buy.slippage_bps, 236.2, places=1)
+
+        sell = estimate_fill(
+            sorted(BIDS, reverse=True), 100.0, "SELL", limit_price=0.475
+        )
+        self.assertEqual(sell.fills, [(0.48, 30.0)])
+        self.assertFalse(sell.complete)
+
+    def test_twap_iceberg_children_are_presigned(self):
+        market = Market()
+        router = SmartOrderRouter(market)
+        plan = router.plan("tok", 50.0, "BUY", slices=2, display_size=20)
+        self.assertEqual(market.client.signed, len(plan.children))
+        self.assertEqual(
+            [(c.slice, c.leg.price, c.leg.size) for c in plan.children],
+            [
+                (0, 0.50, 20.0),
+                (1, 0.50, 20.0),
+                (0, 0.52, 20.0),
+                (0, 0.52, 8.84),
+                (1, 0.52, 20.0),
+                (1, 0.52, 8.85),
+            ],
+        )
+
+        sleeps = []
+        report = router.execute(plan, sleep=sleeps.append)
+        self.assertEqual(sleeps, [])  # interval 0
+        self.assertEqual(market.client.posted[0][2], "FAK")
+        self.assertAlmostEqual(report["filled_shares"], 77.69)
+        self.assertGreater(
+            report["realized_slippage_bps"], report["expected_slippage_bps"]
+        )
+        self.assertAlmostEqual(market.orders.position("tok"), 77.69)
+
+    def test_children_never_below_min_order_size(self):
+        # 3 shares at 0.50 cannot make a 5-share order; 12 at 0.52 with a
+        # display of 5 would otherwise leave a 2-share tail
+        market = Market(asks=[(0.50, 3.0), (0.52, 12.0), (0.60, 1000.0)])
+        plan = SmartOrderRouter(market).plan(
+            "tok", 7.74, "BUY", display_size=5, limit_price=0.52
+        )
+        self.assertEqual(
+            [(c.leg.price, c.leg.size) for c in plan.children],
+            [(0.52, 5.0), (0.52, 7.0)],
+        )
+
+    def test_slippage_cap(self):
+        router = SmartOrderRouter(Market(), max_slippage_bps=100)
+        with self.assertRaises(ValueError):
+            router.plan("tok", 50.0, "BUY")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from agents.utils.rpc import AsyncRPCPool, RPCError
+
+
+class DownNode(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class NodeStandIn(BaseHTTPRequestHandler):
+    """Answers JSON-RPC batches; receipts appear on the second poll."""
+
+    posts = []
+    polls = {}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        NodeStandIn.posts.append(len(body))
+        replies = [self.answer(r) for r in body]
+        payload = json.dumps(replies).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def answer(self, request):
+        method, params = request["method"], request["params"]
+        reply = {"jsonrpc": "2.0", "id": request["id"]}
+        if method == "eth_blockNumber":
+            reply["result"] = "0x10"
+        elif method == "eth_sendRawTransaction":
+            reply["result"] = "0xhash" + params[0][2:]
+        elif method == "eth_getTransactionReceipt":
+            polls = NodeStandIn.polls[params[0]] = (
+                NodeStandIn.polls.get(params[0], 0) + 1
+            )
+            reply["result"] = {"transactionHash": params[0]} if polls > 1 else None
+        else:
+            reply["error"] = {"code": -32601, "message": "method not found"}
+        return reply
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(handler):
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+class TestAsyncRPCPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.down, cls.down_url = serve(DownNode)
+        cls.node, cls.node_url = serve(NodeStandIn)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.down.shutdown()
+        cls.node.shutdown()
+
+    def setUp(self):
+        NodeStandIn.posts = []
+        NodeStandIn.polls = {}
+
+    def test_concurrent_requests_share_one_batch_after_failover(self):
+        pool = AsyncRPCPool([self.down_url, self.node_url])
+
+        async def main():
+            results = await asyncio.gather(
+                *[pool.request("eth_blockNumber") for _ in range(5)],
+                pool.request("eth_nope"),
+                return_exceptions=True,
+            )
+            await pool.close()
+            return results
+
+        results = asyncio.run(main())
+        self.assertEqual(results[:5], ["0x10"] * 5)
+        self.assertIsInstance(results[5], RPCError)
+        self.assertEqual(NodeStandIn.posts, [6])
+        # the failed endpoint is benched for the next call
+        self.assertEqual(pool.endpoints(), [self.node_url])
+
+    def test_send_and_wait_pipelines_transactions(self):
+        pool = AsyncRPCPool([self.node_url])
+
+        async def main():
+            receipts = await pool.send_and_wait([b"\x01", b"\x02", b"\x03"], poll=0.01)
+            await pool.close()
+            return receipts
+
+        receipts = asyncio.run(main())
+        self.assertEqual(
+            [r["transactionHash"] for r in receipts],
+            ["0xhash01", "0xhash02", "0xhash03"],
+        )
+        # one submission batch and two receipt polls, whatever the tx count
+        self.assertEqual(NodeStandIn.posts, [3, 3, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from agents.polymarket.multicall import encode_call
+from agents.polymarket.settlement import SettlementEngine
+
+RESOLVED = "0x" + "11" * 32
+OPEN = "0x" + "22" * 32
+NEG_RISK = "0x" + "33" * 32
+EMPTY = "0x" + "44" * 32
+
+
+class ChainState:
+    """multicall.call_named stand-in over fixed payouts and balances."""
+
+    payouts = {RESOLVED: 1, NEG_RISK: 1}
+    balances = {1: 5_000_000, 2: 0, 3: 4_000_000, 4: 2_500_000, 5: 7_000_000, 7: 0}
+
+    def __init__(self):
+        self.batches = 0
+
+    def call_named(self, calls):
+        self.batches += 1
+        values = {}
+        for key, call in calls.items():
+            if call.signature.startswith("payoutDenominator"):
+                values[key] = self.payouts.get("0x" + call.args[0].hex(), 0)
+            else:
+                values[key] = self.balances.get(call.args[1], 0)
+        return values
+
+
+class Wallet:
+    ctf_address = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
+    usdc_address = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+    neg_risk_adapter_address = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
+
+    def __init__(self):
+        self.multicall = ChainState()
+        self.sent = []
+
+    def get_address_for_private_key(self):
+        return "0x00000000000000000000000000000000000000aa"
+
+    def send_transactions(self, txs):
+        self.sent.append(txs)
+        return [{"status": 1}] * len(txs)
+
+
+POSITIONS = [
+    {"conditionId": RESOLVED, "asset": "1", "outcomeIndex": 0},
+    {"conditionId": RESOLVED, "asset": "2", "outcomeIndex": 1},
+    {"conditionId": OPEN, "asset": "3", "outcomeIndex": 0},
+    {"conditionId": OPEN, "asset": "4", "outcomeIndex": 1},
+    {"conditionId": NEG_RISK, "asset": "5", "outcomeIndex": 0, "negativeRisk": True},
+    {"conditionId": EMPTY, "asset": "7", "outcomeIndex": 0},
+]
+
+
+class TestSettlementEngine(unittest.TestCase):
+    def test_scan_and_settle_in_one_sequence(self):
+        wallet = Wallet()
+        engine = SettlementEngine(wallet)
+        actions = engine.scan(POSITIONS)
+        self.assertEqual(wallet.multicall.batches, 1)
+        self.assertEqual(
+            [(a.kind, a.condition_id, a.amounts) for a in actions],
+            [
+                ("redeem", RESOLVED, [5_000_000, 0]),
+                ("merge", OPEN, [2_500_000]),
+                ("redeem", NEG_RISK, [7_000_000, 0]),
+            ],
+        )
+
+        engine.settle(actions)
+        self.assertEqual(len(wallet.sent), 1)
+        txs = wallet.sent[0]
+        self.assertEqual(
+            [tx["to"] for tx in txs],
+            [wallet.ctf_address, wallet.ctf_address, wallet.neg_risk_adapter_address],
+        )
+        merge = encode_call(
+            "mergePositions(address,bytes32,bytes32,uint256[],uint256)",
+            [
+                wallet.usdc_address,
+                bytes(32),
+                bytes.fromhex("22" * 32),
+                [1, 2],
+                2_500_000,
+            ],
+        )
+        self.assertEqual(txs[1]["data"], "0x" + merge.hex())
+
+    def test_small_pairs_are_not_merged(self):
+        engine = SettlementEngine(Wallet(), min_merge=3.0)
+        self.assertEqual([a.kind for a in engine.scan(POSITIONS)], ["redeem", "redeem"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import unittest
+
+import numpy as np
+
+from agents.polymarket.table import MarketTable
+
+
+def rows():
+    return [
+        {
+            "id": "1",
+            "question": "A?",
+            "active": True,
+            "spread": 0.02,
+            "liquidityNum": "100.5",
+            "category": "Politics",
+            "outcomePrices": json.dumps(["0.4", "0.6"]),
+            "clobTokenIds": json.dumps(["1y", "1n"]),
+            "events": [{"id": "10", "tags": [{"id": "7"}]}],
+        },
+        {"id": "2", "question": "B?", "active": False, "spread": 0.10},
+        {"id": "3", "question": "C?", "active": True, "spread": None},
+        {
+            "id": "4",
+            "question": "D?",
+            "active": True,
+            "spread": 0.05,
+            "category": "Sports",
+        },
+    ]
+
+
+class TestMarketTable(unittest.TestCase):
+    def setUp(self):
+        self.table = MarketTable.from_records(rows())
+
+    def test_columns(self):
+        np.testing.assert_array_equal(self.table["id"], [1, 2, 3, 4])
+        self.assertEqual(self.table["liquidityNum"][0], 100.5)
+        self.assertTrue(np.isnan(self.table["spread"][2]))
+        self.assertEqual(
+            list(self.table["category"]), ["Politics", None, None, "Sports"]
+        )
+
+    def test_filter_sort_top_k(self):
+        tradeable = self.table.tradeable()
+        self.assertEqual(list(tradeable["id"]), [1, 3, 4])
+        self.assertEqual(list(tradeable.sort("spread")["id"]), [1, 4, 3])
+        self.assertEqual(
+            list(tradeable.sort("spread", descending=True)["id"]), [4, 1, 3]
+        )
+        self.assertEqual(list(self.table.top_k("spread", 2)["id"]), [2, 4])
+        self.assertEqual(list(self.table.where(category="Sports")["id"]), [4])
+        self.assertEqual(len(self.table.where(category="Crypto")), 0)
+
+    def test_lazy_materialization(self):
+        table = self.table.where(category="Politics")
+        for _ in range(2):
+            market = table.market(0)
+            self.assertEqual(market.id, 1)
+            self.assertEqual(market.clobTokenIds, ["1y", "1n"])
+            self.assertEqual(market.events[0].tags[0].id, "7")
+        # the raw row is left untouched
+        self.assertIsInstance(table.raw(0)["outcomePrices"], str)
+
+
+if __name__ == "__main__":
+    unittest.main()
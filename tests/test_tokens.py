@@ -0,0 +1,30 @@
+import unittest
+
+from agents.utils.tokens import TokenCounter, pack
+
+
+class TestTokens(unittest.TestCase):
+    def test_first_fit_decreasing(self):
+        sizes = [5, 4, 3, 3, 2, 2, 1]
+        bins = pack(sizes, 10)
+        self.assertEqual(len(bins), 2)
+        self.assertEqual(sorted(i for b in bins for i in b), list(range(len(sizes))))
+        for b in bins:
+            self.assertLessEqual(sum(sizes[i] for i in b), 10)
+            self.assertEqual(b, sorted(b))
+
+    def test_oversized_item_gets_own_bin(self):
+        self.assertEqual(pack([12, 3, 4], 10), [[0], [1, 2]])
+        self.assertEqual(pack([], 10), [])
+
+    def test_counts_are_cached(self):
+        counter = TokenCounter()
+        text = "Will the Fed cut rates in December?"
+        n = counter.count(text)
+        self.assertGreater(n, 0)
+        self.assertEqual(counter.count(text), n)
+        self.assertEqual(len(counter.cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
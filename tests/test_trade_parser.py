@@ -0,0 +1,64 @@
+import unittest
+
+from agents.application.executor import Executor
+from agents.utils.trade_parser import TradeDecision, TradeParser, parse_trade
+
+
+class Chunk:
+    def __init__(self, content):
+        self.content = content
+
+
+class StreamingChat:
+    """Stands in for an xai_sdk chat: `stream()` yields (response, chunk)."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.sent = 0
+        self.closed = False
+
+    def stream(self):
+        try:
+            for piece in self.pieces:
+                self.sent += 1
+                yield None, Chunk(piece)
+        finally:
+            self.closed = True
+
+
+class StreamExecutor(Executor):
+    def __init__(self):
+        pass
+
+
+class TestTradeParser(unittest.TestCase):
+    def test_waits_for_terminated_numbers(self):
+        parser = TradeParser()
+        self.assertIsNone(parser.feed("RESPONSE```\n  side:SELL,\n  price:0.5"))
+        self.assertIsNone(parser.feed("5,\n  size:0."))
+        trade = parser.feed("1,\n")
+        self.assertEqual(trade, TradeDecision(0.55, 0.1, "SELL"))
+
+    def test_parse_trade_variants(self):
+        self.assertEqual(
+            parse_trade("price:'0.62', size: '0.05', side: buy"),
+            TradeDecision(0.62, 0.05, "BUY"),
+        )
+        self.assertEqual(
+            parse_trade("side: BUY\nprice: .3\nsize: 0.2"),
+            TradeDecision(0.3, 0.2, "BUY"),
+        )
+        self.assertIsNone(parse_trade("price:'price_on_the_orderbook', side: BUY"))
+
+    def test_stream_stops_after_trade_block(self):
+        pieces = ["Trade:\n", "price:0.4,\n", "size:0.1,\n", "side:BUY,\n"]
+        pieces += ["Rationale: " + "x" * 50] * 20
+        chat = StreamingChat(pieces)
+        text = StreamExecutor().stream_trade(chat)
+        self.assertEqual(chat.sent, 4)
+        self.assertTrue(chat.closed)
+        self.assertEqual(parse_trade(text), TradeDecision(0.4, 0.1, "BUY"))
+
+
+if __name__ == "__main__":
+    unittest.main()
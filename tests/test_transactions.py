@@ -0,0 +1,171 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from eth_account import Account
+from eth_account.typed_transactions import TypedTransaction
+from eth_utils import keccak
+from hexbytes import HexBytes
+
+from agents.utils.rpc import AsyncRPCPool
+from agents.utils.transactions import TransactionReverted, TransactionSender
+
+BASE_FEE = 100
+MIN_TIP = 30  # the stand-in only mines transactions tipping at least this
+ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+class ChainStandIn(BaseHTTPRequestHandler):
+    """Mempool that mines any sufficiently priced transaction on next poll."""
+
+    sent = []
+    mined = {}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        requests = body if isinstance(body, list) else [body]
+        replies = [self.answer(r) for r in requests]
+        payload = json.dumps(replies if isinstance(body, list) else replies[0])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload.encode())
+
+    def answer(self, request):
+        method, params = request["method"], request["params"]
+        result = None
+        if method == "eth_getTransactionCount":
+            result = hex(7)
+        elif method == "eth_getBlockByNumber":
+            result = {"baseFeePerGas": hex(BASE_FEE)}
+        elif method == "eth_maxPriorityFeePerGas":
+            result = hex(25)
+        elif method == "eth_estimateGas":
+            if params[0]["data"] == "0xdead":
+                return {
+                    "id": request["id"],
+                    "error": {"code": 3, "message": "execution reverted"},
+                }
+            result = hex(50_000)
+        elif method == "eth_sendRawTransaction":
+            raw = HexBytes(params[0])
+            tx = TypedTransaction.from_bytes(raw).as_dict()
+            if tx["data"] == b"\xbb":
+                return {
+                    "id": request["id"],
+                    "error": {"code": -32000, "message": "insufficient funds"},
+                }
+            result = "0x" + keccak(raw).hex()
+            ChainStandIn.sent.append(
+                (tx["nonce"], tx["maxPriorityFeePerGas"], tx["gas"])
+            )
+            if tx["maxPriorityFeePerGas"] >= MIN_TIP:
+                ChainStandIn.mined[result] = {
+                    "transactionHash": result,
+                    "nonce": tx["nonce"],
+                    "status": "0x0" if tx["data"] == b"\x0f" else "0x1",
+                }
+        elif method == "eth_getTransactionReceipt":
+            result = ChainStandIn.mined.get(params[0])
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransactionSender(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), ChainStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def test_sequence_is_nonced_locally_and_stuck_ones_replaced(self):
+        ChainStandIn.sent, ChainStandIn.mined = [], {}
+        account = Account.create()
+        sender = TransactionSender(
+            AsyncRPCPool([self.url]),
+            account.key.hex(),
+            137,
+            stuck_after=0.0,
+        )
+        txs = [
+            {"to": account.address, "data": "0x01"},
+            {"to": account.address, "data": "0xdead"},
+            {"to": account.address, "data": "0x02", "maxPriorityFeePerGas": 40},
+        ]
+
+        async def main():
+            first = await sender.send_all(txs, poll=0.01)
+            more = await sender.send_all(
+                [{"to": account.address, "data": "0x03", "maxPriorityFeePerGas": 40}],
+                poll=0.01,
+            )
+            await sender.rpc.close()
+            return first + more
+
+        receipts = asyncio.run(main())
+        self.assertEqual([r["nonce"] for r in receipts], [7, 8, 9, 10])
+        # nonces 7 and 8 were underpriced: bumped 25 -> 29 -> 33 and re-sent
+        self.assertEqual(
+            [(n, tip) for n, tip, _ in ChainStandIn.sent],
+            [(7, 25), (8, 25), (9, 40), (7, 29), (8, 29), (7, 33), (8, 33), (10, 40)],
+        )
+        gas = {n: g for n, _, g in ChainStandIn.sent}
+        self.assertEqual((gas[7], gas[8]), (60_000, 300_000))
+
+    def test_rejection_resets_nonce_and_reverts_raise(self):
+        ChainStandIn.sent, ChainStandIn.mined = [], {}
+        account = Account.create()
+        sender = TransactionSender(AsyncRPCPool([self.url]), account.key.hex(), 137)
+
+        def tx(data):
+            return {"to": account.address, "data": data, "maxPriorityFeePerGas": 40}
+
+        async def main():
+            with self.assertRaises(RuntimeError):
+                await sender.send_all([tx("0xbb")], poll=0.01)
+            # the rejected nonce 7 is handed out again, not skipped
+            receipts = await sender.send_all([tx("0x01")], poll=0.01)
+            with self.assertRaises(TransactionReverted) as reverted:
+                await sender.send_all([tx("0x02"), tx("0x0f")], poll=0.01)
+            await sender.rpc.close()
+            return receipts, reverted.exception
+
+        receipts, reverted = asyncio.run(main())
+        self.assertEqual(receipts[0]["nonce"], 7)
+        self.assertEqual([r["nonce"] for r in reverted.receipts], [8, 9])
+        self.assertIn("1 of 2 transactions reverted", str(reverted))
+
+    def test_rejection_mid_batch_cancels_the_rest(self):
+        ChainStandIn.sent, ChainStandIn.mined = [], {}
+        account = Account.create()
+        sender = TransactionSender(AsyncRPCPool([self.url]), account.key.hex(), 137)
+        txs = [
+            {"to": ADDRESS, "data": data, "maxPriorityFeePerGas": 40, "gas": 90_000}
+            for data in ("0x01", "0xbb", "0x02")
+        ]
+
+        async def main():
+            with self.assertRaises(RuntimeError):
+                await sender.send_all(txs, poll=0.01)
+            await sender.rpc.close()
+
+        asyncio.run(main())
+        # nonce 8 is filled and the queued nonce 9 replaced, both with
+        # 21k-gas self-transfers, so a later send can't release the old 9
+        self.assertEqual(
+            ChainStandIn.sent,
+            [(7, 40, 90_000), (9, 40, 90_000), (8, 40, 21_000), (9, 46, 21_000)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()